@@ -0,0 +1,78 @@
+import gc
+import os
+import sys
+import time
+
+from Core.AttachmentStore import AttachmentStore
+from Core.Notebook import Notebook
+from SaveAndLoad import JSONSerializer
+
+
+# Benchmark Variables
+NotebookPath = "TestNotebook.ntbk"
+TargetPageCount = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+Repetitions = 10
+
+
+def CreateScaledNotebook(Serializer, TargetPageCount):
+    # Copy the Test Notebook's Sub Pages under the Root Page Until There Are Enough Pages
+    with open(NotebookPath, "r") as NotebookFile:
+        ScaledNotebook = Serializer.DeserializeDataFromJSONString(NotebookFile.read())
+    TemplatePages = [ScaledNotebook.CopyPageAndSubPages(SubPage) for SubPage in ScaledNotebook.RootPage["SubPages"]]
+    while len(ScaledNotebook.PageIDIndex) < TargetPageCount:
+        for TemplatePage in TemplatePages:
+            PageCopy = ScaledNotebook.CopyPageAndSubPages(TemplatePage)
+            ScaledNotebook.RegisterImportedPage(PageCopy)
+            ScaledNotebook.RootPage["SubPages"].append(PageCopy)
+    ScaledNotebook.UpdateIndexPaths()
+    return ScaledNotebook
+
+
+def TimeCall(Call):
+    Times = []
+    for Repetition in range(Repetitions):
+        gc.collect()
+        StartTime = time.perf_counter()
+        Call()
+        Times.append(time.perf_counter() - StartTime)
+    return min(Times)
+
+
+def GetBackendName():
+    if JSONSerializer.orjson is not None:
+        return "orjson"
+    if JSONSerializer.ujson is not None:
+        return "ujson"
+    return "json"
+
+
+def PrintTimes(Label, ObjectHookTime, FastTime):
+    print(f"  {Label}:  object hook {ObjectHookTime:.3f}s, fast path ({GetBackendName()}) {FastTime:.3f}s ({ObjectHookTime / FastTime:.1f}x)")
+
+
+def RunBenchmark():
+    # Build Scaled Notebook JSON
+    Serializer = JSONSerializer.JSONSerializer((Notebook, AttachmentStore))
+    ScaledNotebook = CreateScaledNotebook(Serializer, TargetPageCount)
+    JSONString = Serializer.SerializeDataToJSONString(ScaledNotebook)
+    print(f"{len(ScaledNotebook.PageIDIndex)} pages, {len(JSONString) / 1048576:.1f} MB of JSON, best of {Repetitions}:")
+
+    # Time Parsing Alone, with Notebooks Left as Dictionaries
+    ObjectHookTime = TimeCall(lambda: JSONSerializer.json.loads(JSONString, cls=lambda: JSONSerializer.Decoder({"Notebook": lambda State: State})))
+    FastTime = TimeCall(lambda: JSONSerializer.LoadJSON(JSONString))
+    PrintTimes("Parsing", ObjectHookTime, FastTime)
+
+    # Time Deserializing Notebooks
+    ObjectHookTime = TimeCall(lambda: Serializer.DeserializeDataFromJSONString(JSONString))
+    FastTime = TimeCall(lambda: Serializer.DeserializeDataFromJSONString(JSONString, ObjectDepth=1))
+    PrintTimes("Deserializing", ObjectHookTime, FastTime)
+
+    # Check That Both Paths Reconstitute the Same Notebook
+    ObjectHookJSONString = Serializer.SerializeDataToJSONString(Serializer.DeserializeDataFromJSONString(JSONString))
+    FastJSONString = Serializer.SerializeDataToJSONString(Serializer.DeserializeDataFromJSONString(JSONString, ObjectDepth=1))
+    print(f"  Same notebook from both paths:  {ObjectHookJSONString == FastJSONString}")
+
+
+if __name__ == "__main__":
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    RunBenchmark()
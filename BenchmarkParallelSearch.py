@@ -0,0 +1,87 @@
+import gc
+import os
+import sys
+import time
+
+from Core.AttachmentStore import AttachmentStore
+from Core.Notebook import Notebook
+from Core.ParallelSearch import ParallelSearcher
+from SaveAndLoad import JSONSerializer
+
+
+# Benchmark Variables
+NotebookPath = "TestNotebook.ntbk"
+TargetPageCount = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+MaximumProcessCount = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+Repetitions = 5
+
+# Terms the Token Index Cannot Answer, So Every Page Containing Their Word Runs Is Scanned
+SearchTerms = [("](", False), ("the page", False), ("Page", True)]
+
+
+def CreateScaledNotebook(Serializer, TargetPageCount):
+    # Copy the Test Notebook's Sub Pages under the Root Page Until There Are Enough Pages
+    with open(NotebookPath, "r") as NotebookFile:
+        ScaledNotebook = Serializer.DeserializeDataFromJSONString(NotebookFile.read())
+    TemplatePages = [ScaledNotebook.CopyPageAndSubPages(SubPage) for SubPage in ScaledNotebook.RootPage.SubPages]
+    while len(ScaledNotebook.PageIDIndex) < TargetPageCount:
+        for TemplatePage in TemplatePages:
+            PageCopy = ScaledNotebook.CopyPageAndSubPages(TemplatePage)
+            ScaledNotebook.RegisterImportedPage(PageCopy)
+            ScaledNotebook.RootPage.SubPages.append(PageCopy)
+    ScaledNotebook.UpdateIndexPaths()
+    ScaledNotebook.BuildSearchIndex()
+    return ScaledNotebook
+
+
+def TimeCall(Call):
+    Times = []
+    for Repetition in range(Repetitions):
+        gc.collect()
+        StartTime = time.perf_counter()
+        Call()
+        Times.append(time.perf_counter() - StartTime)
+    return min(Times)
+
+
+def TimeSearches(ScaledNotebook):
+    return sum(TimeCall(lambda: ScaledNotebook.GetSearchResults(SearchTerm, MatchCase=MatchCase)) for SearchTerm, MatchCase in SearchTerms)
+
+
+def GetAllSearchResults(ScaledNotebook):
+    return [ScaledNotebook.GetSearchResults(SearchTerm, MatchCase=MatchCase) for SearchTerm, MatchCase in SearchTerms]
+
+
+def RunBenchmark():
+    # Build Scaled Notebook
+    Serializer = JSONSerializer.JSONSerializer((Notebook, AttachmentStore))
+    ScaledNotebook = CreateScaledNotebook(Serializer, TargetPageCount)
+    CharacterCount = sum(len(PageData[0]) + len(PageData[1]) for PageData in ScaledNotebook.GetSearchIndexSnapshot())
+    print(f"{len(ScaledNotebook.PageIDIndex)} pages, {CharacterCount / 1048576:.1f} M characters, {len(SearchTerms)} searches, best of {Repetitions} on {os.cpu_count()} cores:")
+
+    # Time Searching in This Process
+    SingleProcessTime = TimeSearches(ScaledNotebook)
+    SingleProcessResults = GetAllSearchResults(ScaledNotebook)
+    print(f"  Single process:  {SingleProcessTime:.3f}s")
+
+    # Time Searching Across Each Number of Processes up to the Number of Cores, Doubling Each Time
+    ProcessCount = 1
+    while True:
+        ScaledNotebook.ParallelSearcher = ParallelSearcher(ProcessCount=ProcessCount, MinimumCharacterCount=0)
+
+        # The first search writes the corpus and starts the workers, which later searches reuse
+        StartTime = time.perf_counter()
+        ParallelResults = GetAllSearchResults(ScaledNotebook)
+        FirstSearchesTime = time.perf_counter() - StartTime
+        ParallelTime = TimeSearches(ScaledNotebook)
+        ScaledNotebook.ParallelSearcher.Shutdown()
+        print(f"  {ProcessCount} process{"es" if ProcessCount > 1 else ""}:  {ParallelTime:.3f}s ({SingleProcessTime / ParallelTime:.1f}x), first searches with setup {FirstSearchesTime:.3f}s, same results:  {ParallelResults == SingleProcessResults}")
+        if ProcessCount >= MaximumProcessCount:
+            break
+        ProcessCount = min(ProcessCount * 2, MaximumProcessCount)
+    ScaledNotebook.ParallelSearcher = None
+
+
+if __name__ == "__main__":
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    RunBenchmark()
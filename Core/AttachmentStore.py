@@ -0,0 +1,111 @@
+import hashlib
+from collections.abc import MutableMapping
+
+from Core import Base64Converters
+from SaveAndLoad.JSONSerializer import BinaryStoreMixin
+from SaveAndLoad.ZipContainer import LoadZipContainerMembers, ZipContainerMember
+
+
+class AttachmentStore(MutableMapping, BinaryStoreMixin):
+    def __init__(self):
+        # Variables
+        self.AttachmentDigests = {}
+        self.Binaries = {}
+        self.ReferenceCounts = {}
+        self.Version = 0
+
+    # Mapping Methods
+    def __getitem__(self, AttachmentName):
+        Digest = self.AttachmentDigests[AttachmentName]
+        Binary = self.Binaries[Digest]
+        if isinstance(Binary, ZipContainerMember):
+            Binary = Binary.GetBinary()
+            self.Binaries[Digest] = Binary
+        return Binary
+
+    def __setitem__(self, AttachmentName, Binary):
+        self.AddAttachment(AttachmentName, self.GetDigest(Binary), Binary)
+
+    def __delitem__(self, AttachmentName):
+        Digest = self.AttachmentDigests.pop(AttachmentName)
+        self.Version += 1
+        self.ReferenceCounts[Digest] -= 1
+        if self.ReferenceCounts[Digest] < 1:
+            del self.ReferenceCounts[Digest]
+            del self.Binaries[Digest]
+
+    def __contains__(self, AttachmentName):
+        return AttachmentName in self.AttachmentDigests
+
+    def __iter__(self):
+        return iter(self.AttachmentDigests)
+
+    def __len__(self):
+        return len(self.AttachmentDigests)
+
+    def clear(self):
+        self.AttachmentDigests.clear()
+        self.Binaries.clear()
+        self.ReferenceCounts.clear()
+        self.Version += 1
+
+    # Attachment Methods
+    def AddAttachment(self, AttachmentName, Digest, Binary):
+        if AttachmentName in self.AttachmentDigests:
+            del self[AttachmentName]
+        self.AttachmentDigests[AttachmentName] = Digest
+        self.Version += 1
+        if Digest not in self.Binaries:
+            self.Binaries[Digest] = Binary
+            self.ReferenceCounts[Digest] = 0
+        self.ReferenceCounts[Digest] += 1
+
+    def AddAttachmentFromFilePath(self, AttachmentName, FilePath):
+        with open(FilePath, "rb") as File:
+            self[AttachmentName] = File.read()
+
+    def RenameAttachment(self, CurrentAttachmentName, NewAttachmentName):
+        Digest = self.AttachmentDigests[CurrentAttachmentName]
+        self.AddAttachment(NewAttachmentName, Digest, self.Binaries[Digest])
+        del self[CurrentAttachmentName]
+
+    def ExportAttachment(self, AttachmentName, FilePath):
+        with open(FilePath, "wb") as File:
+            File.write(self[AttachmentName])
+
+    def GetAttachmentDigest(self, AttachmentName):
+        return self.AttachmentDigests.get(AttachmentName)
+
+    def GetBase64String(self, AttachmentName):
+        return Base64Converters.GetBase64StringFromBinary(self[AttachmentName])
+
+    def GetDigest(self, Binary):
+        return hashlib.sha256(Binary).hexdigest()
+
+    def LoadZipContainerMembers(self, FilePath):
+        LoadZipContainerMembers(FilePath, self.Binaries)
+
+    def Copy(self):
+        NewAttachmentStore = self.__class__()
+        NewAttachmentStore.AttachmentDigests = self.AttachmentDigests.copy()
+        NewAttachmentStore.Binaries = self.Binaries.copy()
+        NewAttachmentStore.ReferenceCounts = self.ReferenceCounts.copy()
+        return NewAttachmentStore
+
+    # Serialization Methods
+    def GetBinaryMembers(self):
+        return self.AttachmentDigests, self.Binaries
+
+    @classmethod
+    def CreateFromBinaryMembers(cls, MemberDigests, BinaryMembers):
+        NewAttachmentStore = cls()
+        for AttachmentName, Digest in MemberDigests.items():
+            NewAttachmentStore.AddAttachment(AttachmentName, Digest, BinaryMembers[Digest])
+        return NewAttachmentStore
+
+    @classmethod
+    def CreateFromBase64Strings(cls, Base64Strings):
+        NewAttachmentStore = cls()
+        for AttachmentName, Base64String in Base64Strings.items():
+            NewAttachmentStore[AttachmentName] = Base64Converters.GetBinaryFromBase64String(Base64String)
+        return NewAttachmentStore
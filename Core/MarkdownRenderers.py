@@ -1,6 +1,7 @@
 import json
 import os
 import re
+from collections import OrderedDict
 
 import mistune
 
@@ -11,14 +12,20 @@ class Renderer(mistune.Renderer):
     def __init__(self, Notebook):
         super().__init__()
         self.Notebook = Notebook
+        self.RenderDependencies = None
+
+    def RecordRenderDependency(self, DependencyType, Name, Value):
+        if self.RenderDependencies is not None:
+            self.RenderDependencies.append((DependencyType, Name, Value))
+        return Value
 
     def link(self, Link, Title, Text):
         Link = mistune.escape_link(Link)
-        if Link.startswith("[0,") and not self.Notebook.StringIsValidIndexPath(Link):
+        if (Link.startswith("[0,") or Link.startswith("[page:")) and not self.RecordRenderDependency("Page", Link, self.Notebook.GetPageFromLinkString(Link) is not None):
             return f"{Text} [LINKED PAGE NOT FOUND]"
         if Link == "[deleted]":
             return f"{Text} [LINKED PAGE DELETED]"
-        if Link.startswith("[file:") and not self.Notebook.HasFile(Link[6:-1]):
+        if Link.startswith("[file:") and not self.RecordRenderDependency("File", Link[6:-1], self.Notebook.HasFile(Link[6:-1])):
             TitleText = f" | {Title}" if (Title is not None and Title != "") else ""
             return f"{Text} [LINKED FILE NOT FOUND | {Link}{TitleText}]"
         if not Title:
@@ -49,7 +56,7 @@ class Renderer(mistune.Renderer):
         return f"<h{str(Level)} style=\"color: seagreen\">{Text}</h{str(Level)}><a name=\"{HeadingLink}\"></a>\n"
 
     def image(self, Source, Title, AltText):
-        if self.Notebook.HasImage(Source):
+        if self.RecordRenderDependency("Image", Source, self.Notebook.GetImageDigest(Source)) is not None:
             AltText = Source
             Source = f"data:image/{os.path.splitext(Source)[1]};base64, {self.Notebook.GetImage(Source)}"
             AltText = mistune.escape(AltText, quote=True)
@@ -73,10 +80,10 @@ class HTMLExportRenderer(Renderer):
 
     def link(self, Link, Title, Text):
         Link = mistune.escape_link(Link)
-        ValidIndexPath = self.Notebook.StringIsValidIndexPath(Link)
+        LinkedPage = self.Notebook.GetPageFromLinkString(Link)
         FileInNotebook = self.Notebook.HasFile(Link[6:-1])
         IsHeadingLink = Link.startswith("[heading:") and Link.endswith("]")
-        if Link.startswith("[0,") and not ValidIndexPath:
+        if (Link.startswith("[0,") or Link.startswith("[page:")) and LinkedPage is None:
             return f"{Text} [LINKED PAGE NOT FOUND]"
         if Link == "[deleted]":
             return f"{Text} [LINKED PAGE DELETED]"
@@ -85,10 +92,10 @@ class HTMLExportRenderer(Renderer):
             return f"{Text} [LINKED FILE NOT FOUND | {Link}{TitleText}]"
         if Title:
             Title = mistune.escape(Title, quote=True)
-        if ValidIndexPath:
+        if LinkedPage is not None:
             if not Title:
-                return f"<a href=\"\" onclick=\"return SelectPage(&quot;{Link}&quot;);\">{Text}</a>"
-            return f"<a href=\"\" onclick=\"return SelectPage(&quot;{Link}&quot;);\" title=\"{Title}\">{Text}</a>"
+                return f"<a href=\"\" onclick=\"return SelectPage(&quot;{str(LinkedPage["IndexPath"])}&quot;);\">{Text}</a>"
+            return f"<a href=\"\" onclick=\"return SelectPage(&quot;{str(LinkedPage["IndexPath"])}&quot;);\" title=\"{Title}\">{Text}</a>"
         elif FileInNotebook:
             if not Title:
                 return f"<a download=\"{Link[6:-1]}\" href=\"Files/{Link[6:-1]}\" target=\"_blank\">{Text}</a>"
@@ -140,40 +147,80 @@ class PDFExportRenderer(Renderer):
         return f"<h{str(Level)} style=\"color: seagreen\">{Text}</h{str(Level)}>\n"
 
 
-def ConstructMarkdownStringFromPage(Page, Notebook):
-    HeaderString = f"{Notebook.Header}\n\n"
-    HeaderString = HeaderString.replace("{PAGETITLE}", Page["Title"])
-    HeaderString = HeaderString.replace("{SUBPAGELINKS}", ConstructSubPageLinks(Page))
-    HeaderString = HeaderString.replace("{SUBPAGEOFLINK}", ConstructSubPageOfLink(Page, Notebook))
-    HeaderString = HeaderString.replace("{LINKINGPAGES}", ConstructLinkingPagesLinks(Page, Notebook))
-    HeaderString = HeaderString.replace("{TOC}", ConstructTableOfContents(Page))
-
-    BodyString = Page["Content"]
-    BodyString = BodyString.replace("{PAGETITLE}", Page["Title"])
-    BodyString = BodyString.replace("{SUBPAGELINKS}", ConstructSubPageLinks(Page))
-    BodyString = BodyString.replace("{SUBPAGEOFLINK}", ConstructSubPageOfLink(Page, Notebook))
-    BodyString = BodyString.replace("{LINKINGPAGES}", ConstructLinkingPagesLinks(Page, Notebook))
-    BodyString = BodyString.replace("{TOC}", ConstructTableOfContents(Page))
-
-    FooterString = f"\n\n{Notebook.Footer}"
-    FooterString = FooterString.replace("{PAGETITLE}", Page["Title"])
-    FooterString = FooterString.replace("{SUBPAGELINKS}", ConstructSubPageLinks(Page))
-    FooterString = FooterString.replace("{SUBPAGEOFLINK}", ConstructSubPageOfLink(Page, Notebook))
-    FooterString = FooterString.replace("{LINKINGPAGES}", ConstructLinkingPagesLinks(Page, Notebook))
-    FooterString = FooterString.replace("{TOC}", ConstructTableOfContents(Page))
-
-    MarkdownString = f"{HeaderString}{BodyString}{FooterString}"
-
-    return MarkdownString
-
-
-def ConstructSubPageLinks(Page):
+class RenderCache:
+    def __init__(self, MaximumSize=64 * 1024 * 1024):
+        # Store Parameters
+        self.MaximumSize = MaximumSize
+
+        # Variables
+        self.Entries = OrderedDict()
+        self.CurrentSize = 0
+
+    def GetPageHTML(self, Page, Notebook, MarkdownParser):
+        # The render stamp covers the page, header, footer, and the notebook changes that token text depends on, so the Markdown string is only constructed when rendering; recorded dependencies cover links and images
+        RenderStamp = self.GetRenderStamp(Page, Notebook)
+        PageKey = id(Page)
+        if PageKey in self.Entries:
+            CachedPage, CachedRenderStamp, CachedRenderDependencies, CachedHTML = self.Entries[PageKey]
+            if CachedPage is Page and CachedRenderStamp == RenderStamp and self.RenderDependenciesUnchanged(CachedRenderDependencies, Notebook):
+                self.Entries.move_to_end(PageKey)
+                return CachedHTML
+            self.RemoveEntry(PageKey)
+        MarkdownString = ConstructMarkdownStringFromPage(Page, Notebook)
+        PageRenderer = MarkdownParser.renderer
+        PageRenderer.RenderDependencies = []
+        try:
+            HTML = MarkdownParser(MarkdownString)
+            RenderDependencies = PageRenderer.RenderDependencies
+        finally:
+            PageRenderer.RenderDependencies = None
+        self.AddEntry(PageKey, (Page, RenderStamp, RenderDependencies, HTML))
+        return HTML
+
+    def GetRenderStamp(self, Page, Notebook):
+        # Sub page and super page links follow the structure and titles, and linking pages follow the link graph, which only catch up with edits once the search index is updated
+        Notebook.UpdateSearchIndex()
+        return (Page["Title"], Page["Content"], Notebook.Header, Notebook.Footer, Notebook.StructureVersion, Notebook.TitlesVersion, Notebook.LinkGraphVersion)
+
+    def RenderDependenciesUnchanged(self, RenderDependencies, Notebook):
+        for DependencyType, Name, Value in RenderDependencies:
+            if DependencyType == "Page" and (Notebook.GetPageFromLinkString(Name) is not None) != Value:
+                return False
+            if DependencyType == "File" and Notebook.HasFile(Name) != Value:
+                return False
+            if DependencyType == "Image" and Notebook.GetImageDigest(Name) != Value:
+                return False
+        return True
+
+    def AddEntry(self, PageKey, Entry):
+        EntrySize = self.GetEntrySize(Entry)
+        if EntrySize > self.MaximumSize:
+            return
+        self.Entries[PageKey] = Entry
+        self.CurrentSize += EntrySize
+        while self.CurrentSize > self.MaximumSize:
+            self.RemoveEntry(next(iter(self.Entries)))
+
+    def RemoveEntry(self, PageKey):
+        Entry = self.Entries.pop(PageKey)
+        self.CurrentSize -= self.GetEntrySize(Entry)
+
+    def GetEntrySize(self, Entry):
+        # Each entry keeps the page's title and content in its render stamp, as well as its HTML
+        return len(Entry[1][0]) + len(Entry[1][1]) + len(Entry[3])
+
+    def Clear(self):
+        self.Entries.clear()
+        self.CurrentSize = 0
+
+
+def ConstructSubPageLinks(Page, Notebook):
     if len(Page["SubPages"]) < 1:
         LinksString = "No sub pages."
     else:
         LinksString = ""
         for SubPage in Page["SubPages"]:
-            LinksString += f"[{SubPage["Title"]}]({json.dumps(SubPage["IndexPath"])})  \n"
+            LinksString += f"[{SubPage["Title"]}]({Notebook.GetPageLinkString(SubPage)})  \n"
         LinksString = LinksString.rstrip()
     return LinksString
 
@@ -183,18 +230,18 @@ def ConstructSubPageOfLink(Page, Notebook):
         LinkString = "This is the root page."
     else:
         SuperPage = Notebook.GetSuperOfPageFromIndexPath(Page["IndexPath"])
-        LinkString = f"[{SuperPage["Title"]}]({json.dumps(SuperPage["IndexPath"])})"
+        LinkString = f"[{SuperPage["Title"]}]({Notebook.GetPageLinkString(SuperPage)})"
     return LinkString
 
 
 def ConstructLinkingPagesLinks(Page, Notebook):
-    SearchResults = Notebook.GetSearchResults(f"]({json.dumps(Page["IndexPath"])}")
+    SearchResults = Notebook.GetLinkingPagesSearchResults(Page)
     if len(SearchResults["ResultsList"]) < 1:
         LinksString = "No linking pages."
     else:
         LinksString = ""
         for Result in SearchResults["ResultsList"]:
-            LinksString += f"[{Result[0]}]({json.dumps(Result[1])})  \n"
+            LinksString += f"[{Result[0]}]({Notebook.GetPageLinkString(Notebook.GetPageFromIndexPath(Result[1]))})  \n"
         LinksString = LinksString.rstrip()
     return LinksString
 
@@ -247,6 +294,34 @@ def ConstructTableOfContents(Page):
         return ""
 
 
+TemplateTokenRegEx = re.compile(r"\{(PAGETITLE|SUBPAGELINKS|SUBPAGEOFLINK|LINKINGPAGES|TOC)\}")
+
+TemplateTokenConstructors = {
+    "PAGETITLE": lambda Page, Notebook: Page["Title"],
+    "SUBPAGELINKS": ConstructSubPageLinks,
+    "SUBPAGEOFLINK": ConstructSubPageOfLink,
+    "LINKINGPAGES": ConstructLinkingPagesLinks,
+    "TOC": lambda Page, Notebook: ConstructTableOfContents(Page)
+}
+
+
+def ConstructMarkdownStringFromPage(Page, Notebook):
+    MarkdownString = f"{Notebook.Header}\n\n{Page["Content"]}\n\n{Notebook.Footer}"
+
+    # Substitute Tokens in One Pass, Constructing Each Token Only if Present and Only Once
+    TokenStrings = {}
+
+    def SubstituteToken(Match):
+        Token = Match.group(1)
+        if Token not in TokenStrings:
+            TokenStrings[Token] = TemplateTokenConstructors[Token](Page, Notebook)
+        return TokenStrings[Token]
+
+    MarkdownString = TemplateTokenRegEx.sub(SubstituteToken, MarkdownString)
+
+    return MarkdownString
+
+
 def ConstructHTMLExportString(Notebook, AssetPaths):
     with open(AssetPaths["TemplatePath"], "r") as TemplateFile:
         TemplateText = TemplateFile.read()
@@ -1,33 +1,57 @@
 import json
 import os
+import re
+from collections import Counter
 
-from Core import Base64Converters
+from Core.AttachmentStore import AttachmentStore
+from Core.NotebookPage import NotebookPage
+from Core.SearchPatterns import GetPagePatternHits, GetSearchPattern
 from SaveAndLoad.JSONSerializer import SerializableMixin
+from SaveAndLoad.Journal import JournalMixin
 
 
-class Notebook(SerializableMixin):
+class Notebook(SerializableMixin, JournalMixin):
     def __init__(self):
         # Variables
         self.DefaultHeader = "# {PAGETITLE}"
         self.DefaultFooter = "***\n\nSub Pages:\n\n{SUBPAGELINKS}\n\nSub Page Of:  {SUBPAGEOFLINK}\n\nLinking Pages:\n\n{LINKINGPAGES}"
         self.Header = self.DefaultHeader
         self.Footer = self.DefaultFooter
+        self.NextPageID = 0
+        self.PageIDIndex = {}
+        self.PageLookup = {}
+        self.IndexPathStringLookup = {}
+        self.LinkStringLookup = {}
         self.RootPage = self.CreatePage("New Notebook")
-        self.Images = {}
-        self.Files = {}
+        self.Images = AttachmentStore()
+        self.Files = AttachmentStore()
         self.PageTemplates = {}
         self.SearchIndexUpToDate = False
-        self.SearchIndex = []
+        self.SearchIndex = {}
+        self.SearchTokenIndex = {}
+        self.SearchTitleIndex = {}
+        self.SearchIndexPageTokens = {}
+        self.SearchIndexPagesToUpdate = {}
+        self.SearchIndexSnapshot = None
+        self.ParallelSearcher = None
+        self.PatternGuard = None
+        self.PagesWithChangedSubPages = {}
+        self.ForwardLinks = {}
+        self.Backlinks = {}
+        self.StructureVersion = 0
+        self.TitlesVersion = 0
+        self.LinkGraphVersion = 0
+        self.JournalPageIDs = set()
+        self.JournalStructureChanged = False
+        self.JournalCompactionRequired = False
+        self.JournaledNotebookState = None
+        self.JournaledAttachmentVersions = None
+        self.ClearJournalChanges()
 
     # Page Methods
-    def CreatePage(self, Title="New Page", Content="", IndexPath=None):
-        if IndexPath is None:
-            IndexPath = [0]
-        Page = {}
-        Page["Title"] = Title
-        Page["Content"] = Content
-        Page["IndexPath"] = IndexPath
-        Page["SubPages"] = []
+    def CreatePage(self, Title="New Page", Content=""):
+        Page = NotebookPage(Title, Content, PageID=self.GetNewPageID())
+        self.PageIDIndex[Page.PageID] = Page
         return Page
 
     def AddSubPage(self, Title="New Page", Content="", SuperPageIndexPath=None, PageToAdd=None):
@@ -38,8 +62,9 @@ class Notebook(SerializableMixin):
             return
         if PageToAdd is None:
             PageToAdd = self.CreatePage(Title, Content)
-        SuperPage["SubPages"].append(PageToAdd)
-        self.UpdateIndexPaths()
+        SuperPage.SubPages.append(PageToAdd)
+        self.UpdateSubPageIndexPaths(SuperPage)
+        self.FlagPageForSearchIndexUpdate(PageToAdd, IncludeSubPages=True)
 
     def AddSiblingPageBefore(self, IndexPath, Title="New Page", Content="", PageToAdd=None):
         SuperPage = self.GetSuperOfPageFromIndexPath(IndexPath)
@@ -47,15 +72,17 @@ class Notebook(SerializableMixin):
             return
         if PageToAdd is None:
             PageToAdd = self.CreatePage(Title, Content)
-        SuperPage["SubPages"].insert(IndexPath[-1], PageToAdd)
-        self.UpdateIndexPaths()
+        SuperPage.SubPages.insert(IndexPath[-1], PageToAdd)
+        self.UpdateSubPageIndexPaths(SuperPage)
+        self.FlagPageForSearchIndexUpdate(PageToAdd, IncludeSubPages=True)
 
     def DeleteSubPage(self, IndexPath):
         SuperPage = self.GetSuperOfPageFromIndexPath(IndexPath)
         if SuperPage is None:
             return
-        del SuperPage["SubPages"][IndexPath[-1]]
-        self.UpdateIndexPaths()
+        PageToDelete = SuperPage.SubPages.pop(IndexPath[-1])
+        self.UpdateSubPageIndexPaths(SuperPage)
+        self.FlagPageForSearchIndexUpdate(PageToDelete, IncludeSubPages=True)
 
     def MoveSubPage(self, IndexPath, Delta):
         SuperPage = self.GetSuperOfPageFromIndexPath(IndexPath)
@@ -63,22 +90,22 @@ class Notebook(SerializableMixin):
             return False
         PageToMoveIndex = IndexPath[-1]
         TargetPageIndex = PageToMoveIndex + Delta
-        if TargetPageIndex < 0 or TargetPageIndex > len(SuperPage["SubPages"]) - 1:
+        if TargetPageIndex < 0 or TargetPageIndex > len(SuperPage.SubPages) - 1:
             return False
-        PageToMove = SuperPage["SubPages"][PageToMoveIndex]
-        TargetPage = SuperPage["SubPages"][TargetPageIndex]
-        SuperPage["SubPages"][PageToMoveIndex] = TargetPage
-        SuperPage["SubPages"][TargetPageIndex] = PageToMove
-        self.UpdateIndexPaths()
+        PageToMove = SuperPage.SubPages[PageToMoveIndex]
+        TargetPage = SuperPage.SubPages[TargetPageIndex]
+        SuperPage.SubPages[PageToMoveIndex] = TargetPage
+        SuperPage.SubPages[TargetPageIndex] = PageToMove
+        self.UpdateSubPageIndexPaths(SuperPage)
         return True
 
     def PromoteSubPage(self, IndexPath):
         SuperPage = self.GetSuperOfPageFromIndexPath(IndexPath)
-        if SuperPage["IndexPath"] == [0] or IndexPath == [0]:
+        if SuperPage.IndexPath == [0] or IndexPath == [0]:
             return
         CurrentPage = self.GetPageFromIndexPath(IndexPath)
         self.DeleteSubPage(IndexPath)
-        SuperOfSuperIndexPath = self.GetSuperOfPageFromIndexPath(self.GetSuperOfPageFromIndexPath(IndexPath)["IndexPath"])["IndexPath"]
+        SuperOfSuperIndexPath = self.GetSuperOfPageFromIndexPath(self.GetSuperOfPageFromIndexPath(IndexPath).IndexPath).IndexPath
         self.AddSubPage(SuperPageIndexPath=SuperOfSuperIndexPath, PageToAdd=CurrentPage)
 
     def DemoteSubPage(self, IndexPath, SiblingPageIndex):
@@ -87,57 +114,67 @@ class Notebook(SerializableMixin):
         CurrentPage = self.GetPageFromIndexPath(IndexPath)
         TargetSiblingPage = self.GetPageFromIndexPath(IndexPath[:-1] + [SiblingPageIndex])
         self.DeleteSubPage(IndexPath)
-        self.AddSubPage(SuperPageIndexPath=TargetSiblingPage["IndexPath"], PageToAdd=CurrentPage)
+        self.AddSubPage(SuperPageIndexPath=TargetSiblingPage.IndexPath, PageToAdd=CurrentPage)
 
     def PromoteAllSubPages(self, IndexPath):
         if IndexPath == [0]:
             return
         CurrentPage = self.GetPageFromIndexPath(IndexPath)
-        if len(CurrentPage["SubPages"]) == 0:
+        if len(CurrentPage.SubPages) == 0:
             return
         SuperPage = self.GetSuperOfPageFromIndexPath(IndexPath)
-        for SubPage in CurrentPage["SubPages"]:
-            SuperPage["SubPages"].append(SubPage)
-        CurrentPage["SubPages"].clear()
-        self.UpdateIndexPaths()
+        for SubPage in CurrentPage.SubPages:
+            SuperPage.SubPages.append(SubPage)
+        CurrentPage.SubPages.clear()
+        self.UpdateSubPageIndexPaths(SuperPage)
+        self.UpdateSubPageIndexPaths(CurrentPage)
 
     def DemoteAllSiblingPages(self, IndexPath):
         if IndexPath == [0]:
             return
         SuperPage = self.GetSuperOfPageFromIndexPath(IndexPath)
-        if len(SuperPage["SubPages"]) < 2:
+        if len(SuperPage.SubPages) < 2:
             return
         CurrentPage = self.GetPageFromIndexPath(IndexPath)
-        SiblingPages = [Page for Page in SuperPage["SubPages"] if Page["IndexPath"] != IndexPath]
-        SuperPage["SubPages"].clear()
-        SuperPage["SubPages"].append(CurrentPage)
+        SiblingPages = [Page for Page in SuperPage.SubPages if Page.IndexPath != IndexPath]
+        SuperPage.SubPages.clear()
+        SuperPage.SubPages.append(CurrentPage)
         for SiblingPage in SiblingPages:
-            CurrentPage["SubPages"].append(SiblingPage)
-        self.UpdateIndexPaths()
+            CurrentPage.SubPages.append(SiblingPage)
+        self.UpdateSubPageIndexPaths(SuperPage)
+        self.UpdateSubPageIndexPaths(CurrentPage)
 
     def MoveSubPageTo(self, IndexPath, DestinationIndexPath):
         SuperPage = self.GetSuperOfPageFromIndexPath(IndexPath)
-        if IndexPath == [0] or SuperPage["IndexPath"] == DestinationIndexPath or IndexPath == DestinationIndexPath[:len(IndexPath)]:
+        if IndexPath == [0] or SuperPage.IndexPath == DestinationIndexPath or IndexPath == DestinationIndexPath[:len(IndexPath)]:
             return
         CurrentPage = self.GetPageFromIndexPath(IndexPath)
         DestinationPage = self.GetPageFromIndexPath(DestinationIndexPath)
         self.DeleteSubPage(IndexPath)
-        self.AddSubPage(SuperPageIndexPath=DestinationPage["IndexPath"], PageToAdd=CurrentPage)
+        self.AddSubPage(SuperPageIndexPath=DestinationPage.IndexPath, PageToAdd=CurrentPage)
 
     def AlphabetizeSubPages(self, IndexPath):
         CurrentPage = self.GetPageFromIndexPath(IndexPath)
-        if len(CurrentPage["SubPages"]) < 2:
+        if len(CurrentPage.SubPages) < 2:
             return
-        CurrentPage["SubPages"].sort(key=lambda SubPage: SubPage["Title"].casefold())
-        self.UpdateIndexPaths()
+        CurrentPage.SubPages.sort(key=lambda SubPage: SubPage.Title.casefold())
+        self.UpdateSubPageIndexPaths(CurrentPage)
 
     def GetPageFromIndexPath(self, IndexPath):
+        IndexPathKey = tuple(IndexPath)
+        if IndexPathKey in self.PageLookup:
+            return self.PageLookup[IndexPathKey]
+        DestinationPage = self.FindPageFromIndexPath(IndexPath)
+        self.PageLookup[IndexPathKey] = DestinationPage
+        return DestinationPage
+
+    def FindPageFromIndexPath(self, IndexPath):
         if len(IndexPath) < 1:
             return None
         DestinationPage = self.RootPage
         try:
             for Index in IndexPath[1:]:
-                DestinationPage = DestinationPage["SubPages"][Index]
+                DestinationPage = DestinationPage.SubPages[Index]
             return DestinationPage
         except IndexError:
             return None
@@ -146,47 +183,129 @@ class Notebook(SerializableMixin):
         return self.GetPageFromIndexPath(IndexPath[:-1])
 
     def UpdateIndexPaths(self):
-        self.RootPage["IndexPath"] = [0]
-        self.UpdateSubPageIndexPaths(self.RootPage["IndexPath"], self.RootPage["SubPages"])
-
-    def UpdateSubPageIndexPaths(self, CurrentIndexPath, SubPagesList):
-        for Index in range(len(SubPagesList)):
-            SubPagesList[Index]["IndexPath"] = CurrentIndexPath + [Index]
-            self.UpdateSubPageIndexPaths(SubPagesList[Index]["IndexPath"], SubPagesList[Index]["SubPages"])
+        # Index paths are derived from the links between pages; this relinks the whole notebook, for trees assembled outside the page methods
+        self.RootPage.SuperPage = None
+        self.RootPage.SiblingIndex = 0
+        self.UpdateSubPageIndexPathsRecursively(self.RootPage)
+
+    def UpdateSubPageIndexPathsRecursively(self, SuperPage):
+        self.UpdateSubPageIndexPaths(SuperPage)
+        for SubPage in SuperPage.SubPages:
+            self.UpdateSubPageIndexPathsRecursively(SubPage)
+
+    def UpdateSubPageIndexPaths(self, SuperPage):
+        self.JournalStructureChanged = True
+        self.PagesWithChangedSubPages[id(SuperPage)] = SuperPage
+        self.SearchIndexSnapshot = None
+        self.ClearPageLookup()
+        SuperPage.LinkSubPages()
+
+    def ClearPageLookup(self):
+        # Looked-up index paths and link strings are remembered until the structure of the notebook changes; the structure version tells other caches it has changed
+        self.StructureVersion += 1
+        self.PageLookup.clear()
+        self.IndexPathStringLookup.clear()
+        self.LinkStringLookup.clear()
 
     def StringIsValidIndexPath(self, IndexPathString):
+        return self.GetPageFromIndexPathString(IndexPathString) is not None
+
+    def GetPageFromIndexPathString(self, IndexPathString):
+        if IndexPathString in self.IndexPathStringLookup:
+            return self.IndexPathStringLookup[IndexPathString]
+        DestinationPage = self.FindPageFromIndexPathString(IndexPathString)
+        self.IndexPathStringLookup[IndexPathString] = DestinationPage
+        return DestinationPage
+
+    def FindPageFromIndexPathString(self, IndexPathString):
         try:
             IndexPath = json.loads(IndexPathString)
         except:
-            return False
+            return None
         if not isinstance(IndexPath, list):
-            return False
+            return None
         if len(IndexPath) < 1:
-            return False
+            return None
         if IndexPath[0] != 0:
-            return False
+            return None
         for Element in IndexPath:
             if not isinstance(Element, int):
-                return False
+                return None
             if Element < 0:
-                return False
-        try:
-            DestinationPage = self.GetPageFromIndexPath(IndexPath)
-        except IndexError:
-            return False
-        if DestinationPage is None:
-            return False
-        return True
+                return None
+        return self.GetPageFromIndexPath(IndexPath)
+
+    def GetNewPageID(self):
+        PageID = self.NextPageID
+        self.NextPageID += 1
+        return PageID
+
+    def RegisterPageIDs(self, Page, ReassignPageIDs=False, ReassignedPageIDs=None):
+        PageID = Page.PageID
+        if ReassignPageIDs or not isinstance(PageID, int) or PageID < 0 or PageID in self.PageIDIndex:
+            NewPageID = self.GetNewPageID()
+            if ReassignedPageIDs is not None and PageID is not None:
+                ReassignedPageIDs[PageID] = NewPageID
+            Page.PageID = NewPageID
+        self.NextPageID = max(self.NextPageID, Page.PageID + 1)
+        self.PageIDIndex[Page.PageID] = Page
+        for SubPage in Page.SubPages:
+            self.RegisterPageIDs(SubPage, ReassignPageIDs=ReassignPageIDs, ReassignedPageIDs=ReassignedPageIDs)
+
+    def RegisterImportedPage(self, Page):
+        # Imported pages get fresh IDs so they cannot collide with this notebook's pages; links between them are kept
+        ReassignedPageIDs = {}
+        self.RegisterPageIDs(Page, ReassignPageIDs=True, ReassignedPageIDs=ReassignedPageIDs)
+        self.ReplacePageIDLinks(Page, ReassignedPageIDs)
+
+    def ReplacePageIDLinks(self, Page, ReassignedPageIDs):
+        Page.Content = re.sub(r"(?<=\]\()\[page:([0-9]+)\]", lambda Match: f"[page:{ReassignedPageIDs.get(int(Match.group(1)), Match.group(1))}]", Page.Content)
+        for SubPage in Page.SubPages:
+            self.ReplacePageIDLinks(SubPage, ReassignedPageIDs)
+
+    def ConvertIndexPathLinksToPageIDLinks(self, Page=None):
+        if Page is None:
+            Page = self.RootPage
+        Page.Content = re.sub(r"(?<=\]\()\[0(?:, [0-9]+)*\]", self.ConvertIndexPathLinkMatch, Page.Content)
+        self.FlagPageForSearchIndexUpdate(Page)
+        for SubPage in Page.SubPages:
+            self.ConvertIndexPathLinksToPageIDLinks(SubPage)
+
+    def ConvertIndexPathLinkMatch(self, Match):
+        LinkedPage = self.GetPageFromIndexPathString(Match.group())
+        return self.GetPageLinkString(LinkedPage) if LinkedPage is not None else Match.group()
+
+    def GetPageFromPageID(self, PageID):
+        Page = self.PageIDIndex.get(PageID)
+        # Deleted pages stay in the ID index until the search index catches up, so check that the page is still in the notebook
+        if Page is None or self.GetPageFromIndexPath(Page.IndexPath) is not Page:
+            return None
+        return Page
+
+    def GetPageLinkString(self, Page):
+        return f"[page:{Page.PageID}]"
+
+    def GetPageFromLinkString(self, LinkString):
+        # Link strings are remembered apart from index path strings, since a page ID link is never a valid index path
+        if LinkString in self.LinkStringLookup:
+            return self.LinkStringLookup[LinkString]
+        PageIDMatch = re.fullmatch(r"\[page:([0-9]+)\]", LinkString)
+        if PageIDMatch is not None:
+            LinkedPage = self.GetPageFromPageID(int(PageIDMatch.group(1)))
+            self.LinkStringLookup[LinkString] = LinkedPage
+            return LinkedPage
+        return self.GetPageFromIndexPathString(LinkString)
 
     def AddTextToPageAndSubpages(self, Text, CurrentPage=None, Prepend=False):
         if CurrentPage is None:
             CurrentPage = self.RootPage
         if Prepend:
-            NewContent = f"{Text}{CurrentPage["Content"]}"
+            NewContent = f"{Text}{CurrentPage.Content}"
         else:
-            NewContent = f"{CurrentPage["Content"]}{Text}"
-        CurrentPage["Content"] = NewContent
-        for Page in CurrentPage["SubPages"]:
+            NewContent = f"{CurrentPage.Content}{Text}"
+        CurrentPage.Content = NewContent
+        self.FlagPageForSearchIndexUpdate(CurrentPage)
+        for Page in CurrentPage.SubPages:
             self.AddTextToPageAndSubpages(Text, Page, Prepend=Prepend)
 
     # Image Methods
@@ -196,13 +315,15 @@ class Notebook(SerializableMixin):
     def AddImage(self, FilePath, FileName=None):
         if FileName is None:
             FileName = os.path.basename(FilePath)
-        Base64String = Base64Converters.GetBase64StringFromFilePath(FilePath)
-        self.Images[FileName] = Base64String
+        self.Images.AddAttachmentFromFilePath(FileName, FilePath)
 
     def GetImage(self, FileName):
         if not self.HasImage(FileName):
             return None
-        return self.Images[FileName]
+        return self.Images.GetBase64String(FileName)
+
+    def GetImageDigest(self, FileName):
+        return self.Images.GetAttachmentDigest(FileName)
 
     def GetImageNames(self):
         return sorted(self.Images.keys(), key=lambda ImageName: ImageName.casefold())
@@ -214,13 +335,12 @@ class Notebook(SerializableMixin):
     def AddFile(self, FilePath, FileName=None):
         if FileName is None:
             FileName = os.path.basename(FilePath)
-        Base64String = Base64Converters.GetBase64StringFromFilePath(FilePath)
-        self.Files[FileName] = Base64String
+        self.Files.AddAttachmentFromFilePath(FileName, FilePath)
 
     def GetFile(self, FileName):
         if not self.HasFile(FileName):
             return None
-        return self.Files[FileName]
+        return self.Files.GetBase64String(FileName)
 
     def GetFileNames(self):
         return sorted(self.Files.keys(), key=lambda FileName: FileName.casefold())
@@ -243,117 +363,394 @@ class Notebook(SerializableMixin):
     # Search Methods
     def BuildSearchIndex(self):
         self.SearchIndex.clear()
+        self.SearchTokenIndex.clear()
+        self.SearchTitleIndex.clear()
+        self.SearchIndexPageTokens.clear()
+        self.SearchIndexPagesToUpdate.clear()
+        self.ForwardLinks.clear()
+        self.Backlinks.clear()
+        self.TitlesVersion += 1
+        self.LinkGraphVersion += 1
         self.AddPageToSearchIndex(self.RootPage)
         self.SearchIndexUpToDate = True
 
-    def AddPageToSearchIndex(self, Page):
-        self.SearchIndex.append((Page["Title"], Page["Content"], Page["IndexPath"]))
-        for SubPage in Page["SubPages"]:
-            self.AddPageToSearchIndex(SubPage)
-
-    def GetSearchResults(self, SearchTermString, MatchCase=False, ExactTitleOnly=False):
-        if not MatchCase:
-            SearchTermString = SearchTermString.casefold()
+    def AddPageToSearchIndex(self, Page, IncludeSubPages=True):
+        PageKey = id(Page)
+        Title = Page.Title
+        Content = Page.Content
+        CasefoldedTitle = Title.casefold()
+        CasefoldedContent = Content.casefold()
+        self.SearchIndexSnapshot = None
+        self.SearchIndex[PageKey] = (Title, Content, Page, CasefoldedTitle, CasefoldedContent)
+        TitleTokenCounts = Counter(self.GetSearchTokens(CasefoldedTitle))
+        ContentTokenCounts = Counter(self.GetSearchTokens(CasefoldedContent))
+        PageTokens = TitleTokenCounts.keys() | ContentTokenCounts.keys()
+        for Token in PageTokens:
+            self.SearchTokenIndex.setdefault(Token, {})[PageKey] = (TitleTokenCounts[Token], ContentTokenCounts[Token])
+        self.SearchIndexPageTokens[PageKey] = PageTokens
+        self.SearchTitleIndex.setdefault(CasefoldedTitle, set()).add(PageKey)
+        self.AddPageLinksToLinkGraph(PageKey, Title, Content)
+        if IncludeSubPages:
+            for SubPage in Page.SubPages:
+                self.AddPageToSearchIndex(SubPage)
+
+    def RemovePageFromSearchIndex(self, PageKey):
+        if PageKey not in self.SearchIndex:
+            return
+        self.SearchIndexSnapshot = None
+        CasefoldedTitle = self.SearchIndex.pop(PageKey)[3]
+        for Token in self.SearchIndexPageTokens.pop(PageKey):
+            Postings = self.SearchTokenIndex[Token]
+            del Postings[PageKey]
+            if len(Postings) < 1:
+                del self.SearchTokenIndex[Token]
+        TitlePageKeys = self.SearchTitleIndex[CasefoldedTitle]
+        TitlePageKeys.discard(PageKey)
+        if len(TitlePageKeys) < 1:
+            del self.SearchTitleIndex[CasefoldedTitle]
+        self.RemovePageLinksFromLinkGraph(PageKey)
+
+    def FlagPageForSearchIndexUpdate(self, Page, IncludeSubPages=False):
+        self.SearchIndexPagesToUpdate[id(Page)] = Page
+        self.JournalPageIDs.add(Page.PageID)
+        if IncludeSubPages:
+            for SubPage in Page.SubPages:
+                self.FlagPageForSearchIndexUpdate(SubPage, IncludeSubPages=True)
+
+    def UpdateSearchIndex(self):
         if not self.SearchIndexUpToDate:
             self.BuildSearchIndex()
+            return
+        for PageKey, Page in self.SearchIndexPagesToUpdate.items():
+            # Pages no longer found at their own index path have been deleted from the notebook
+            if self.GetPageFromIndexPath(Page.IndexPath) is not Page:
+                self.RemovePageFromSearchIndex(PageKey)
+                if self.PageIDIndex.get(Page.PageID) is Page:
+                    del self.PageIDIndex[Page.PageID]
+                continue
+            PreviousPageLinks = self.ForwardLinks.get(PageKey)
+            if PageKey in self.SearchIndex:
+                PageData = self.SearchIndex[PageKey]
+                if PageData[0] == Page.Title and PageData[1] == Page.Content:
+                    continue
+                if PageData[0] != Page.Title:
+                    self.TitlesVersion += 1
+                self.RemovePageFromSearchIndex(PageKey)
+            self.AddPageToSearchIndex(Page, IncludeSubPages=False)
+            if self.ForwardLinks[PageKey] != PreviousPageLinks:
+                self.LinkGraphVersion += 1
+        self.SearchIndexPagesToUpdate.clear()
+
+    def GetSearchIndexInPageOrder(self):
+        self.UpdateSearchIndex()
+        return sorted(self.SearchIndex.values(), key=lambda PageData: PageData[2].IndexPath)
+
+    def GetSearchIndexSnapshot(self):
+        # Page data tuples only hold strings and the page itself, so the snapshot stays valid to search while the notebook changes; it is kept until the index or structure changes
+        self.UpdateSearchIndex()
+        if self.SearchIndexSnapshot is None:
+            SearchIndexSnapshot = []
+            Pages = [self.RootPage]
+            while len(Pages) > 0:
+                Page = Pages.pop()
+                if id(Page) in self.SearchIndex:
+                    SearchIndexSnapshot.append(self.SearchIndex[id(Page)])
+                Pages.extend(reversed(Page.SubPages))
+            self.SearchIndexSnapshot = tuple(SearchIndexSnapshot)
+        return self.SearchIndexSnapshot
+
+    def GetSearchIndexPageData(self, Page):
+        self.UpdateSearchIndex()
+        return self.SearchIndex[id(Page)]
+
+    def GetSearchTokens(self, Text):
+        return re.findall(r"\w+", Text)
+
+    def GetIndexedTokensContaining(self, Text):
+        return [Token for Token in self.SearchTokenIndex if Text in Token]
+
+    def GetIndexedSearchHits(self, CasefoldedSearchTermString):
+        # Occurrences of a term made only of word characters never cross token boundaries, so hits can be counted from the token postings
+        if re.fullmatch(r"\w+", CasefoldedSearchTermString) is None:
+            return None
+        IndexedSearchHits = {}
+        for Token in self.GetIndexedTokensContaining(CasefoldedSearchTermString):
+            HitsPerOccurrence = Token.count(CasefoldedSearchTermString)
+            for PageKey, (TitleTokenCount, ContentTokenCount) in self.SearchTokenIndex[Token].items():
+                PageHits = IndexedSearchHits.setdefault(PageKey, [0, 0])
+                PageHits[0] += HitsPerOccurrence * TitleTokenCount
+                PageHits[1] += HitsPerOccurrence * ContentTokenCount
+        return IndexedSearchHits
+
+    def GetSearchCandidatePageKeys(self, CasefoldedSearchTermString, ExactTitleOnly=False):
+        if ExactTitleOnly:
+            return self.SearchTitleIndex.get(CasefoldedSearchTermString, set())
+        SearchTermTokens = self.GetSearchTokens(CasefoldedSearchTermString)
+        if len(SearchTermTokens) < 1:
+            return self.SearchIndex.keys()
+
+        # Any page containing the term has a token containing each of the term's word runs; the longest run is the most selective
+        LongestSearchTermToken = max(SearchTermTokens, key=len)
+        CandidatePageKeys = set()
+        for Token in self.GetIndexedTokensContaining(LongestSearchTermToken):
+            CandidatePageKeys.update(self.SearchTokenIndex[Token])
+        return CandidatePageKeys
+
+    def GetSearchResults(self, SearchTermString, MatchCase=False, ExactTitleOnly=False, RegularExpression=False, WholeWord=False):
+        if (RegularExpression or WholeWord) and not ExactTitleOnly:
+            return self.GetPatternSearchResults(SearchTermString, MatchCase=MatchCase, RegularExpression=RegularExpression, WholeWord=WholeWord)
+        if not MatchCase:
+            SearchTermString = SearchTermString.casefold()
+        self.UpdateSearchIndex()
+        CasefoldedSearchTermString = SearchTermString.casefold()
+        IndexedSearchHits = self.GetIndexedSearchHits(SearchTermString) if not MatchCase and not ExactTitleOnly else None
+        if IndexedSearchHits is None and not ExactTitleOnly and self.ParallelSearcher is not None:
+            SearchCandidates = self.GetSearchCandidatesInPageOrder(SearchTermString, MatchCase=MatchCase)
+            if self.ParallelSearcher.SearchIsWorthwhile(SearchCandidates):
+                return self.GetParallelSearchResults(SearchCandidates, SearchTermString, MatchCase=MatchCase)
+        CandidatePageKeys = IndexedSearchHits.keys() if IndexedSearchHits is not None else self.GetSearchCandidatePageKeys(CasefoldedSearchTermString, ExactTitleOnly=ExactTitleOnly)
         ResultsList = []
         TotalHits = 0
         TotalPages = 0
-        for PageData in self.SearchIndex:
-            ExactTitle = (PageData[0].casefold() if not MatchCase else PageData[0]) == SearchTermString
-            TitleHits = (PageData[0].casefold() if not MatchCase else PageData[0]).count(SearchTermString)
-            ContentHits = (PageData[1].casefold() if not MatchCase else PageData[1]).count(SearchTermString)
+        for PageKey in sorted(CandidatePageKeys, key=lambda PageKey: self.SearchIndex[PageKey][2].IndexPath):
+            PageData = self.SearchIndex[PageKey]
+            if IndexedSearchHits is not None:
+                ExactTitle = (PageData[3] if not MatchCase else PageData[0]) == SearchTermString
+                TitleHits, ContentHits = IndexedSearchHits[PageKey]
+            else:
+                ExactTitle, TitleHits, ContentHits = self.GetPageSearchHits(PageData, SearchTermString, MatchCase=MatchCase)
             if (ExactTitleOnly and ExactTitle) or (not ExactTitleOnly and (TitleHits > 0 or ContentHits > 0)):
-                ResultsList.append((PageData[0], PageData[2], ExactTitle, TitleHits, ContentHits))
+                ResultsList.append((PageData[0], PageData[2].IndexPath, ExactTitle, TitleHits, ContentHits))
                 TotalHits += TitleHits + ContentHits
                 TotalPages += 1
         ResultsList = sorted(ResultsList, key=lambda Result: (Result[2], Result[3], Result[4]), reverse=True)
         Results = {"ResultsList": ResultsList, "TotalHits": TotalHits, "TotalPages": TotalPages}
         return Results
 
+    def GetParallelSearchResults(self, SearchCandidates, SearchTermString, MatchCase=False):
+        # Shards are searched in page order, so the stable sort ranks results as a search in one process would
+        ResultsList = []
+        TotalHits = 0
+        TotalPages = 0
+        for ShardResults in self.ParallelSearcher.Search(self.GetSearchIndexSnapshot(), SearchCandidates, SearchTermString, MatchCase=MatchCase):
+            for PageData, ExactTitle, TitleHits, ContentHits in ShardResults:
+                ResultsList.append((PageData[0], PageData[2].IndexPath, ExactTitle, TitleHits, ContentHits))
+                TotalHits += TitleHits + ContentHits
+                TotalPages += 1
+        ResultsList = sorted(ResultsList, key=lambda Result: (Result[2], Result[3], Result[4]), reverse=True)
+        Results = {"ResultsList": ResultsList, "TotalHits": TotalHits, "TotalPages": TotalPages}
+        return Results
+
+    def GetPatternSearchResults(self, SearchTermString, MatchCase=False, RegularExpression=False, WholeWord=False):
+        # Raises re.error for an invalid regular expression, and TimeoutError for one that runs too long in the pattern guard
+        SearchPattern = GetSearchPattern(SearchTermString, MatchCase=MatchCase, RegularExpression=RegularExpression, WholeWord=WholeWord)
+        SearchCandidates = self.GetSearchCandidatesInPageOrder(SearchTermString, MatchCase=MatchCase, RegularExpression=RegularExpression)
+        ResultsList = []
+        TotalHits = 0
+        TotalPages = 0
+        for PageData, (ExactTitle, TitleHits, ContentHits) in zip(SearchCandidates, self.GetPatternPageHits(SearchPattern, SearchCandidates, RegularExpression=RegularExpression)):
+            if TitleHits > 0 or ContentHits > 0:
+                ResultsList.append((PageData[0], PageData[2].IndexPath, ExactTitle, TitleHits, ContentHits))
+                TotalHits += TitleHits + ContentHits
+                TotalPages += 1
+        ResultsList = sorted(ResultsList, key=lambda Result: (Result[2], Result[3], Result[4]), reverse=True)
+        Results = {"ResultsList": ResultsList, "TotalHits": TotalHits, "TotalPages": TotalPages}
+        return Results
+
+    def GetPatternPageHits(self, SearchPattern, SearchCandidates, RegularExpression=False):
+        # Regular expressions run in the pattern guard when there is one; escaped terms cannot backtrack catastrophically, so they run in place
+        if RegularExpression and self.PatternGuard is not None:
+            return self.PatternGuard.GetPageHits(SearchPattern, SearchCandidates)
+        return [GetPagePatternHits(SearchPattern, PageData[0], PageData[1]) for PageData in SearchCandidates]
+
+    def RunPatternFunction(self, Function, *Arguments):
+        # Runs one of the functions from Core.SearchPatterns in the pattern guard when there is one, raising TimeoutError if it runs too long
+        if self.PatternGuard is not None:
+            return self.PatternGuard.Run(Function, *Arguments)
+        return Function(*Arguments)
+
+    def GetPageSearchHits(self, PageData, SearchTermString, MatchCase=False):
+        # Only reads the page data tuple, so this is safe to call off the main thread; the search term must already be casefolded unless matching case
+        Title = PageData[3] if not MatchCase else PageData[0]
+        Content = PageData[4] if not MatchCase else PageData[1]
+        return Title == SearchTermString, Title.count(SearchTermString), Content.count(SearchTermString)
+
+    def GetSearchCandidatesInPageOrder(self, SearchTermString, MatchCase=False, RegularExpression=False):
+        SearchIndexSnapshot = self.GetSearchIndexSnapshot()
+        if RegularExpression:
+            return SearchIndexSnapshot
+        CandidatePageKeys = self.GetSearchCandidatePageKeys(SearchTermString.casefold())
+        if len(CandidatePageKeys) == len(self.SearchIndex):
+            return SearchIndexSnapshot
+        return tuple(PageData for PageData in SearchIndexSnapshot if id(PageData[2]) in CandidatePageKeys)
+
+    # Link Graph Methods
+    def GetLinkTargets(self, Text):
+        # Lookahead so that adjacent links sharing a bracket, like "]([0]([0, 1])", are all found
+        return re.findall(r"\]\((?=(\[0(?:, [0-9]+)*\]|\[page:[0-9]+\]))", Text)
+
+    def AddPageLinksToLinkGraph(self, PageKey, Title, Content):
+        TitleLinkCounts = Counter(self.GetLinkTargets(Title))
+        ContentLinkCounts = Counter(self.GetLinkTargets(Content))
+        PageLinks = {Target: (TitleLinkCounts[Target], ContentLinkCounts[Target]) for Target in TitleLinkCounts.keys() | ContentLinkCounts.keys()}
+        for Target, LinkCounts in PageLinks.items():
+            self.Backlinks.setdefault(Target, {})[PageKey] = LinkCounts
+        self.ForwardLinks[PageKey] = PageLinks
+
+    def RemovePageLinksFromLinkGraph(self, PageKey):
+        for Target in self.ForwardLinks.pop(PageKey, {}):
+            LinkingPageKeys = self.Backlinks[Target]
+            del LinkingPageKeys[PageKey]
+            if len(LinkingPageKeys) < 1:
+                del self.Backlinks[Target]
+
+    def HasIndexPathLinks(self):
+        self.UpdateSearchIndex()
+        return any(not Target.startswith("[page:") for Target in self.Backlinks)
+
+    def GetLinkedPages(self, Page):
+        self.UpdateSearchIndex()
+        LinkedPages = []
+        for Target, LinkCounts in self.ForwardLinks[id(Page)].items():
+            LinkedPage = self.GetPageFromLinkString(Target) if LinkCounts[1] > 0 else None
+            if LinkedPage is not None and not any(LinkedPage is ExistingPage for ExistingPage in LinkedPages):
+                LinkedPages.append(LinkedPage)
+        return LinkedPages
+
+    def GetLinkingPagesSearchResults(self, Page):
+        # Pages can link by ID or by index path, so both sets of backlinks are merged
+        self.UpdateSearchIndex()
+        LinkSearchString = f"]({self.GetPageLinkString(Page)}"
+        LinkingPageKeys = {}
+        for Target in (self.GetPageLinkString(Page), json.dumps(Page.IndexPath)):
+            for PageKey, LinkCounts in self.Backlinks.get(Target, {}).items():
+                ExistingLinkCounts = LinkingPageKeys.get(PageKey, (0, 0))
+                LinkingPageKeys[PageKey] = (ExistingLinkCounts[0] + LinkCounts[0], ExistingLinkCounts[1] + LinkCounts[1])
+        ResultsList = []
+        TotalHits = 0
+        TotalPages = 0
+        for PageKey in sorted(LinkingPageKeys, key=lambda PageKey: self.SearchIndex[PageKey][2].IndexPath):
+            PageData = self.SearchIndex[PageKey]
+            TitleHits, ContentHits = LinkingPageKeys[PageKey]
+            ResultsList.append((PageData[0], PageData[2].IndexPath, PageData[3] == LinkSearchString, TitleHits, ContentHits))
+            TotalHits += TitleHits + ContentHits
+            TotalPages += 1
+        ResultsList = sorted(ResultsList, key=lambda Result: (Result[2], Result[3], Result[4]), reverse=True)
+        Results = {"ResultsList": ResultsList, "TotalHits": TotalHits, "TotalPages": TotalPages}
+        return Results
+
+    def ReplaceLinkStrings(self, LinkStringReplacements, Page=None):
+        if len(LinkStringReplacements) < 1:
+            return
+        LinkStringPattern = re.compile("|".join(re.escape(LinkString) for LinkString in sorted(LinkStringReplacements, key=len, reverse=True)))
+        if Page is not None:
+            self.ReplaceLinkStringsInPageAndSubPages(Page, LinkStringPattern, LinkStringReplacements)
+            return
+
+        # Only pages with a backlink to one of the old targets can contain an old link string
+        self.UpdateSearchIndex()
+        PagesToUpdate = {}
+        for LinkString in LinkStringReplacements:
+            Target = LinkString[2:LinkString.index("]", 2) + 1]
+            for PageKey in self.Backlinks.get(Target, {}):
+                PagesToUpdate[PageKey] = self.SearchIndex[PageKey][2]
+        for PageToUpdate in PagesToUpdate.values():
+            self.ReplaceLinkStringsInPage(PageToUpdate, LinkStringPattern, LinkStringReplacements)
+
+    def ReplaceLinkStringsInPageAndSubPages(self, Page, LinkStringPattern, LinkStringReplacements):
+        self.ReplaceLinkStringsInPage(Page, LinkStringPattern, LinkStringReplacements)
+        for SubPage in Page.SubPages:
+            self.ReplaceLinkStringsInPageAndSubPages(SubPage, LinkStringPattern, LinkStringReplacements)
+
+    def ReplaceLinkStringsInPage(self, Page, LinkStringPattern, LinkStringReplacements):
+        Page.Content = LinkStringPattern.sub(lambda Match: LinkStringReplacements[Match.group()], Page.Content)
+        self.FlagPageForSearchIndexUpdate(Page)
+
     def GetFilteredSearchResults(self, Results, Filters):
         # Create Filtered Results List and Counts
         FilteredResultsList = []
         TotalHits = 0
         TotalPages = 0
+        self.UpdateSearchIndex()
 
         # Filter Each Result
         for Result in Results["ResultsList"]:
             # Current Result Variables
             CurrentPage = self.GetPageFromIndexPath(Result[1])
+            PageData = self.SearchIndex[id(CurrentPage)]
             ValidResult = True
 
             # Page Filtering
             if ValidResult and "WithinPageIndexPath" in Filters:
                 WithinPageIndexPath = Filters["WithinPageIndexPath"]
-                if WithinPageIndexPath != CurrentPage["IndexPath"][:len(WithinPageIndexPath)]:
+                if WithinPageIndexPath != CurrentPage.IndexPath[:len(WithinPageIndexPath)]:
                     ValidResult = False
 
             # Title Filtering
             if ValidResult and "TitleContains" in Filters:
-                CurrentTitle = CurrentPage["Title"]
+                CurrentTitle = PageData[0]
                 TitleContainsText = Filters["TitleContains"]["Text"]
                 if not Filters["TitleContains"]["MatchCase"]:
                     TitleContainsText = TitleContainsText.casefold()
-                    CurrentTitle = CurrentTitle.casefold()
+                    CurrentTitle = PageData[3]
                 if not TitleContainsText in CurrentTitle:
                     ValidResult = False
             if ValidResult and "TitleDoesNotContain" in Filters:
-                CurrentTitle = CurrentPage["Title"]
+                CurrentTitle = PageData[0]
                 TitleDoesNotContainText = Filters["TitleDoesNotContain"]["Text"]
                 if not Filters["TitleDoesNotContain"]["MatchCase"]:
                     TitleDoesNotContainText = TitleDoesNotContainText.casefold()
-                    CurrentTitle = CurrentTitle.casefold()
+                    CurrentTitle = PageData[3]
                 if TitleDoesNotContainText in CurrentTitle:
                     ValidResult = False
             if ValidResult and "TitleStartsWith" in Filters:
-                CurrentTitle = CurrentPage["Title"]
+                CurrentTitle = PageData[0]
                 TitleStartsWithText = Filters["TitleStartsWith"]["Text"]
                 if not Filters["TitleStartsWith"]["MatchCase"]:
                     TitleStartsWithText = TitleStartsWithText.casefold()
-                    CurrentTitle = CurrentTitle.casefold()
+                    CurrentTitle = PageData[3]
                 if not CurrentTitle.startswith(TitleStartsWithText):
                     ValidResult = False
             if ValidResult and "TitleEndsWith" in Filters:
-                CurrentTitle = CurrentPage["Title"]
+                CurrentTitle = PageData[0]
                 TitleEndsWithText = Filters["TitleEndsWith"]["Text"]
                 if not Filters["TitleEndsWith"]["MatchCase"]:
                     TitleEndsWithText = TitleEndsWithText.casefold()
-                    CurrentTitle = CurrentTitle.casefold()
+                    CurrentTitle = PageData[3]
                 if not CurrentTitle.endswith(TitleEndsWithText):
                     ValidResult = False
 
             # Content Filtering
             if ValidResult and "ContentContains" in Filters:
-                CurrentContent = CurrentPage["Content"]
+                CurrentContent = PageData[1]
                 ContentContainsText = Filters["ContentContains"]["Text"]
                 if not Filters["ContentContains"]["MatchCase"]:
                     ContentContainsText = ContentContainsText.casefold()
-                    CurrentContent = CurrentContent.casefold()
+                    CurrentContent = PageData[4]
                 if not ContentContainsText in CurrentContent:
                     ValidResult = False
             if ValidResult and "ContentDoesNotContain" in Filters:
-                CurrentContent = CurrentPage["Content"]
+                CurrentContent = PageData[1]
                 ContentDoesNotContainText = Filters["ContentDoesNotContain"]["Text"]
                 if not Filters["ContentDoesNotContain"]["MatchCase"]:
                     ContentDoesNotContainText = ContentDoesNotContainText.casefold()
-                    CurrentContent = CurrentContent.casefold()
+                    CurrentContent = PageData[4]
                 if ContentDoesNotContainText in CurrentContent:
                     ValidResult = False
             if ValidResult and "ContentStartsWith" in Filters:
-                CurrentContent = CurrentPage["Content"]
+                CurrentContent = PageData[1]
                 ContentStartsWithText = Filters["ContentStartsWith"]["Text"]
                 if not Filters["ContentStartsWith"]["MatchCase"]:
                     ContentStartsWithText = ContentStartsWithText.casefold()
-                    CurrentContent = CurrentContent.casefold()
+                    CurrentContent = PageData[4]
                 if not CurrentContent.startswith(ContentStartsWithText):
                     ValidResult = False
             if ValidResult and "ContentEndsWith" in Filters:
-                CurrentContent = CurrentPage["Content"]
+                CurrentContent = PageData[1]
                 ContentEndsWithText = Filters["ContentEndsWith"]["Text"]
                 if not Filters["ContentEndsWith"]["MatchCase"]:
                     ContentEndsWithText = ContentEndsWithText.casefold()
-                    CurrentContent = CurrentContent.casefold()
+                    CurrentContent = PageData[4]
                 if not CurrentContent.endswith(ContentEndsWithText):
                     ValidResult = False
 
@@ -367,25 +764,126 @@ class Notebook(SerializableMixin):
         FilteredSearchResults = {"ResultsList": FilteredResultsList, "TotalHits": TotalHits, "TotalPages": TotalPages}
         return FilteredSearchResults
 
+    # Snapshot Methods
+    def CreateSnapshot(self):
+        Snapshot = self.__class__()
+        Snapshot.Header = self.Header
+        Snapshot.Footer = self.Footer
+        Snapshot.RootPage = self.CopyPageAndSubPages(self.RootPage)
+        Snapshot.NextPageID = self.NextPageID
+        Snapshot.Images = self.Images.Copy()
+        Snapshot.Files = self.Files.Copy()
+        Snapshot.PageTemplates = self.PageTemplates.copy()
+        return Snapshot
+
+    def LoadZipContainerAttachments(self, FilePath):
+        self.Images.LoadZipContainerMembers(FilePath)
+        self.Files.LoadZipContainerMembers(FilePath)
+
+    def CopyPageAndSubPages(self, Page):
+        PageCopy = Page.copy()
+        PageCopy.SubPages = [self.CopyPageAndSubPages(SubPage) for SubPage in Page.SubPages]
+        PageCopy.LinkSubPages()
+        return PageCopy
+
+    # Journal Methods
+    def GetJournalEntry(self):
+        JournalEntry = {}
+        Pages = {}
+        for PageID in self.JournalPageIDs:
+            Page = self.GetPageFromPageID(PageID)
+            if Page is not None:
+                Pages[PageID] = {"Title": Page.Title, "Content": Page.Content}
+        if len(Pages) > 0:
+            JournalEntry["Pages"] = Pages
+        if self.JournalStructureChanged:
+            JournalEntry["Structure"] = self.GetJournalStructure(self.RootPage)
+        NotebookState = self.GetJournalNotebookState()
+        if NotebookState != self.JournaledNotebookState:
+            JournalEntry["Notebook"] = NotebookState
+        return JournalEntry if len(JournalEntry) > 0 else None
+
+    def ApplyJournalEntries(self, JournalEntries):
+        for JournalEntry in JournalEntries:
+            for PageID, PageState in JournalEntry.get("Pages", {}).items():
+                PageID = int(PageID)
+                if PageID not in self.PageIDIndex:
+                    self.PageIDIndex[PageID] = NotebookPage(PageID=PageID)
+                self.PageIDIndex[PageID].Title = PageState["Title"]
+                self.PageIDIndex[PageID].Content = PageState["Content"]
+            if "Structure" in JournalEntry:
+                self.RootPage = self.CreatePageTreeFromJournalStructure(JournalEntry["Structure"])
+                self.PageIDIndex = {}
+                self.ClearPageLookup()
+                self.RegisterPageIDs(self.RootPage)
+                self.UpdateIndexPaths()
+            if "Notebook" in JournalEntry:
+                self.Header = JournalEntry["Notebook"]["Header"]
+                self.Footer = JournalEntry["Notebook"]["Footer"]
+                self.NextPageID = max(self.NextPageID, JournalEntry["Notebook"]["NextPageID"])
+                self.PageTemplates = JournalEntry["Notebook"]["PageTemplates"]
+        self.ClearJournalChanges()
+
+    def ClearJournalChanges(self):
+        self.JournalPageIDs.clear()
+        self.JournalStructureChanged = False
+        self.JournalCompactionRequired = False
+        self.JournaledNotebookState = self.GetJournalNotebookState()
+        self.JournaledAttachmentVersions = (self.Images.Version, self.Files.Version)
+
+    def JournalRequiresCompaction(self):
+        # Attachments are only written to the main file
+        return self.JournalCompactionRequired or (self.Images.Version, self.Files.Version) != self.JournaledAttachmentVersions
+
+    def RequireJournalCompaction(self):
+        self.JournalCompactionRequired = True
+
+    def GetJournalStructure(self, Page):
+        return [Page.PageID, [self.GetJournalStructure(SubPage) for SubPage in Page.SubPages]]
+
+    def CreatePageTreeFromJournalStructure(self, Structure):
+        PageID, SubPageStructures = Structure
+        Page = self.PageIDIndex[PageID]
+        Page.SubPages = [self.CreatePageTreeFromJournalStructure(SubPageStructure) for SubPageStructure in SubPageStructures if SubPageStructure[0] in self.PageIDIndex]
+        return Page
+
+    def GetJournalNotebookState(self):
+        return {"Header": self.Header, "Footer": self.Footer, "NextPageID": self.NextPageID, "PageTemplates": self.PageTemplates.copy()}
+
     # Serialization Methods
     def SetState(self, NewState):
         self.Header = NewState["Header"] if "Header" in NewState else self.DefaultHeader
         self.Footer = NewState["Footer"] if "Footer" in NewState else self.DefaultFooter
-        self.RootPage = NewState["RootPage"] if "RootPage" in NewState else self.CreatePage("New Notebook")
-        self.Images = NewState["Images"] if "Images" in NewState else {}
-        self.Files = NewState["Files"] if "Files" in NewState else {}
+        self.RootPage = NotebookPage.CreateFromDictionary(NewState["RootPage"]) if "RootPage" in NewState else self.CreatePage("New Notebook")
+        self.NextPageID = NewState["NextPageID"] if "NextPageID" in NewState else 0
+        self.PageIDIndex = {}
+        self.ClearPageLookup()
+        self.RegisterPageIDs(self.RootPage)
+        self.ConvertIndexPathLinksToPageIDLinks()
+        self.Images = self.CreateAttachmentStoreFromState(NewState["Images"] if "Images" in NewState else {})
+        self.Files = self.CreateAttachmentStoreFromState(NewState["Files"] if "Files" in NewState else {})
         self.PageTemplates = NewState["PageTemplates"] if "PageTemplates" in NewState else {}
+        self.ClearJournalChanges()
+
+        # Notebooks from before page IDs were saved get new IDs, which a journal could not refer to until they are saved
+        self.JournalCompactionRequired = "NextPageID" not in NewState
 
     def GetState(self):
         State = {}
         State["Header"] = self.Header
         State["Footer"] = self.Footer
         State["RootPage"] = self.RootPage
+        State["NextPageID"] = self.NextPageID
         State["Images"] = self.Images
         State["Files"] = self.Files
         State["PageTemplates"] = self.PageTemplates
         return State
 
+    def CreateAttachmentStoreFromState(self, AttachmentsState):
+        if isinstance(AttachmentsState, AttachmentStore):
+            return AttachmentsState
+        return AttachmentStore.CreateFromBase64Strings(AttachmentsState)
+
     @classmethod
     def CreateFromState(cls, State):
         NewNotebook = cls()
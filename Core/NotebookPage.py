@@ -0,0 +1,77 @@
+from collections.abc import Mapping
+
+
+class NotebookPage(Mapping):
+    # Pages Are Read and Written Like the Dictionaries They Replace, and Serialize to the Same JSON
+    __slots__ = ("Title", "Content", "SubPages", "PageID", "SuperPage", "SiblingIndex", "CachedIndexPath", "CachedSuperPageIndexPath")
+    PageKeys = ("Title", "Content", "IndexPath", "SubPages", "PageID")
+    PageKeySet = frozenset(PageKeys)
+    AssignablePageKeySet = PageKeySet - {"IndexPath"}
+
+    def __init__(self, Title="New Page", Content="", SubPages=None, PageID=None):
+        # Store Parameters
+        self.Title = Title
+        self.Content = Content
+        self.SubPages = SubPages if SubPages is not None else []
+        self.PageID = PageID
+
+        # Variables
+        self.SuperPage = None
+        self.SiblingIndex = 0
+        self.CachedIndexPath = None
+        self.CachedSuperPageIndexPath = None
+
+    # Dictionary Methods
+    def __getitem__(self, Key):
+        if Key not in self.PageKeySet:
+            raise KeyError(Key)
+        return getattr(self, Key)
+
+    def __setitem__(self, Key, Value):
+        if Key not in self.AssignablePageKeySet:
+            if Key in self.PageKeySet:
+                raise TypeError(f"Page key \"{Key}\" follows from where the page is in the notebook and cannot be assigned.")
+            raise KeyError(Key)
+        setattr(self, Key, Value)
+
+    def __iter__(self):
+        return iter(self.PageKeys)
+
+    def __len__(self):
+        return len(self.PageKeys)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+    def copy(self):
+        PageCopy = self.__class__(self.Title, self.Content, self.SubPages, self.PageID)
+        PageCopy.SuperPage = self.SuperPage
+        PageCopy.SiblingIndex = self.SiblingIndex
+        return PageCopy
+
+    # Tree Methods
+    @property
+    def IndexPath(self):
+        # Callers get their own copy, since some of them modify index paths they are given
+        return self.GetCachedIndexPath().copy()
+
+    def GetCachedIndexPath(self):
+        # The cached index path stays valid as long as this page keeps its sibling index under a super page whose cached index path is unchanged, so moving a page only requires relinking its old and new siblings
+        SuperPageIndexPath = self.SuperPage.GetCachedIndexPath() if self.SuperPage is not None else None
+        if self.CachedIndexPath is None or self.CachedSuperPageIndexPath is not SuperPageIndexPath or self.CachedIndexPath[-1] != self.SiblingIndex:
+            self.CachedIndexPath = SuperPageIndexPath + [self.SiblingIndex] if SuperPageIndexPath is not None else [0]
+            self.CachedSuperPageIndexPath = SuperPageIndexPath
+        return self.CachedIndexPath
+
+    def LinkSubPages(self):
+        for SiblingIndex, SubPage in enumerate(self.SubPages):
+            SubPage.SuperPage = self
+            SubPage.SiblingIndex = SiblingIndex
+
+    @classmethod
+    def CreateFromDictionary(cls, PageDictionary):
+        if isinstance(PageDictionary, cls):
+            return PageDictionary
+        Page = cls(PageDictionary["Title"], PageDictionary["Content"], [cls.CreateFromDictionary(SubPage) for SubPage in PageDictionary["SubPages"]], PageDictionary.get("PageID"))
+        Page.LinkSubPages()
+        return Page
@@ -0,0 +1,193 @@
+import multiprocessing
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+
+# Corpus Layout:  Page Count, Then the Offsets of Each Page's Fields, Then the Fields Themselves as UTF-8
+CorpusFields = ("Title", "CasefoldedTitle", "Content", "CasefoldedContent")
+CorpusFieldCount = len(CorpusFields)
+CorpusHeaderFormat = "q"
+CorpusOffsetTypeCode = "q"
+
+# Worker Process Variables
+AttachedCorpus = None
+
+
+def EncodeCorpusText(Text):
+    # UTF-8 never matches a term partway through a character, so byte counts are character counts; lone surrogates from old notebooks survive the round trip
+    return Text.encode("utf-8", errors="surrogatepass")
+
+
+def AttachCorpus(CorpusName):
+    # Each worker attaches to the current corpus once and keeps it until the corpus is replaced
+    global AttachedCorpus
+    if AttachedCorpus is None or AttachedCorpus.name != CorpusName:
+        if AttachedCorpus is not None:
+            AttachedCorpus.close()
+            AttachedCorpus = None
+        AttachedCorpus = shared_memory.SharedMemory(name=CorpusName)
+    return AttachedCorpus
+
+
+def SearchCorpusShard(CorpusName, Positions, SearchTermBytes, MatchCase):
+    Corpus = AttachCorpus(CorpusName)
+    PageCount = struct.unpack_from(CorpusHeaderFormat, Corpus.buf)[0]
+    HeaderSize = struct.calcsize(CorpusHeaderFormat)
+    OffsetCount = PageCount * CorpusFieldCount + 1
+    Offsets = Corpus.buf[HeaderSize:HeaderSize + (OffsetCount * array(CorpusOffsetTypeCode).itemsize)].cast(CorpusOffsetTypeCode)
+    Positions = array("q", Positions)
+    TitleField = 0 if MatchCase else 1
+    ContentField = 2 if MatchCase else 3
+
+    # Bytes can only be counted in a bytes object, so the span of the shard is copied out of shared memory once
+    ShardStart = Offsets[Positions[0] * CorpusFieldCount]
+    ShardEnd = Offsets[(Positions[-1] + 1) * CorpusFieldCount]
+    ShardBytes = Corpus.buf[ShardStart:ShardEnd].tobytes()
+    SearchTermLength = len(SearchTermBytes)
+
+    ShardResults = []
+    for Position in Positions:
+        TitleStart = Offsets[Position * CorpusFieldCount + TitleField] - ShardStart
+        TitleEnd = Offsets[Position * CorpusFieldCount + TitleField + 1] - ShardStart
+        ContentStart = Offsets[Position * CorpusFieldCount + ContentField] - ShardStart
+        ContentEnd = Offsets[Position * CorpusFieldCount + ContentField + 1] - ShardStart
+        TitleHits = ShardBytes.count(SearchTermBytes, TitleStart, TitleEnd)
+        ContentHits = ShardBytes.count(SearchTermBytes, ContentStart, ContentEnd)
+        if TitleHits > 0 or ContentHits > 0:
+            ExactTitle = TitleEnd - TitleStart == SearchTermLength and ShardBytes.startswith(SearchTermBytes, TitleStart, TitleEnd)
+            ShardResults.append((Position, ExactTitle, TitleHits, ContentHits))
+    Offsets.release()
+    return ShardResults
+
+
+class ParallelSearcher:
+    """
+    This class searches the text of a notebook's pages across a pool of worker processes.
+
+    The page data of a search index snapshot is written once into a shared memory corpus that every worker attaches to, so a query only sends its search term and the positions of the pages to search.  The corpus is rewritten whenever it is given a different snapshot.
+
+    Call the Search method with a snapshot, the candidate page data from it in page order, and the search term; it yields the results of each shard in page order as lists of (PageData, ExactTitle, TitleHits, ContentHits) tuples.  Call the Shutdown method to stop the workers and release the corpus.
+    """
+
+    def __init__(self, ProcessCount=None, ShardsPerProcess=4, MinimumCharacterCount=4194304):
+        # Store Parameters
+        self.ProcessCount = ProcessCount if ProcessCount is not None else (os.cpu_count() or 1)
+        self.ShardsPerProcess = ShardsPerProcess
+        self.MinimumCharacterCount = MinimumCharacterCount
+
+        # Variables
+        self.Executor = None
+        self.Corpus = None
+        self.CorpusSnapshot = None
+        self.CorpusPageStarts = None
+        self.CorpusPositions = {}
+        self.Stopped = False
+        self.Lock = threading.Lock()
+
+    def SearchIsWorthwhile(self, SearchCandidates):
+        # Starting shards costs more than scanning a small amount of text in place, and searches started before a shutdown are left to scan in place
+        if self.Stopped:
+            return False
+        CharacterCount = 0
+        for PageData in SearchCandidates:
+            CharacterCount += len(PageData[0]) + len(PageData[1])
+            if CharacterCount >= self.MinimumCharacterCount:
+                return True
+        return False
+
+    def Search(self, SearchIndexSnapshot, SearchCandidates, SearchTermString, MatchCase=False):
+        # The search term must already be casefolded unless matching case; a search holds the lock so the corpus is not replaced under it
+        with self.Lock:
+            self.UpdateCorpus(SearchIndexSnapshot)
+            if self.Executor is None:
+                self.Executor = ProcessPoolExecutor(max_workers=self.ProcessCount, mp_context=multiprocessing.get_context("spawn"))
+            if SearchCandidates is SearchIndexSnapshot:
+                Positions = array("q", range(len(SearchIndexSnapshot)))
+            else:
+                Positions = array("q", [self.CorpusPositions[id(PageData)] for PageData in SearchCandidates])
+            if len(Positions) < 1:
+                return
+            SearchTermBytes = EncodeCorpusText(SearchTermString)
+            Shards = [Shard.tobytes() for Shard in self.GetShards(Positions)]
+
+            # Results of each shard are taken in order, so results still arrive in page order
+            ShardResultsIterator = self.Executor.map(SearchCorpusShard, [self.Corpus.name] * len(Shards), Shards, [SearchTermBytes] * len(Shards), [MatchCase] * len(Shards))
+            try:
+                for ShardResults in ShardResultsIterator:
+                    yield [(SearchIndexSnapshot[Position], ExactTitle, TitleHits, ContentHits) for Position, ExactTitle, TitleHits, ContentHits in ShardResults]
+            finally:
+                ShardResultsIterator.close()
+
+    def GetShards(self, Positions):
+        # Shards span about the same amount of corpus, found by bisection instead of a pass over the pages; more shards than processes evens out uneven pages
+        ShardCount = self.ProcessCount * self.ShardsPerProcess
+        FirstPageStart = self.CorpusPageStarts[Positions[0]]
+        LastPageEnd = self.CorpusPageStarts[Positions[-1] + 1]
+        Shards = []
+        ShardStartIndex = 0
+        for ShardNumber in range(1, ShardCount):
+            BoundaryPosition = bisect_right(self.CorpusPageStarts, FirstPageStart + ((LastPageEnd - FirstPageStart) * ShardNumber // ShardCount)) - 1
+            ShardEndIndex = bisect_left(Positions, BoundaryPosition + 1)
+            if ShardEndIndex > ShardStartIndex:
+                Shards.append(Positions[ShardStartIndex:ShardEndIndex])
+                ShardStartIndex = ShardEndIndex
+        if ShardStartIndex < len(Positions):
+            Shards.append(Positions[ShardStartIndex:])
+        return Shards
+
+    def UpdateCorpus(self, SearchIndexSnapshot):
+        if SearchIndexSnapshot is self.CorpusSnapshot:
+            return
+        self.ReleaseCorpus()
+
+        # Encode Fields and Record Offsets
+        EncodedFields = []
+        Offsets = array(CorpusOffsetTypeCode)
+        HeaderSize = struct.calcsize(CorpusHeaderFormat) + ((len(SearchIndexSnapshot) * CorpusFieldCount + 1) * Offsets.itemsize)
+        Offset = HeaderSize
+        CorpusPositions = {}
+        for Position, PageData in enumerate(SearchIndexSnapshot):
+            CorpusPositions[id(PageData)] = Position
+            for Field in (PageData[0], PageData[3], PageData[1], PageData[4]):
+                EncodedField = EncodeCorpusText(Field)
+                EncodedFields.append(EncodedField)
+                Offsets.append(Offset)
+                Offset += len(EncodedField)
+        Offsets.append(Offset)
+
+        # Write Corpus
+        Corpus = shared_memory.SharedMemory(create=True, size=max(1, Offset))
+        struct.pack_into(CorpusHeaderFormat, Corpus.buf, 0, len(SearchIndexSnapshot))
+        Corpus.buf[struct.calcsize(CorpusHeaderFormat):HeaderSize] = Offsets.tobytes()
+        FieldStart = HeaderSize
+        for EncodedField in EncodedFields:
+            Corpus.buf[FieldStart:FieldStart + len(EncodedField)] = EncodedField
+            FieldStart += len(EncodedField)
+
+        # The snapshot is kept with the corpus so the ids of its page data stay unique
+        self.Corpus = Corpus
+        self.CorpusSnapshot = SearchIndexSnapshot
+        self.CorpusPageStarts = Offsets[::CorpusFieldCount]
+        self.CorpusPositions = CorpusPositions
+
+    def ReleaseCorpus(self):
+        if self.Corpus is not None:
+            self.Corpus.close()
+            self.Corpus.unlink()
+        self.Corpus = None
+        self.CorpusSnapshot = None
+        self.CorpusPageStarts = None
+        self.CorpusPositions = {}
+
+    def Shutdown(self):
+        self.Stopped = True
+        with self.Lock:
+            if self.Executor is not None:
+                self.Executor.shutdown(cancel_futures=True)
+                self.Executor = None
+            self.ReleaseCorpus()
@@ -0,0 +1,116 @@
+import functools
+import multiprocessing
+import re
+import threading
+
+
+# Guard Worker Variables
+GuardedPages = ()
+
+
+@functools.lru_cache(maxsize=256)
+def CompilePattern(PatternString, Flags=0):
+    # Search, replace, and highlighting all compile their patterns here, so a pattern used again is not compiled again; invalid patterns raise re.error and are not cached
+    return re.compile(PatternString, Flags)
+
+
+def GetSearchPatternString(SearchTermString, RegularExpression=False, WholeWord=False):
+    PatternString = SearchTermString if RegularExpression else re.escape(SearchTermString)
+    if WholeWord:
+        # Lookarounds instead of \b, so terms that begin or end with punctuation can still be matched as whole words
+        PatternString = rf"(?<!\w)(?:{PatternString})(?!\w)"
+    return PatternString
+
+
+def GetSearchPattern(SearchTermString, MatchCase=False, RegularExpression=False, WholeWord=False):
+    return CompilePattern(GetSearchPatternString(SearchTermString, RegularExpression=RegularExpression, WholeWord=WholeWord), 0 if MatchCase else re.IGNORECASE)
+
+
+def CountPatternHits(Pattern, Text):
+    # Empty matches, like those of a lone anchor, have nothing to highlight and are not counted as hits
+    return sum(1 for Match in Pattern.finditer(Text) if Match.end() > Match.start())
+
+
+def GetPagePatternHits(Pattern, Title, Content):
+    return Pattern.fullmatch(Title) is not None, CountPatternHits(Pattern, Title), CountPatternHits(Pattern, Content)
+
+
+def GetGuardedPageHits(Pattern, Pages=None):
+    # Pages are only sent when they have changed since the last search
+    global GuardedPages
+    if Pages is not None:
+        GuardedPages = Pages
+    return [GetPagePatternHits(Pattern, Title, Content) for Title, Content in GuardedPages]
+
+
+def SubstitutePattern(Pattern, ReplaceText, Texts):
+    return [Pattern.sub(ReplaceText, Text) for Text in Texts]
+
+
+def ExpandFullMatch(Pattern, ReplaceText, Text):
+    Match = Pattern.fullmatch(Text)
+    return Match.expand(ReplaceText) if Match is not None else None
+
+
+class PatternGuard:
+    """
+    This class runs regular expressions in a worker process that is stopped if they take longer than the timeout, so a pattern that backtracks catastrophically cannot hang the app.
+
+    Python's regular expressions hold the interpreter for the whole of a match, so they cannot be stopped from another thread.  Call the Run method with one of this module's functions and its arguments; it returns the function's result, or raises TimeoutError and starts a new worker for the next call.  Call the GetPageHits method to search page data with a pattern; the page text is sent to the worker once per search index snapshot.  Call the Shutdown method to stop the worker.
+    """
+
+    def __init__(self, Timeout=5, StartTimeout=60):
+        # Store Parameters
+        self.Timeout = Timeout
+        self.StartTimeout = StartTimeout
+
+        # Variables
+        self.Pool = None
+        self.PoolStarted = None
+        self.WorkerPages = None
+        self.Lock = threading.RLock()
+
+    def Start(self):
+        # A worker can take a moment to start, which is not counted against the first pattern it runs
+        with self.Lock:
+            if self.Pool is None:
+                self.Pool = multiprocessing.get_context("spawn").Pool(1)
+                self.PoolStarted = self.Pool.apply_async(int)
+                self.WorkerPages = None
+
+    def Run(self, Function, *Arguments):
+        with self.Lock:
+            self.Start()
+            try:
+                self.PoolStarted.get(self.StartTimeout)
+            except multiprocessing.TimeoutError:
+                self.Stop()
+                raise TimeoutError("Regular expression worker did not start.")
+            AsyncResult = self.Pool.apply_async(Function, Arguments)
+            try:
+                return AsyncResult.get(self.Timeout)
+            except multiprocessing.TimeoutError:
+                self.Stop()
+                raise TimeoutError(f"Regular expression took longer than {self.Timeout} seconds.")
+
+    def GetPageHits(self, Pattern, SearchCandidates):
+        # Returns an (ExactTitle, TitleHits, ContentHits) tuple for each page; the candidates are kept so their identity can show when they have changed
+        with self.Lock:
+            self.Start()
+            if SearchCandidates is self.WorkerPages:
+                return self.Run(GetGuardedPageHits, Pattern)
+            PageHits = self.Run(GetGuardedPageHits, Pattern, [(PageData[0], PageData[1]) for PageData in SearchCandidates])
+            self.WorkerPages = SearchCandidates
+            return PageHits
+
+    def Stop(self):
+        if self.Pool is not None:
+            self.Pool.terminate()
+            self.Pool.join()
+        self.Pool = None
+        self.PoolStarted = None
+        self.WorkerPages = None
+
+    def Shutdown(self):
+        with self.Lock:
+            self.Stop()
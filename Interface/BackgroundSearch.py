@@ -0,0 +1,209 @@
+import time
+from bisect import bisect_right
+from collections import deque
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from Core.SearchPatterns import GetPagePatternHits, GetSearchPattern
+
+
+class BackgroundSearchSignals(QObject):
+    ResultsFound = pyqtSignal(list)
+    TimedOut = pyqtSignal()
+    Finished = pyqtSignal()
+
+
+class BackgroundSearch(QRunnable):
+    def __init__(self, Notebook, SearchCandidates, SearchTermString, MatchCase=False, RegularExpression=False, WholeWord=False, BatchDuration=0.05):
+        super().__init__()
+
+        # Store Parameters
+        self.Notebook = Notebook
+        self.SearchIndexSnapshot = Notebook.GetSearchIndexSnapshot()
+        self.ParallelSearcher = Notebook.ParallelSearcher
+        self.SearchCandidates = SearchCandidates
+        self.SearchTermString = SearchTermString
+        self.MatchCase = MatchCase
+        self.RegularExpression = RegularExpression
+        self.WholeWord = WholeWord
+        self.BatchDuration = BatchDuration
+
+        # Variables
+        self.SearchPattern = GetSearchPattern(SearchTermString, MatchCase=MatchCase, RegularExpression=RegularExpression, WholeWord=WholeWord) if RegularExpression or WholeWord else None
+        self.Cancelled = False
+        self.Signals = BackgroundSearchSignals()
+        self.setAutoDelete(False)
+
+    def run(self):
+        if self.RegularExpression:
+            self.RunRegularExpression()
+            return
+        if self.SearchPattern is None and self.ParallelSearcher is not None and self.ParallelSearcher.SearchIsWorthwhile(self.SearchCandidates):
+            self.RunInParallel()
+            return
+
+        # Only the snapshot's page data is read here; pages are passed back untouched for the main thread to locate
+        PageResults = []
+        BatchEndTime = time.perf_counter() + self.BatchDuration
+        for PageData in self.SearchCandidates:
+            if self.Cancelled:
+                break
+            if self.SearchPattern is not None:
+                ExactTitle, TitleHits, ContentHits = GetPagePatternHits(self.SearchPattern, PageData[0], PageData[1])
+            else:
+                ExactTitle, TitleHits, ContentHits = self.Notebook.GetPageSearchHits(PageData, self.SearchTermString, MatchCase=self.MatchCase)
+            if TitleHits > 0 or ContentHits > 0:
+                PageResults.append((PageData[0], PageData[2], ExactTitle, TitleHits, ContentHits))
+            if len(PageResults) > 0 and time.perf_counter() >= BatchEndTime:
+                self.Signals.ResultsFound.emit(PageResults)
+                PageResults = []
+                BatchEndTime = time.perf_counter() + self.BatchDuration
+        if len(PageResults) > 0 and not self.Cancelled:
+            self.Signals.ResultsFound.emit(PageResults)
+        self.Signals.Finished.emit()
+
+    def RunRegularExpression(self):
+        # Waiting on the pattern guard releases the interpreter, so a regular expression that runs too long only costs the guard's timeout
+        try:
+            PageHits = self.Notebook.GetPatternPageHits(self.SearchPattern, self.SearchCandidates, RegularExpression=True)
+        except TimeoutError:
+            self.Signals.TimedOut.emit()
+            self.Signals.Finished.emit()
+            return
+        PageResults = [(PageData[0], PageData[2], ExactTitle, TitleHits, ContentHits) for PageData, (ExactTitle, TitleHits, ContentHits) in zip(self.SearchCandidates, PageHits) if TitleHits > 0 or ContentHits > 0]
+        if len(PageResults) > 0 and not self.Cancelled:
+            self.Signals.ResultsFound.emit(PageResults)
+        self.Signals.Finished.emit()
+
+    def RunInParallel(self):
+        # Each shard's results are sent as a batch as soon as the shards before it are done
+        ShardResultsIterator = self.ParallelSearcher.Search(self.SearchIndexSnapshot, self.SearchCandidates, self.SearchTermString, MatchCase=self.MatchCase)
+        try:
+            for ShardResults in ShardResultsIterator:
+                if self.Cancelled:
+                    break
+                PageResults = [(PageData[0], PageData[2], ExactTitle, TitleHits, ContentHits) for PageData, ExactTitle, TitleHits, ContentHits in ShardResults]
+                if len(PageResults) > 0:
+                    self.Signals.ResultsFound.emit(PageResults)
+        finally:
+            ShardResultsIterator.close()
+            self.Signals.Finished.emit()
+
+    def Cancel(self):
+        self.Cancelled = True
+
+
+class BackgroundSearcher(QObject):
+    # Each result is emitted with the row it belongs at among the results so far, so displays can insert results in ranked order as they arrive
+    ResultsFound = pyqtSignal(list)
+    TimedOut = pyqtSignal()
+    Finished = pyqtSignal(dict)
+
+    # Searches are kept here until they finish, since the thread pool does not keep them alive and a searcher can be deleted with its dialog mid-search
+    RunningSearches = set()
+
+    def __init__(self, Notebook, Parent=None):
+        super().__init__(Parent)
+
+        # Store Parameters
+        self.Notebook = Notebook
+
+        # Variables
+        self.CurrentSearch = None
+        self.CurrentSearchFinished = False
+        self.Filters = None
+        self.PendingPageResults = deque()
+        self.ResultsList = []
+        self.ResultSortKeys = []
+        self.TotalHits = 0
+        self.TotalPages = 0
+        self.ReceiveResultsDuration = 0.02
+
+        # Receive Results Timer
+        self.ReceiveResultsTimer = QTimer(self)
+        self.ReceiveResultsTimer.timeout.connect(self.ReceiveResults)
+
+    def Search(self, SearchTermString, MatchCase=False, Filters=None, RegularExpression=False, WholeWord=False):
+        # Raises re.error for an invalid regular expression before anything is searched
+        self.Cancel()
+        if not MatchCase and not RegularExpression and not WholeWord:
+            SearchTermString = SearchTermString.casefold()
+        self.Filters = Filters
+        self.ResultsList = []
+        self.ResultSortKeys = []
+        self.TotalHits = 0
+        self.TotalPages = 0
+        SearchCandidates = self.Notebook.GetSearchCandidatesInPageOrder(SearchTermString, MatchCase=MatchCase, RegularExpression=RegularExpression)
+        CurrentSearch = BackgroundSearch(self.Notebook, SearchCandidates, SearchTermString, MatchCase=MatchCase, RegularExpression=RegularExpression, WholeWord=WholeWord)
+        CurrentSearch.Signals.ResultsFound.connect(lambda PageResults, SearchInst=CurrentSearch: self.QueueResults(SearchInst, PageResults))
+        CurrentSearch.Signals.TimedOut.connect(lambda SearchInst=CurrentSearch: self.QueueTimedOut(SearchInst))
+        CurrentSearch.Signals.Finished.connect(lambda SearchInst=CurrentSearch: self.QueueFinish(SearchInst))
+        self.CurrentSearch = CurrentSearch
+        self.CurrentSearchFinished = False
+        self.RunningSearches.add(CurrentSearch)
+        QThreadPool.globalInstance().start(CurrentSearch)
+
+    def SetNotebook(self, Notebook):
+        self.Cancel()
+        self.Notebook = Notebook
+
+    def Cancel(self):
+        if self.CurrentSearch is not None:
+            self.CurrentSearch.Cancel()
+            self.CurrentSearch = None
+        self.ReceiveResultsTimer.stop()
+        self.PendingPageResults.clear()
+
+    def IsSearching(self):
+        return self.CurrentSearch is not None
+
+    def QueueResults(self, SearchInst, PageResults):
+        # Results are received a little at a time from the event loop, so a search finding many pages never holds up input
+        if SearchInst is not self.CurrentSearch:
+            return
+        self.PendingPageResults.extend(PageResults)
+        self.ReceiveResultsTimer.start()
+
+    def QueueTimedOut(self, SearchInst):
+        if SearchInst is not self.CurrentSearch:
+            return
+        self.Cancel()
+        self.TimedOut.emit()
+
+    def QueueFinish(self, SearchInst):
+        self.RunningSearches.discard(SearchInst)
+        if SearchInst is not self.CurrentSearch:
+            return
+        self.CurrentSearchFinished = True
+        self.ReceiveResultsTimer.start()
+
+    def ReceiveResults(self):
+        ReceiveEndTime = time.perf_counter() + self.ReceiveResultsDuration
+        RankedResults = []
+        while len(self.PendingPageResults) > 0 and time.perf_counter() < ReceiveEndTime:
+            Title, Page, ExactTitle, TitleHits, ContentHits = self.PendingPageResults.popleft()
+
+            # Pages deleted since the search started are no longer found at their own index paths
+            IndexPath = Page.IndexPath
+            if self.Notebook.GetPageFromIndexPath(IndexPath) is not Page:
+                continue
+            Result = (Title, IndexPath, ExactTitle, TitleHits, ContentHits)
+            if self.Filters is not None and len(self.Notebook.GetFilteredSearchResults({"ResultsList": [Result]}, self.Filters)["ResultsList"]) < 1:
+                continue
+
+            # Results arrive in page order, so a result goes after any earlier one of equal rank, as in a stable sort
+            ResultSortKey = (-ExactTitle, -TitleHits, -ContentHits)
+            Row = bisect_right(self.ResultSortKeys, ResultSortKey)
+            self.ResultSortKeys.insert(Row, ResultSortKey)
+            self.ResultsList.insert(Row, Result)
+            self.TotalHits += TitleHits + ContentHits
+            self.TotalPages += 1
+            RankedResults.append((Row, Result))
+        if len(RankedResults) > 0:
+            self.ResultsFound.emit(RankedResults)
+        if len(self.PendingPageResults) == 0:
+            self.ReceiveResultsTimer.stop()
+            if self.CurrentSearchFinished:
+                self.CurrentSearch = None
+                Results = {"ResultsList": self.ResultsList.copy(), "TotalHits": self.TotalHits, "TotalPages": self.TotalPages}
+                self.Finished.emit(Results)
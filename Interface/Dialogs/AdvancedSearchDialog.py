@@ -1,6 +1,10 @@
+import re
+
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QDialog, QGridLayout, QPushButton, QApplication, QLineEdit, QCheckBox, QListWidget, QLabel, QSizePolicy, QListWidgetItem, QTreeWidget, QTreeWidgetItem, QHeaderView
 
+from Interface.BackgroundSearch import BackgroundSearcher
+
 
 class AdvancedSearchDialog(QDialog):
     def __init__(self, MainWindow):
@@ -11,8 +15,15 @@ class AdvancedSearchDialog(QDialog):
 
         # Variables
         self.RefreshingSearchResults = False
+        self.RefreshingBackgroundSearchResults = False
         self.WithinPage = None
 
+        # Background Searcher
+        self.BackgroundSearcherInst = BackgroundSearcher(self.MainWindow.Notebook, self)
+        self.BackgroundSearcherInst.ResultsFound.connect(self.InsertSearchResults)
+        self.BackgroundSearcherInst.TimedOut.connect(self.BackgroundSearchTimedOut)
+        self.BackgroundSearcherInst.Finished.connect(self.FinishBackgroundSearch)
+
         # Inputs Size Policy
         self.InputsSizePolicy = QSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Minimum)
 
@@ -20,6 +31,7 @@ class AdvancedSearchDialog(QDialog):
         self.SearchTextLineEdit = QLineEdit()
         self.SearchTextLineEdit.setPlaceholderText("Search")
         self.SearchTextLineEdit.textChanged.connect(self.RehighlightTextWidget)
+        self.SearchTextLineEdit.textChanged.connect(self.BackgroundSearcherInst.Cancel)
         self.SearchTextLineEdit.setMinimumWidth(250)
         self.SearchTextLineEdit.setSizePolicy(self.InputsSizePolicy)
 
@@ -28,6 +40,17 @@ class AdvancedSearchDialog(QDialog):
         self.MatchCaseCheckBox.stateChanged.connect(self.RehighlightTextWidget)
         self.MatchCaseCheckBox.setSizePolicy(self.InputsSizePolicy)
 
+        # Whole Word Check Box
+        self.WholeWordCheckBox = QCheckBox("Whole Word")
+        self.WholeWordCheckBox.stateChanged.connect(self.RehighlightTextWidget)
+        self.WholeWordCheckBox.setSizePolicy(self.InputsSizePolicy)
+
+        # Regular Expression Check Box
+        self.RegularExpressionCheckBox = QCheckBox("Regular Expression")
+        self.RegularExpressionCheckBox.stateChanged.connect(self.StartPatternGuard)
+        self.RegularExpressionCheckBox.stateChanged.connect(self.RehighlightTextWidget)
+        self.RegularExpressionCheckBox.setSizePolicy(self.InputsSizePolicy)
+
         # Highlight Text Check Box
         self.HighlightCheckBox = QCheckBox("Highlight Text")
         self.HighlightCheckBox.setChecked(self.MainWindow.AdvancedSearchHighlightText)
@@ -115,7 +138,9 @@ class AdvancedSearchDialog(QDialog):
         self.SearchTextLayout = QGridLayout()
         self.SearchTextLayout.addWidget(self.SearchTextLineEdit, 0, 0)
         self.SearchTextLayout.addWidget(self.MatchCaseCheckBox, 0, 1)
-        self.SearchTextLayout.addWidget(self.HighlightCheckBox, 0, 2)
+        self.SearchTextLayout.addWidget(self.WholeWordCheckBox, 0, 2)
+        self.SearchTextLayout.addWidget(self.RegularExpressionCheckBox, 0, 3)
+        self.SearchTextLayout.addWidget(self.HighlightCheckBox, 0, 4)
         self.SearchTextLayout.setColumnStretch(0, 1)
         self.SearchLayout.addLayout(self.SearchTextLayout, 0, 0, 1, 3)
         self.SearchLayout.addWidget(self.ContentContainsLabel, 1, 0)
@@ -175,14 +200,29 @@ class AdvancedSearchDialog(QDialog):
     def Search(self):
         SearchText = self.SearchTextLineEdit.text()
         MatchCase = self.MatchCaseCheckBox.isChecked()
+        RegularExpression = self.RegularExpressionCheckBox.isChecked()
+        WholeWord = self.WholeWordCheckBox.isChecked()
+        self.BackgroundSearcherInst.Cancel()
         self.ResultsList.clear()
         if SearchText == "":
             return
-        UnfilteredResults = self.MainWindow.Notebook.GetSearchResults(SearchText, MatchCase=MatchCase)
-        Filters = self.GetFilters()
-        FilteredResults = self.MainWindow.Notebook.GetFilteredSearchResults(UnfilteredResults, Filters)
-        for Result in FilteredResults["ResultsList"]:
-            self.ResultsList.addItem(SearchResult(Result[0], Result[1], Result[3], Result[4], self.MainWindow.ShowHitCounts))
+        self.SearchResultsStatsLabel.setText("Searching...")
+        self.RefreshingBackgroundSearchResults = self.RefreshingSearchResults
+        try:
+            self.BackgroundSearcherInst.Search(SearchText, MatchCase=MatchCase, Filters=self.GetFilters(), RegularExpression=RegularExpression, WholeWord=WholeWord)
+        except re.error:
+            self.SearchResultsStatsLabel.setText("Invalid regular expression.")
+
+    def BackgroundSearchTimedOut(self):
+        self.SearchResultsStatsLabel.setText("Search timed out.")
+        self.ResultsList.clear()
+
+    def InsertSearchResults(self, RankedResults):
+        for Row, Result in RankedResults:
+            self.ResultsList.insertItem(Row, SearchResult(Result[0], Result[1], Result[3], Result[4], self.MainWindow.ShowHitCounts))
+
+    def FinishBackgroundSearch(self, FilteredResults):
+        self.RefreshingSearchResults = self.RefreshingBackgroundSearchResults
         if len(FilteredResults["ResultsList"]) > 0:
             TotalHits = str(FilteredResults["TotalHits"])
             PluralizeHits = ("" if FilteredResults["TotalHits"] == 1 else "s")
@@ -195,6 +235,7 @@ class AdvancedSearchDialog(QDialog):
         self.ResultsList.setCurrentRow(0)
         if not self.RefreshingSearchResults:
             self.ResultsList.setFocus()
+        self.RefreshingSearchResults = False
 
     def GetFilters(self):
         Filters = {}
@@ -294,9 +335,10 @@ class AdvancedSearchDialog(QDialog):
             QApplication.clipboard().setText(ResultsString)
 
     def ClearSearch(self):
+        self.BackgroundSearcherInst.Cancel()
         for LineEdit in [self.SearchTextLineEdit, self.ContentContainsLineEdit, self.ContentDoesNotContainLineEdit, self.ContentStartsWithLineEdit, self.ContentEndsWithLineEdit, self.TitleContainsLineEdit, self.TitleDoesNotContainLineEdit, self.TitleStartsWithLineEdit, self.TitleEndsWithLineEdit]:
             LineEdit.clear()
-        for CheckBox in [self.MatchCaseCheckBox, self.ContentContainsMatchCaseCheckBox, self.ContentDoesNotContainMatchCaseCheckBox, self.ContentStartsWithMatchCaseCheckBox, self.ContentEndsWithMatchCaseCheckBox, self.TitleContainsMatchCaseCheckBox, self.TitleDoesNotContainMatchCaseCheckBox, self.TitleStartsWithMatchCaseCheckBox, self.TitleEndsWithMatchCaseCheckBox]:
+        for CheckBox in [self.MatchCaseCheckBox, self.WholeWordCheckBox, self.RegularExpressionCheckBox, self.ContentContainsMatchCaseCheckBox, self.ContentDoesNotContainMatchCaseCheckBox, self.ContentStartsWithMatchCaseCheckBox, self.ContentEndsWithMatchCaseCheckBox, self.TitleContainsMatchCaseCheckBox, self.TitleDoesNotContainMatchCaseCheckBox, self.TitleStartsWithMatchCaseCheckBox, self.TitleEndsWithMatchCaseCheckBox]:
             CheckBox.setChecked(False)
         self.WithinPage = None
         self.SearchResultsStatsLabel.setText("No search results.")
@@ -307,8 +349,12 @@ class AdvancedSearchDialog(QDialog):
         self.MainWindow.AdvancedSearchHighlightText = not self.MainWindow.AdvancedSearchHighlightText
         self.RehighlightTextWidget()
 
+    def StartPatternGuard(self):
+        if self.RegularExpressionCheckBox.isChecked():
+            self.MainWindow.PatternGuardInst.Start()
+
     def RehighlightTextWidget(self):
-        self.MainWindow.TextWidgetInst.SyntaxHighlighter.rehighlight()
+        self.MainWindow.TextWidgetInst.SyntaxHighlighter.RehighlightDeferred()
 
     def SetGeometryToMinimum(self):
         FrameGeometryRectangle = self.frameGeometry()
@@ -323,6 +369,7 @@ class AdvancedSearchDialog(QDialog):
         self.move(FrameGeometryRectangle.topLeft())
 
     def closeEvent(self, event):
+        self.BackgroundSearcherInst.Cancel()
         self.MainWindow.AdvancedSearchDialogInst = None
         self.RehighlightTextWidget()
         return super().closeEvent(event)
@@ -3,8 +3,6 @@ import os
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QDialog, QLineEdit, QCheckBox, QListWidget, QListWidgetItem, QFrame, QLabel, QPushButton, QSizePolicy, QGridLayout, QSplitter, QFileDialog, QMessageBox, QInputDialog
 
-from Core import Base64Converters
-
 
 class FileManagerDialog(QDialog):
     def __init__(self, Notebook, MainWindow):
@@ -135,11 +133,11 @@ class FileManagerDialog(QDialog):
             SearchTerm = SearchTerm.lower()
         self.FileList.clear()
         self.LinkingPagesList.clear()
-        Files = sorted(self.Notebook.Files.items(), key=lambda File: File[0].lower())
+        FileNames = sorted(self.Notebook.Files.keys(), key=lambda FileName: FileName.lower())
         if SearchTerm != "":
-            Files = [File for File in Files if SearchTerm in (File[0].lower() if not MatchCase else File[0])]
-        for FileName, Base64String in Files:
-            self.FileList.addItem(FileListItem(FileName, Base64String))
+            FileNames = [FileName for FileName in FileNames if SearchTerm in (FileName.lower() if not MatchCase else FileName)]
+        for FileName in FileNames:
+            self.FileList.addItem(FileListItem(FileName))
         self.FileList.setCurrentRow(0)
 
     def AddFile(self):
@@ -201,10 +199,8 @@ class FileManagerDialog(QDialog):
                 elif any(Character in NewName for Character in self.ForbiddenCharacters):
                     self.MainWindow.DisplayMessageBox(f"File names cannot contain the following characters:  {" ".join(self.ForbiddenCharacters)}", Parent=self)
                 else:
-                    FileContent = self.Notebook.Files[f"{CurrentFileName}{CurrentFileExtension}"]
-                    self.Notebook.Files[f"{NewName}{CurrentFileExtension}"] = FileContent
-                    del self.Notebook.Files[f"{CurrentFileName}{CurrentFileExtension}"]
-                    self.MainWindow.SearchWidgetInst.ReplaceAllInNotebook(SearchText=f"]([file:{CurrentFileName}{CurrentFileExtension}", ReplaceText=f"]([file:{NewName}{CurrentFileExtension}", MatchCase=True)
+                    self.Notebook.Files.RenameAttachment(f"{CurrentFileName}{CurrentFileExtension}", f"{NewName}{CurrentFileExtension}")
+                    self.MainWindow.SearchWidgetInst.ReplaceAllInNotebook(SearchText=f"]([file:{CurrentFileName}{CurrentFileExtension}", ReplaceText=f"]([file:{NewName}{CurrentFileExtension}", MatchCase=True, RegularExpression=False, WholeWord=False)
                     self.UnsavedChanges = True
                     self.SearchLineEdit.clear()
                     self.PopulateFileList()
@@ -219,7 +215,7 @@ class FileManagerDialog(QDialog):
             if ExportFilePath != "":
                 if not ExportFilePath.endswith(CurrentFileExtension):
                     ExportFilePath += CurrentFileExtension
-                Base64Converters.WriteFileFromBase64String(SelectedItems[0].Base64String, ExportFilePath)
+                self.Notebook.Files.ExportAttachment(CurrentFileName, ExportFilePath)
 
     def ExportAllFiles(self):
         ExportDirectory = QFileDialog.getExistingDirectory(parent=self, caption="Export All Files")
@@ -228,7 +224,7 @@ class FileManagerDialog(QDialog):
             if len(ExportDirectoryContents) == 0:
                 for File in self.Notebook.Files.keys():
                     ExportFilePath = os.path.join(ExportDirectory, File)
-                    Base64Converters.WriteFileFromBase64String(self.Notebook.Files[File], ExportFilePath)
+                    self.Notebook.Files.ExportAttachment(File, ExportFilePath)
             else:
                 self.MainWindow.DisplayMessageBox("Choose an empty folder to export all files.", Parent=self)
 
@@ -274,11 +270,10 @@ class FileManagerDialog(QDialog):
 
 
 class FileListItem(QListWidgetItem):
-    def __init__(self, FileName, Base64String):
+    def __init__(self, FileName):
         super().__init__()
 
         self.FileName = FileName
-        self.Base64String = Base64String
 
         self.setText(self.FileName)
 
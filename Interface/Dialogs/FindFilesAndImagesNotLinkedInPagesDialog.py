@@ -39,8 +39,7 @@ class FindFilesAndImagesNotLinkedInPagesDialog(QDialog):
         self.exec()
 
     def PopulateResultList(self):
-        if not self.Notebook.SearchIndexUpToDate:
-            self.Notebook.BuildSearchIndex()
+        self.Notebook.UpdateSearchIndex()
 
         for Image in self.Notebook.Images.keys():
             SearchTerm = f"]({Image}"
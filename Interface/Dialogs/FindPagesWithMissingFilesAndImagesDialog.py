@@ -46,13 +46,10 @@ class FindPagesWithMissingFilesAndImagesDialog(QDialog):
         self.exec()
 
     def PopulateResultList(self):
-        if not self.Notebook.SearchIndexUpToDate:
-            self.Notebook.BuildSearchIndex()
-
-        for Page in self.Notebook.SearchIndex:
+        for Page in self.Notebook.GetSearchIndexInPageOrder():
             Title = Page[0]
             Content = Page[1]
-            IndexPath = Page[2]
+            IndexPath = Page[2]["IndexPath"]
 
             MissingFilesOrImages = self.GetMissingFilesOrImages(Content)
 
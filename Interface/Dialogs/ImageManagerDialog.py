@@ -4,8 +4,6 @@ from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import QCheckBox, QDialog, QFrame, QGridLayout, QLineEdit, QListWidget, QPushButton, QListWidgetItem, QLabel, QFileDialog, QMessageBox, QScrollArea, QSizePolicy, QSplitter, QInputDialog
 
-from Core import Base64Converters
-
 
 class ImageManagerDialog(QDialog):
     def __init__(self, Notebook, MainWindow, SearchImageName=None):
@@ -137,10 +135,8 @@ class ImageManagerDialog(QDialog):
     def ItemSelected(self):
         SelectedItems = self.ImageList.selectedItems()
         if len(SelectedItems) > 0:
-            CurrentFileContent = SelectedItems[0].Base64String
-            CurrentFileBinary = Base64Converters.GetBinaryFromBase64String(CurrentFileContent)
             ImagePixmap = QPixmap()
-            ImagePixmap.loadFromData(CurrentFileBinary)
+            ImagePixmap.loadFromData(self.Notebook.Images[SelectedItems[0].FileName])
             self.ImageDisplay.setPixmap(ImagePixmap)
             self.ImageDisplay.resize(self.ImageDisplay.pixmap().size())
             CurrentFileName = SelectedItems[0].FileName
@@ -161,11 +157,11 @@ class ImageManagerDialog(QDialog):
         self.ImageDisplay.clear()
         self.ImageDisplay.resize(QSize(0, 0))
         self.LinkingPagesList.clear()
-        Images = sorted(self.Notebook.Images.items(), key=lambda Image: Image[0].lower())
+        ImageNames = sorted(self.Notebook.Images.keys(), key=lambda ImageName: ImageName.lower())
         if SearchTerm != "":
-            Images = [Image for Image in Images if SearchTerm in (Image[0].lower() if not MatchCase else Image[0])]
-        for FileName, Base64String in Images:
-            self.ImageList.addItem(ImageListItem(FileName, Base64String))
+            ImageNames = [ImageName for ImageName in ImageNames if SearchTerm in (ImageName.lower() if not MatchCase else ImageName)]
+        for FileName in ImageNames:
+            self.ImageList.addItem(ImageListItem(FileName))
         self.ImageList.setCurrentRow(0)
 
     def AddImage(self):
@@ -227,10 +223,8 @@ class ImageManagerDialog(QDialog):
                 elif any(Character in NewName for Character in self.ForbiddenCharacters):
                     self.MainWindow.DisplayMessageBox(f"Image names cannot contain the following characters:  {" ".join(self.ForbiddenCharacters)}", Parent=self)
                 else:
-                    ImageContent = self.Notebook.Images[f"{CurrentFileName}{CurrentFileExtension}"]
-                    self.Notebook.Images[f"{NewName}{CurrentFileExtension}"] = ImageContent
-                    del self.Notebook.Images[f"{CurrentFileName}{CurrentFileExtension}"]
-                    self.MainWindow.SearchWidgetInst.ReplaceAllInNotebook(SearchText=f"]({CurrentFileName}{CurrentFileExtension}", ReplaceText=f"]({NewName}{CurrentFileExtension}", MatchCase=True)
+                    self.Notebook.Images.RenameAttachment(f"{CurrentFileName}{CurrentFileExtension}", f"{NewName}{CurrentFileExtension}")
+                    self.MainWindow.SearchWidgetInst.ReplaceAllInNotebook(SearchText=f"]({CurrentFileName}{CurrentFileExtension}", ReplaceText=f"]({NewName}{CurrentFileExtension}", MatchCase=True, RegularExpression=False, WholeWord=False)
                     self.UnsavedChanges = True
                     self.SearchLineEdit.clear()
                     self.PopulateImageList()
@@ -245,7 +239,7 @@ class ImageManagerDialog(QDialog):
             if ExportImagePath != "":
                 if not ExportImagePath.endswith(CurrentFileExtension):
                     ExportImagePath += CurrentFileExtension
-                Base64Converters.WriteFileFromBase64String(SelectedItems[0].Base64String, ExportImagePath)
+                self.Notebook.Images.ExportAttachment(CurrentFileName, ExportImagePath)
 
     def ExportAllImages(self):
         ExportDirectory = QFileDialog.getExistingDirectory(parent=self, caption="Export All Image Files")
@@ -254,7 +248,7 @@ class ImageManagerDialog(QDialog):
             if len(ExportDirectoryContents) == 0:
                 for Image in self.Notebook.Images.keys():
                     ExportImagePath = os.path.join(ExportDirectory, Image)
-                    Base64Converters.WriteFileFromBase64String(self.Notebook.Images[Image], ExportImagePath)
+                    self.Notebook.Images.ExportAttachment(Image, ExportImagePath)
             else:
                 self.MainWindow.DisplayMessageBox("Choose an empty folder to export all image files.", Parent=self)
 
@@ -300,11 +294,10 @@ class ImageManagerDialog(QDialog):
 
 
 class ImageListItem(QListWidgetItem):
-    def __init__(self, FileName, Base64String):
+    def __init__(self, FileName):
         super().__init__()
 
         self.FileName = FileName
-        self.Base64String = Base64String
 
         self.setText(self.FileName)
 
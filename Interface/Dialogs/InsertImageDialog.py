@@ -2,8 +2,6 @@ from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import QCheckBox, QDialog, QGridLayout, QLabel, QLineEdit, QListWidget, QListWidgetItem, QPushButton, QScrollArea, QSplitter
 
-from Core import Base64Converters
-
 
 class InsertImageDialog(QDialog):
     def __init__(self, Notebook, MainWindow):
@@ -78,10 +76,8 @@ class InsertImageDialog(QDialog):
     def ItemSelected(self):
         SelectedItems = self.ImageList.selectedItems()
         if len(SelectedItems) > 0:
-            CurrentFileContent = SelectedItems[0].Base64String
-            CurrentFileBinary = Base64Converters.GetBinaryFromBase64String(CurrentFileContent)
             ImagePixmap = QPixmap()
-            ImagePixmap.loadFromData(CurrentFileBinary)
+            ImagePixmap.loadFromData(self.Notebook.Images[SelectedItems[0].FileName])
             self.ImageDisplay.setPixmap(ImagePixmap)
             self.ImageDisplay.resize(self.ImageDisplay.pixmap().size())
 
@@ -93,11 +89,11 @@ class InsertImageDialog(QDialog):
         self.ImageList.clear()
         self.ImageDisplay.clear()
         self.ImageDisplay.resize(QSize(0, 0))
-        Images = sorted(self.Notebook.Images.items(), key=lambda Image: Image[0].lower())
+        ImageNames = sorted(self.Notebook.Images.keys(), key=lambda ImageName: ImageName.lower())
         if SearchTerm != "":
-            Images = [Image for Image in Images if SearchTerm in (Image[0].lower() if not MatchCase else Image[0])]
-        for FileName, Base64String in Images:
-            self.ImageList.addItem(ImageListItem(FileName, Base64String))
+            ImageNames = [ImageName for ImageName in ImageNames if SearchTerm in (ImageName.lower() if not MatchCase else ImageName)]
+        for FileName in ImageNames:
+            self.ImageList.addItem(ImageListItem(FileName))
         self.ImageList.setCurrentRow(0)
 
     def InsertImage(self):
@@ -116,11 +112,10 @@ class InsertImageDialog(QDialog):
 
 
 class ImageListItem(QListWidgetItem):
-    def __init__(self, FileName, Base64String):
+    def __init__(self, FileName):
         super().__init__()
 
         self.FileName = FileName
-        self.Base64String = Base64String
 
         self.setText(self.FileName)
 
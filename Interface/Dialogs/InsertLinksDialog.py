@@ -4,6 +4,7 @@ from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import QDialog, QLineEdit, QTextEdit, QTreeWidget, QHeaderView, QTreeWidgetItem, QGridLayout, QPushButton, QCheckBox, QLabel, QComboBox
 
 from Core import MarkdownRenderers
+from Interface.BackgroundSearch import BackgroundSearcher
 
 
 class InsertLinksDialog(QDialog):
@@ -34,6 +35,11 @@ class InsertLinksDialog(QDialog):
         self.Width = max(self.Parent.width() - 100, 100)
         self.Height = max(self.Parent.height() - 100, 100)
 
+        # Background Searcher
+        self.BackgroundSearcherInst = BackgroundSearcher(self.Notebook, self)
+        self.BackgroundSearcherInst.ResultsFound.connect(self.InsertSearchResults)
+        self.BackgroundSearcherInst.Finished.connect(self.FinishBackgroundSearch)
+
         # Search Line Edit
         self.SearchLineEdit = SearchLineEdit(self)
         self.SearchLineEdit.setPlaceholderText("Search")
@@ -135,17 +141,21 @@ class InsertLinksDialog(QDialog):
     def Cancel(self):
         self.close()
 
+    def done(self, Result):
+        self.BackgroundSearcherInst.Cancel()
+        super().done(Result)
+
     def PopulateNotebookDisplay(self):
         SearchTerm = self.SearchLineEdit.text()
+        self.BackgroundSearcherInst.Cancel()
         self.NotebookDisplay.clear()
         if SearchTerm == "":
             self.NotebookDisplay.setRootIsDecorated(True)
             self.FillNotebookWidgetItem(self.NotebookDisplay.invisibleRootItem(), self.Notebook.RootPage, IsRootPage=True)
         else:
             MatchCase = self.MatchCaseCheckBox.isChecked()
-            SearchResults = self.Notebook.GetSearchResults(SearchTerm, MatchCase=MatchCase)
             self.NotebookDisplay.setRootIsDecorated(False)
-            self.FillNotebookWidgetItemFromSearchResults(SearchResults)
+            self.BackgroundSearcherInst.Search(SearchTerm, MatchCase=MatchCase)
 
     def FillNotebookWidgetItem(self, CurrentTreeItem, CurrentPage, IsRootPage=False):
         SubPageIndexPaths = []
@@ -162,14 +172,16 @@ class InsertLinksDialog(QDialog):
             ChildTreeItem.setExpanded(True)
             self.NotebookDisplay.setCurrentIndex(self.NotebookDisplay.model().index(0, 0))
 
-    def FillNotebookWidgetItemFromSearchResults(self, SearchResults):
-        for Result in SearchResults["ResultsList"]:
+    def InsertSearchResults(self, RankedResults):
+        for Row, Result in RankedResults:
             CurrentPage = self.Notebook.GetPageFromIndexPath(Result[1])
             SubPageIndexPaths = []
             for SubPage in CurrentPage["SubPages"]:
                 SubPageIndexPaths.append((SubPage["Title"], SubPage["IndexPath"]))
             ChildTreeItem = NotebookDisplayItem(Result[0], Result[1], SubPageIndexPaths)
-            self.NotebookDisplay.invisibleRootItem().addChild(ChildTreeItem)
+            self.NotebookDisplay.invisibleRootItem().insertChild(Row, ChildTreeItem)
+
+    def FinishBackgroundSearch(self, SearchResults):
         self.NotebookDisplay.setCurrentIndex(self.NotebookDisplay.model().index(0, 0))
 
     def UpdatePreview(self):
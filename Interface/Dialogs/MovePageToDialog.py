@@ -4,6 +4,7 @@ from PyQt6.QtGui import QColor, QFont
 from PyQt6.QtWidgets import QDialog, QHeaderView, QTextEdit, QPushButton, QCheckBox, QGridLayout, QLineEdit, QTreeWidget, QTreeWidgetItem
 
 from Core import MarkdownRenderers
+from Interface.BackgroundSearch import BackgroundSearcher
 
 
 class MovePageToDialog(QDialog):
@@ -25,6 +26,11 @@ class MovePageToDialog(QDialog):
         self.Width = max(self.MainWindow.width() - 100, 100)
         self.Height = max(self.MainWindow.height() - 100, 100)
 
+        # Background Searcher
+        self.BackgroundSearcherInst = BackgroundSearcher(self.Notebook, self)
+        self.BackgroundSearcherInst.ResultsFound.connect(self.InsertSearchResults)
+        self.BackgroundSearcherInst.Finished.connect(self.FinishBackgroundSearch)
+
         # Search Line Edit
         self.SearchLineEdit = SearchLineEdit(self)
         self.SearchLineEdit.setPlaceholderText("Search")
@@ -98,17 +104,21 @@ class MovePageToDialog(QDialog):
     def Cancel(self):
         self.close()
 
+    def done(self, Result):
+        self.BackgroundSearcherInst.Cancel()
+        super().done(Result)
+
     def PopulateNotebookDisplay(self):
         SearchTerm = self.SearchLineEdit.text()
+        self.BackgroundSearcherInst.Cancel()
         self.NotebookDisplay.clear()
         if SearchTerm == "":
             self.NotebookDisplay.setRootIsDecorated(True)
             self.FillNotebookWidgetItem(self.NotebookDisplay.invisibleRootItem(), self.Notebook.RootPage, self.CurrentPageIndexPath[:-1] == [0], False, IsRootPage=True)
         else:
             MatchCase = self.MatchCaseCheckBox.isChecked()
-            SearchResults = self.Notebook.GetSearchResults(SearchTerm, MatchCase=MatchCase)
             self.NotebookDisplay.setRootIsDecorated(False)
-            self.FillNotebookWidgetItemFromSearchResults(SearchResults)
+            self.BackgroundSearcherInst.Search(SearchTerm, MatchCase=MatchCase)
 
     def FillNotebookWidgetItem(self, CurrentTreeItem, CurrentPage, IsInvalidTarget, IsPageToMove, IsRootPage=False):
         ChildTreeItem = NotebookDisplayItem(CurrentPage["Title"], CurrentPage["IndexPath"], IsInvalidTarget, IsPageToMove)
@@ -121,10 +131,12 @@ class MovePageToDialog(QDialog):
             ChildTreeItem.setExpanded(True)
             self.NotebookDisplay.setCurrentIndex(self.NotebookDisplay.model().index(0, 0))
 
-    def FillNotebookWidgetItemFromSearchResults(self, SearchResults):
-        for Result in SearchResults["ResultsList"]:
+    def InsertSearchResults(self, RankedResults):
+        for Row, Result in RankedResults:
             ChildTreeItem = NotebookDisplayItem(Result[0], Result[1], Result[1][:len(self.CurrentPageIndexPath)] == self.CurrentPageIndexPath or Result[1] == self.CurrentPageIndexPath[:-1], Result[1] == self.CurrentPageIndexPath)
-            self.NotebookDisplay.invisibleRootItem().addChild(ChildTreeItem)
+            self.NotebookDisplay.invisibleRootItem().insertChild(Row, ChildTreeItem)
+
+    def FinishBackgroundSearch(self, SearchResults):
         self.NotebookDisplay.setCurrentIndex(self.NotebookDisplay.model().index(0, 0))
 
     def UpdatePreview(self):
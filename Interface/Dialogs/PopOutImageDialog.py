@@ -2,16 +2,14 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import QDialog, QLabel, QScrollArea, QPushButton, QGridLayout
 
-from Core import Base64Converters
-
 
 class PopOutImageDialog(QDialog):
-    def __init__(self, ImageName, ImageBase64, MainWindow):
+    def __init__(self, ImageName, ImageBinary, MainWindow):
         super().__init__(parent=MainWindow)
 
         # Store Parameters
         self.ImageName = ImageName
-        self.ImageBase64 = ImageBase64
+        self.ImageBinary = ImageBinary
         self.MainWindow = MainWindow
 
         # Variables
@@ -48,9 +46,8 @@ class PopOutImageDialog(QDialog):
         self.show()
     
     def RefreshImage(self):
-        ImageBinary = Base64Converters.GetBinaryFromBase64String(self.ImageBase64)
         ImagePixmap = QPixmap()
-        ImagePixmap.loadFromData(ImageBinary)
+        ImagePixmap.loadFromData(self.ImageBinary)
         self.ImageDisplay.setPixmap(ImagePixmap)
         self.ImageDisplay.resize(self.ImageDisplay.pixmap().size())
 
@@ -1,5 +1,3 @@
-import json
-
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor
 from PyQt6.QtWidgets import QDialog, QGridLayout, QLabel, QTreeWidget, QHeaderView, QPushButton, QTreeWidgetItem
@@ -53,11 +51,12 @@ class SearchForLinkedPagesDialog(QDialog):
         self.exec()
 
     def PopulateNotebookDisplay(self):
+        self.LinkedPageKeys = {id(LinkedPage) for LinkedPage in self.MainWindow.Notebook.GetLinkedPages(self.LinkingPage)}
         self.NotebookDisplay.setRootIsDecorated(True)
         self.FillNotebookWidgetItem(self.NotebookDisplay.invisibleRootItem(), self.MainWindow.Notebook.RootPage, IsRootPage=True)
 
     def FillNotebookWidgetItem(self, CurrentTreeItem, CurrentPage, IsRootPage=False):
-        IsLinkedPage = f"]({json.dumps(CurrentPage["IndexPath"])}" in self.LinkingPage["Content"]
+        IsLinkedPage = id(CurrentPage) in self.LinkedPageKeys
         ChildTreeItem = NotebookDisplayItem(CurrentPage["Title"], CurrentPage["IndexPath"], IsLinkedPage)
         CurrentTreeItem.addChild(ChildTreeItem)
 
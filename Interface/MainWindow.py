@@ -9,9 +9,12 @@ from PyQt6.QtGui import QColor, QIcon, QPalette, QPdfWriter, QTextCursor, QActio
 from PyQt6.QtWidgets import QFileDialog, QLabel, QMainWindow, QInputDialog, QMessageBox, QSplitter, QApplication, QTextEdit, QFrame, QGridLayout
 
 from Build import BuildVariables
-from Core import Base64Converters
-from Core.MarkdownRenderers import ConstructHTMLExportString, ConstructPDFExportHTMLString, Renderer
+from Core.AttachmentStore import AttachmentStore
+from Core.MarkdownRenderers import ConstructHTMLExportString, ConstructPDFExportHTMLString, Renderer, RenderCache
 from Core.Notebook import Notebook
+from Core.NotebookPage import NotebookPage
+from Core.ParallelSearch import ParallelSearcher
+from Core.SearchPatterns import PatternGuard
 from Interface.Dialogs.AdvancedSearchDialog import AdvancedSearchDialog
 from Interface.Dialogs.DefaultPopOutSizeDialog import DefaultPopOutSizeDialog
 from Interface.Dialogs.DemotePageDialog import DemotePageDialog
@@ -36,6 +39,7 @@ from Interface.Widgets.NavigationBar import NavigationBar
 from Interface.Widgets.NotebookDisplayWidget import NotebookDisplayWidget
 from Interface.Widgets.SearchWidget import SearchWidget
 from Interface.Widgets.TextWidget import TextWidget
+from SaveAndLoad.Compression import CompressionCodecs, GetAvailableCompressionCodecs
 from SaveAndLoad.SaveAndOpenMixin import SaveAndOpenMixin
 
 
@@ -59,6 +63,9 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.BackNavigation = False
         self.AutoScrollQueue = None
         self.ShowHitCounts = False
+        self.ParallelSearch = False
+        self.ParallelSearcherInst = None
+        self.PatternGuardInst = PatternGuard()
         self.SwapLeftAndMiddleClickForLinks = False
         self.SwapLeftAndMiddleClickForImages = False
         self.MoveCursorToEndOfLinkText = True
@@ -73,12 +80,18 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.AdvancedSearchDialogInst = None
         self.SortIgnoresBlankLines = True
         self.CheckForUpdatesOnStart = True
+        self.AutosaveInterval = 0
+        self.UnsavedChangesSinceAutosave = False
 
-        # Set Up Save and Open
-        self.SetUpSaveAndOpen(".ntbk", "Notebook", (Notebook,))
+        # Set Up Save and Open (Attachment Stores Are Only Found in Notebook States, So Pages Are Not Checked for Objects)
+        self.SetUpSaveAndOpen(".ntbk", "Notebook", (Notebook, AttachmentStore), ObjectDepth=1)
 
         # Create Notebook
         self.Notebook = Notebook()
+        self.Notebook.PatternGuard = self.PatternGuardInst
+
+        # Create Render Cache
+        self.RenderCacheInst = RenderCache()
 
         # Create Interface
         self.CreateInterface()
@@ -88,6 +101,10 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.PopOutMarkdownRenderer = Renderer(self.Notebook)
         self.PopOutMarkdownParser = mistune.Markdown(renderer=self.PopOutMarkdownRenderer)
 
+        # Create Autosave Timer
+        self.AutosaveTimer = QTimer(self)
+        self.AutosaveTimer.timeout.connect(self.Autosave)
+
         # Load Configs
         self.LoadConfigs()
 
@@ -255,6 +272,30 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.GzipModeAction.setChecked(self.GzipMode)
         self.GzipModeAction.triggered.connect(self.ToggleGzipMode)
 
+        self.SetCompressionCodecAction = QAction("Set Compression Codec")
+        self.SetCompressionCodecAction.triggered.connect(self.SetCompressionCodec)
+
+        self.SetCompressionLevelAction = QAction("Set Compression Level")
+        self.SetCompressionLevelAction.triggered.connect(self.SetCompressionLevel)
+
+        self.ZipContainerModeAction = QAction("Zip Container Mode (Binary Attachments)")
+        self.ZipContainerModeAction.setCheckable(True)
+        self.ZipContainerModeAction.setChecked(self.ZipContainerMode)
+        self.ZipContainerModeAction.triggered.connect(self.ToggleZipContainerMode)
+
+        self.CompactJSONModeAction = QAction("Compact JSON Mode (No Indentation)")
+        self.CompactJSONModeAction.setCheckable(True)
+        self.CompactJSONModeAction.setChecked(self.CompactJSONMode)
+        self.CompactJSONModeAction.triggered.connect(self.ToggleCompactJSONMode)
+
+        self.JournalModeAction = QAction("Journal Mode (Faster Saves of Large Notebooks)")
+        self.JournalModeAction.setCheckable(True)
+        self.JournalModeAction.setChecked(self.JournalMode)
+        self.JournalModeAction.triggered.connect(self.ToggleJournalMode)
+
+        self.SetAutosaveIntervalAction = QAction("Set Autosave Interval")
+        self.SetAutosaveIntervalAction.triggered.connect(self.SetAutosaveInterval)
+
         self.ExitAction = QAction("Exit")
         self.ExitAction.triggered.connect(self.close)
 
@@ -468,6 +509,11 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.ShowHitCountsAction.setChecked(False)
         self.ShowHitCountsAction.triggered.connect(self.ToggleShowHitCounts)
 
+        self.ParallelSearchAction = QAction("Parallel Search (Faster Searches of Large Notebooks)")
+        self.ParallelSearchAction.setCheckable(True)
+        self.ParallelSearchAction.setChecked(False)
+        self.ParallelSearchAction.triggered.connect(self.ToggleParallelSearch)
+
         self.ZoomOutAction = QAction(self.ZoomOutIcon, "Zoom Out")
         self.ZoomOutAction.triggered.connect(self.ZoomOut)
 
@@ -634,6 +680,12 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.FileMenu.addAction(self.ImportPageAction)
         self.FileMenu.addSeparator()
         self.FileMenu.addAction(self.GzipModeAction)
+        self.FileMenu.addAction(self.SetCompressionCodecAction)
+        self.FileMenu.addAction(self.SetCompressionLevelAction)
+        self.FileMenu.addAction(self.ZipContainerModeAction)
+        self.FileMenu.addAction(self.CompactJSONModeAction)
+        self.FileMenu.addAction(self.JournalModeAction)
+        self.FileMenu.addAction(self.SetAutosaveIntervalAction)
         self.FileMenu.addSeparator()
         self.FileMenu.addAction(self.ExitAction)
 
@@ -703,6 +755,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.ViewMenu.addAction(self.CopySearchResultsAction)
         self.ViewMenu.addAction(self.AdvancedSearchAction)
         self.ViewMenu.addAction(self.ShowHitCountsAction)
+        self.ViewMenu.addAction(self.ParallelSearchAction)
         self.ViewMenu.addSeparator()
         self.ViewMenu.addAction(self.ZoomOutAction)
         self.ViewMenu.addAction(self.ZoomInAction)
@@ -930,6 +983,16 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
             self.ShowHitCounts = False
         self.ShowHitCountsAction.setChecked(self.ShowHitCounts)
 
+        # Parallel Search
+        ParallelSearchFile = self.GetResourcePath("Configs/ParallelSearch.cfg")
+        if os.path.isfile(ParallelSearchFile):
+            with open(ParallelSearchFile, "r") as ConfigFile:
+                self.ParallelSearch = json.loads(ConfigFile.read())
+        else:
+            self.ParallelSearch = False
+        self.ParallelSearchAction.setChecked(self.ParallelSearch)
+        self.UpdateParallelSearcher()
+
         # Swap Left and Middle Click for Links
         SwapLeftAndMiddleClickForLinksFile = self.GetResourcePath("Configs/SwapLeftAndMiddleClickForLinks.cfg")
         if os.path.isfile(SwapLeftAndMiddleClickForLinksFile):
@@ -1044,6 +1107,13 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
             self.resize(self.SizeAndPosition["Size"][0], self.SizeAndPosition["Size"][1])
             self.move(self.SizeAndPosition["Position"][0], self.SizeAndPosition["Position"][1])
 
+        # Autosave Interval
+        AutosaveIntervalFile = self.GetResourcePath("Configs/AutosaveInterval.cfg")
+        if os.path.isfile(AutosaveIntervalFile):
+            with open(AutosaveIntervalFile, "r") as ConfigFile:
+                self.AutosaveInterval = json.loads(ConfigFile.read())
+        self.UpdateAutosaveTimer()
+
         # Check for Updates on Start
         CheckForUpdatesOnStartFile = self.GetResourcePath("Configs/CheckForUpdatesOnStart.cfg")
         if os.path.isfile(CheckForUpdatesOnStartFile):
@@ -1087,6 +1157,10 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         with open(self.GetResourcePath("Configs/ShowHitCounts.cfg"), "w") as ConfigFile:
             ConfigFile.write(json.dumps(self.ShowHitCounts))
 
+        # Parallel Search
+        with open(self.GetResourcePath("Configs/ParallelSearch.cfg"), "w") as ConfigFile:
+            ConfigFile.write(json.dumps(self.ParallelSearch))
+
         # Swap Left and Middle Click for Links
         with open(self.GetResourcePath("Configs/SwapLeftAndMiddleClickForLinks.cfg"), "w") as ConfigFile:
             ConfigFile.write(json.dumps(self.SwapLeftAndMiddleClickForLinks))
@@ -1148,6 +1222,22 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         # Gzip Mode
         self.SaveGzipMode()
 
+        # Compression Settings
+        self.SaveCompressionSettings()
+
+        # Zip Container Mode
+        self.SaveZipContainerMode()
+
+        # Compact JSON Mode
+        self.SaveCompactJSONMode()
+
+        # Journal Mode
+        self.SaveJournalMode()
+
+        # Autosave Interval
+        with open(self.GetResourcePath("Configs/AutosaveInterval.cfg"), "w") as ConfigFile:
+            ConfigFile.write(json.dumps(self.AutosaveInterval))
+
         # Default Notebook
         with open(self.GetResourcePath("Configs/DefaultNotebook.cfg"), "w") as ConfigFile:
             ConfigFile.write(json.dumps(self.DefaultNotebook))
@@ -1164,8 +1254,14 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.NotebookDisplayWidgetInst.Notebook = self.Notebook
         self.TextWidgetInst.Notebook = self.Notebook
         self.TextWidgetInst.Renderer.Notebook = self.Notebook
+        self.Notebook.ParallelSearcher = self.ParallelSearcherInst
+        self.Notebook.PatternGuard = self.PatternGuardInst
         self.SearchWidgetInst.Notebook = self.Notebook
+        self.SearchWidgetInst.BackgroundSearcherInst.SetNotebook(self.Notebook)
+        if self.AdvancedSearchDialogInst is not None:
+            self.AdvancedSearchDialogInst.BackgroundSearcherInst.SetNotebook(self.Notebook)
         self.PopOutMarkdownRenderer.Notebook = self.Notebook
+        self.RenderCacheInst.Clear()
         self.CloseAllPopOutPages()
         self.CloseAllPopOutImages()
 
@@ -1251,7 +1347,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                 self.Notebook.AddSubPage(NewPageDialogInst.NewPageName, "" if NewPageDialogInst.TemplateName == "None" else self.Notebook.GetTemplate(NewPageDialogInst.TemplateName), CurrentPageIndexPath)
                 NewLinkData = self.GetLinkData()
                 self.UpdateLinks(OldLinkData, NewLinkData)
-                self.NotebookDisplayWidgetInst.FillFromRootPage()
+                self.NotebookDisplayWidgetInst.UpdateFromRootPage()
                 self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPageIndexPath, ScrollToLastChild=True)
                 self.SearchWidgetInst.RefreshSearch()
                 self.RefreshAdvancedSearch()
@@ -1272,7 +1368,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                 self.UpdateDeletedPageLinks(CurrentPage)
                 NewLinkData = self.GetLinkData()
                 self.UpdateLinks(OldLinkData, NewLinkData)
-                self.NotebookDisplayWidgetInst.FillFromRootPage()
+                self.NotebookDisplayWidgetInst.UpdateFromRootPage()
                 SelectParent = False
                 SelectDelta = 0
                 CurrentPageSuperSubPagesLength = len(self.Notebook.GetSuperOfPageFromIndexPath(CurrentPageIndexPath)["SubPages"])
@@ -1297,9 +1393,10 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                 else:
                     OldLinkData = self.GetLinkData()
                     CurrentPage["Title"] = NewName
+                    self.Notebook.FlagPageForSearchIndexUpdate(CurrentPage)
                     NewLinkData = self.GetLinkData()
                     self.UpdateLinks(OldLinkData, NewLinkData)
-                    self.NotebookDisplayWidgetInst.FillFromRootPage()
+                    self.NotebookDisplayWidgetInst.UpdatePageTitle(CurrentPage)
                     self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPageIndexPath)
                     self.SearchWidgetInst.RefreshSearch()
                     self.RefreshAdvancedSearch()
@@ -1319,7 +1416,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                     self.Notebook.AddSiblingPageBefore(CurrentPageIndexPath, NewPageDialogInst.NewPageName, "" if NewPageDialogInst.TemplateName == "None" else self.Notebook.GetTemplate(NewPageDialogInst.TemplateName))
                     NewLinkData = self.GetLinkData()
                     self.UpdateLinks(OldLinkData, NewLinkData)
-                    self.NotebookDisplayWidgetInst.FillFromRootPage()
+                    self.NotebookDisplayWidgetInst.UpdateFromRootPage()
                     self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPageIndexPath)
                     self.SearchWidgetInst.RefreshSearch()
                     self.RefreshAdvancedSearch()
@@ -1336,7 +1433,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
             elif self.Notebook.MoveSubPage(CurrentPageIndexPath, Delta):
                 NewLinkData = self.GetLinkData()
                 self.UpdateLinks(OldLinkData, NewLinkData)
-                self.NotebookDisplayWidgetInst.FillFromRootPage()
+                self.NotebookDisplayWidgetInst.UpdateFromRootPage()
                 self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPageIndexPath, SelectDelta=Delta)
                 self.SearchWidgetInst.RefreshSearch()
                 self.RefreshAdvancedSearch()
@@ -1357,7 +1454,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                 self.Notebook.PromoteSubPage(CurrentPageIndexPath)
                 NewLinkData = self.GetLinkData()
                 self.UpdateLinks(OldLinkData, NewLinkData)
-                self.NotebookDisplayWidgetInst.FillFromRootPage()
+                self.NotebookDisplayWidgetInst.UpdateFromRootPage()
                 self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPage["IndexPath"])
                 self.SearchWidgetInst.RefreshSearch()
                 self.RefreshAdvancedSearch()
@@ -1383,7 +1480,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                     self.Notebook.DemoteSubPage(CurrentPageIndexPath, SiblingPageIndex)
                     NewLinkData = self.GetLinkData()
                     self.UpdateLinks(OldLinkData, NewLinkData)
-                    self.NotebookDisplayWidgetInst.FillFromRootPage()
+                    self.NotebookDisplayWidgetInst.UpdateFromRootPage()
                     self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPage["IndexPath"])
                     self.SearchWidgetInst.RefreshSearch()
                     self.RefreshAdvancedSearch()
@@ -1403,7 +1500,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                 self.Notebook.PromoteAllSubPages(CurrentPageIndexPath)
                 NewLinkData = self.GetLinkData()
                 self.UpdateLinks(OldLinkData, NewLinkData)
-                self.NotebookDisplayWidgetInst.FillFromRootPage()
+                self.NotebookDisplayWidgetInst.UpdateFromRootPage()
                 self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPageIndexPath)
                 self.SearchWidgetInst.RefreshSearch()
                 self.RefreshAdvancedSearch()
@@ -1424,7 +1521,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                 self.Notebook.DemoteAllSiblingPages(CurrentPageIndexPath)
                 NewLinkData = self.GetLinkData()
                 self.UpdateLinks(OldLinkData, NewLinkData)
-                self.NotebookDisplayWidgetInst.FillFromRootPage()
+                self.NotebookDisplayWidgetInst.UpdateFromRootPage()
                 self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPage["IndexPath"])
                 self.SearchWidgetInst.RefreshSearch()
                 self.RefreshAdvancedSearch()
@@ -1444,7 +1541,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
                     self.Notebook.MoveSubPageTo(CurrentPageIndexPath, DestinationIndexPath)
                     NewLinkData = self.GetLinkData()
                     self.UpdateLinks(OldLinkData, NewLinkData)
-                    self.NotebookDisplayWidgetInst.FillFromRootPage()
+                    self.NotebookDisplayWidgetInst.UpdateFromRootPage()
                     self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPage["IndexPath"])
                     self.SearchWidgetInst.RefreshSearch()
                     self.RefreshAdvancedSearch()
@@ -1460,7 +1557,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
             self.Notebook.AlphabetizeSubPages(CurrentPageIndexPath)
             NewLinkData = self.GetLinkData()
             self.UpdateLinks(OldLinkData, NewLinkData)
-            self.NotebookDisplayWidgetInst.FillFromRootPage()
+            self.NotebookDisplayWidgetInst.UpdateFromRootPage()
             self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(CurrentPageIndexPath)
             self.SearchWidgetInst.RefreshSearch()
             self.RefreshAdvancedSearch()
@@ -1468,10 +1565,9 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
             self.NotebookDisplayWidgetInst.setFocus()
 
     def CopyLinkToCurrentPage(self):
-        IndexPathToCurrentPage = self.NotebookDisplayWidgetInst.GetCurrentPageIndexPath()
-        IndexPathStringToCurrentPage = json.dumps(IndexPathToCurrentPage)
-        CurrentPageTitle = self.Notebook.GetPageFromIndexPath(IndexPathToCurrentPage)["Title"]
-        LinkToCurrentPage = f"[{CurrentPageTitle}]({IndexPathStringToCurrentPage} \"{CurrentPageTitle}\")"
+        CurrentPage = self.Notebook.GetPageFromIndexPath(self.NotebookDisplayWidgetInst.GetCurrentPageIndexPath())
+        CurrentPageTitle = CurrentPage["Title"]
+        LinkToCurrentPage = f"[{CurrentPageTitle}]({self.Notebook.GetPageLinkString(CurrentPage)} \"{CurrentPageTitle}\")"
         QApplication.clipboard().setText(LinkToCurrentPage)
 
     def CopyIndexPathToCurrentPage(self):
@@ -1479,44 +1575,48 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         QApplication.clipboard().setText(IndexPathStringToCurrentPage)
 
     def GetLinkData(self, Page=None):
+        # Links by page ID only change with the title, so index path links are only tracked while the notebook still has some
+        IncludeIndexPathLinks = Page is not None or self.Notebook.HasIndexPathLinks()
         LinkData = {}
         Page = Page if Page is not None else self.Notebook.RootPage
-        LinkData[id(Page)] = {"NoToolTip": f"]({json.dumps(Page["IndexPath"])})", "ToolTip": f"]({json.dumps(Page["IndexPath"])} \"{Page["Title"]}\")"}
-        self.AddSubPageLinkData(Page, LinkData)
+        LinkData[id(Page)] = self.GetPageLinkData(Page, IncludeIndexPathLinks)
+        self.AddSubPageLinkData(Page, LinkData, IncludeIndexPathLinks)
         return LinkData
 
-    def AddSubPageLinkData(self, CurrentPage, LinkData):
+    def AddSubPageLinkData(self, CurrentPage, LinkData, IncludeIndexPathLinks):
         for SubPage in CurrentPage["SubPages"]:
-            LinkData[id(SubPage)] = {"NoToolTip": f"]({json.dumps(SubPage["IndexPath"])})", "ToolTip": f"]({json.dumps(SubPage["IndexPath"])} \"{SubPage["Title"]}\")"}
-            self.AddSubPageLinkData(SubPage, LinkData)
+            LinkData[id(SubPage)] = self.GetPageLinkData(SubPage, IncludeIndexPathLinks)
+            self.AddSubPageLinkData(SubPage, LinkData, IncludeIndexPathLinks)
+
+    def GetPageLinkData(self, Page, IncludeIndexPathLinks):
+        PageLinkData = {"PageIDNoToolTip": f"]({self.Notebook.GetPageLinkString(Page)})", "PageIDToolTip": f"]({self.Notebook.GetPageLinkString(Page)} \"{Page["Title"]}\")"}
+        if IncludeIndexPathLinks:
+            PageLinkData["NoToolTip"] = f"]({json.dumps(Page["IndexPath"])})"
+            PageLinkData["ToolTip"] = f"]({json.dumps(Page["IndexPath"])} \"{Page["Title"]}\")"
+        return PageLinkData
 
     def UpdateLinks(self, OldLinkData, NewLinkData, Page=None):
-        ReplaceQueue = []
+        LinkStringReplacements = {}
         for PageID in NewLinkData:
             if PageID in OldLinkData:
-                if NewLinkData[PageID] != OldLinkData[PageID]:
-                    ReplaceStrings = (OldLinkData[PageID]["NoToolTip"], f"<<LINK UPDATE TOKEN WITHOUT TOOL TIP {str(PageID)}>>", NewLinkData[PageID]["NoToolTip"])
-                    ReplaceQueue.append(ReplaceStrings)
-                    ReplaceStrings = (OldLinkData[PageID]["ToolTip"], f"<<LINK UPDATE TOKEN WITH TOOL TIP {str(PageID)}>>", NewLinkData[PageID]["ToolTip"])
-                    ReplaceQueue.append(ReplaceStrings)
-        for ReplaceStrings in ReplaceQueue:
-            if Page is None:
-                self.SearchWidgetInst.ReplaceAllInNotebook(SearchText=ReplaceStrings[0], ReplaceText=ReplaceStrings[1], MatchCase=True, DelayTextUpdate=True)
-            else:
-                self.SearchWidgetInst.ReplaceAllInPageAndSubPages(Page, SearchText=ReplaceStrings[0], ReplaceText=ReplaceStrings[1], MatchCase=True)
-        for ReplaceStrings in ReplaceQueue:
-            if Page is None:
-                self.SearchWidgetInst.ReplaceAllInNotebook(SearchText=ReplaceStrings[1], ReplaceText=ReplaceStrings[2], MatchCase=True, DelayTextUpdate=True)
-            else:
-                self.SearchWidgetInst.ReplaceAllInPageAndSubPages(Page, SearchText=ReplaceStrings[1], ReplaceText=ReplaceStrings[2], MatchCase=True)
+                for LinkType in NewLinkData[PageID]:
+                    if LinkType in OldLinkData[PageID] and NewLinkData[PageID][LinkType] != OldLinkData[PageID][LinkType]:
+                        LinkStringReplacements[OldLinkData[PageID][LinkType]] = NewLinkData[PageID][LinkType]
+        self.Notebook.ReplaceLinkStrings(LinkStringReplacements, Page)
 
     def UpdateDeletedPageLinks(self, CurrentPage):
-        CurrentPageLinkString = f"]({json.dumps(CurrentPage["IndexPath"])})"
-        self.SearchWidgetInst.ReplaceAllInNotebook(CurrentPageLinkString, "]([deleted])", MatchCase=True, DelayTextUpdate=True)
-        CurrentPageLinkString = f"]({json.dumps(CurrentPage["IndexPath"])} \"{CurrentPage["Title"]}\")"
-        self.SearchWidgetInst.ReplaceAllInNotebook(CurrentPageLinkString, "]([deleted])", MatchCase=True, DelayTextUpdate=True)
+        # Links by page ID to deleted pages are left alone; they render as not found
+        if not self.Notebook.HasIndexPathLinks():
+            return
+        LinkStringReplacements = {}
+        self.AddDeletedPageLinkStringReplacements(CurrentPage, LinkStringReplacements)
+        self.Notebook.ReplaceLinkStrings(LinkStringReplacements)
+
+    def AddDeletedPageLinkStringReplacements(self, CurrentPage, LinkStringReplacements):
+        LinkStringReplacements[f"]({json.dumps(CurrentPage["IndexPath"])})"] = "]([deleted])"
+        LinkStringReplacements[f"]({json.dumps(CurrentPage["IndexPath"])} \"{CurrentPage["Title"]}\")"] = "]([deleted])"
         for SubPage in CurrentPage["SubPages"]:
-            self.UpdateDeletedPageLinks(SubPage)
+            self.AddDeletedPageLinkStringReplacements(SubPage, LinkStringReplacements)
 
     def ImageManager(self, SearchImageName=None):
         ImageManagerDialogInst = ImageManagerDialog(self.Notebook, self, SearchImageName)
@@ -1550,8 +1650,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
 
     def SearchForLinkingPages(self):
         self.SearchAction.trigger()
-        self.SearchWidgetInst.SearchTextLineEdit.setText(f"]({json.dumps(self.NotebookDisplayWidgetInst.GetCurrentPageIndexPath())}")
-        self.SearchWidgetInst.SearchButton.click()
+        self.SearchWidgetInst.SearchForLinkingPages(self.Notebook.GetPageFromIndexPath(self.NotebookDisplayWidgetInst.GetCurrentPageIndexPath()))
 
     def SearchForLinkedPages(self):
         SearchForLinkedPagesDialogInst = SearchForLinkedPagesDialog(self)
@@ -1607,7 +1706,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         CurrentText = self.TextWidgetInst.toPlainText()
         if CurrentText != self.TextWidgetInst.CurrentPage["Content"]:
             self.TextWidgetInst.CurrentPage["Content"] = CurrentText
-            self.Notebook.SearchIndexUpToDate = False
+            self.Notebook.FlagPageForSearchIndexUpdate(self.TextWidgetInst.CurrentPage)
             self.UpdateUnsavedChangesFlag(True)
 
     def ToggleReadMode(self):
@@ -1638,6 +1737,18 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.SearchWidgetInst.RefreshSearch()
         self.RefreshAdvancedSearch()
 
+    def ToggleParallelSearch(self):
+        self.ParallelSearch = not self.ParallelSearch
+        self.UpdateParallelSearcher()
+
+    def UpdateParallelSearcher(self):
+        if self.ParallelSearch and self.ParallelSearcherInst is None:
+            self.ParallelSearcherInst = ParallelSearcher()
+        elif not self.ParallelSearch and self.ParallelSearcherInst is not None:
+            self.ParallelSearcherInst.Shutdown()
+            self.ParallelSearcherInst = None
+        self.Notebook.ParallelSearcher = self.ParallelSearcherInst
+
     def ToggleSwapLeftAndMiddleClickForLinks(self):
         self.SwapLeftAndMiddleClickForLinks = not self.SwapLeftAndMiddleClickForLinks
         if self.SwapLeftAndMiddleClickForLinks:
@@ -1666,11 +1777,11 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         self.HighlightSyntax = not self.HighlightSyntax
         if self.HighlightSyntax:
             self.DisplayMessageBox("Syntax highlighting is intended only as a rough guide, and may not capture all valid Markdown syntax perfectly.", Icon=QMessageBox.Icon.Warning)
-        self.TextWidgetInst.SyntaxHighlighter.rehighlight()
+        self.TextWidgetInst.SyntaxHighlighter.RehighlightVisibleBlocksFirst()
 
     def HighlightText(self):
         HighlightTextDialogInst = HighlightTextDialog(self)
-        self.TextWidgetInst.SyntaxHighlighter.rehighlight()
+        self.TextWidgetInst.SyntaxHighlighter.RehighlightVisibleBlocksFirst()
 
     def AddTextToPageAndSubpages(self, Prepend=False):
         if not self.TextWidgetInst.ReadMode:
@@ -1692,12 +1803,12 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
     def AddTitleToolTipsToLinks(self):
         if not self.TextWidgetInst.ReadMode:
             LinkData = self.GetLinkData()
-            ReplaceQueue = []
+            LinkStringReplacements = {}
             for PageID in LinkData:
-                ReplaceStrings = (LinkData[PageID]["NoToolTip"], LinkData[PageID]["ToolTip"])
-                ReplaceQueue.append(ReplaceStrings)
-            for ReplaceStrings in ReplaceQueue:
-                self.SearchWidgetInst.ReplaceAllInNotebook(SearchText=ReplaceStrings[0], ReplaceText=ReplaceStrings[1], MatchCase=True, DelayTextUpdate=True)
+                LinkStringReplacements[LinkData[PageID]["PageIDNoToolTip"]] = LinkData[PageID]["PageIDToolTip"]
+                if "NoToolTip" in LinkData[PageID]:
+                    LinkStringReplacements[LinkData[PageID]["NoToolTip"]] = LinkData[PageID]["ToolTip"]
+            self.Notebook.ReplaceLinkStrings(LinkStringReplacements)
             self.TextWidgetInst.UpdateText()
             self.SearchWidgetInst.RefreshSearch()
             self.RefreshAdvancedSearch()
@@ -1790,7 +1901,6 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
     # Save and Open Methods
     def SaveActionTriggered(self, SaveAs=False):
         if self.Save(self.Notebook, SaveAs=SaveAs):
-            self.Notebook.BuildSearchIndex()
             self.SearchWidgetInst.RefreshSearch()
             self.RefreshAdvancedSearch()
             self.UpdateUnsavedChangesFlag(False)
@@ -1833,6 +1943,64 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
     def ToggleGzipMode(self):
         self.GzipMode = not self.GzipMode
 
+    def SetCompressionCodec(self):
+        AvailableCompressionCodecs = GetAvailableCompressionCodecs()
+        CompressionCodec, OK = QInputDialog.getItem(self, "Set Compression Codec", "Compression codec for gzip mode:", AvailableCompressionCodecs, current=AvailableCompressionCodecs.index(self.CompressionCodec), editable=False)
+        if OK:
+            self.CompressionCodec = CompressionCodec
+
+    def SetCompressionLevel(self):
+        CompressionCodec, CompressionLevel = self.GetCompression()
+        MinimumLevel = CompressionCodecs[CompressionCodec]["MinimumLevel"]
+        MaximumLevel = CompressionCodecs[CompressionCodec]["MaximumLevel"]
+        CompressionLevel, OK = QInputDialog.getInt(self, "Set Compression Level", f"{CompressionCodec} compression level ({MinimumLevel} to {MaximumLevel}; lower is faster):", value=CompressionLevel, min=MinimumLevel, max=MaximumLevel)
+        if OK:
+            self.CompressionLevels[CompressionCodec] = CompressionLevel
+
+    def ToggleZipContainerMode(self):
+        self.ZipContainerMode = not self.ZipContainerMode
+
+    def ToggleCompactJSONMode(self):
+        self.CompactJSONMode = not self.CompactJSONMode
+
+    def ToggleJournalMode(self):
+        self.JournalMode = not self.JournalMode
+
+    def SetAutosaveInterval(self):
+        AutosaveInterval, OK = QInputDialog.getInt(self, "Set Autosave Interval", "Autosave interval in minutes (0 to disable):", value=self.AutosaveInterval, min=0, max=1440)
+        if OK:
+            self.AutosaveInterval = AutosaveInterval
+            self.UpdateAutosaveTimer()
+
+    def UpdateAutosaveTimer(self):
+        if self.AutosaveInterval > 0:
+            self.AutosaveTimer.start(self.AutosaveInterval * 60000)
+        else:
+            self.AutosaveTimer.stop()
+
+    def Autosave(self):
+        if not self.UnsavedChanges or self.BackgroundSaveInst is not None:
+            return
+        if self.SaveToJournal(self.Notebook, self.CurrentOpenFileName):
+            self.FlashStatusBar(f"File autosaved to journal:  \"{os.path.basename(self.CurrentOpenFileName)}\"")
+            self.UpdateUnsavedChangesFlag(False)
+            return
+        if not self.CanSaveInBackground():
+            return
+        if not self.ZipContainerMode or self.GzipMode:
+            # The snapshot shares attachments not yet read from the open zip container, which is about to be replaced by a file without them, so they are read into the notebook here
+            self.Notebook.LoadZipContainerAttachments(self.CurrentOpenFileName)
+        self.UnsavedChangesSinceAutosave = False
+        if self.SaveInBackground(self.Notebook.CreateSnapshot(), FinishedCallback=self.AutosaveFinished):
+            # The snapshot holds every change so far; if it fails to save, the next save must rewrite the whole file
+            self.Notebook.ClearJournalChanges()
+
+    def AutosaveFinished(self, Saved):
+        if not Saved:
+            self.Notebook.RequireJournalCompaction()
+        if Saved and not self.UnsavedChangesSinceAutosave:
+            self.UpdateUnsavedChangesFlag(False)
+
     def closeEvent(self, event):
         Close = True
         if self.UnsavedChanges:
@@ -1847,11 +2015,19 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         if not Close:
             event.ignore()
         else:
+            self.AutosaveTimer.stop()
+            self.WaitForBackgroundSave()
             self.SaveConfigs()
+            self.SearchWidgetInst.BackgroundSearcherInst.Cancel()
+            if self.ParallelSearcherInst is not None:
+                self.ParallelSearcherInst.Shutdown()
+            self.PatternGuardInst.Shutdown()
             event.accept()
 
     def UpdateUnsavedChangesFlag(self, UnsavedChanges):
         self.UnsavedChanges = UnsavedChanges
+        if UnsavedChanges:
+            self.UnsavedChangesSinceAutosave = True
         self.UpdateWindowTitle()
 
     # Import and Export Methods
@@ -1926,11 +2102,14 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
     def ImportPage(self):
         ImportedPage = self.Open(None, RespectUnsavedChanges=False, AlternateFileDescription="Page", AlternateFileExtension=".ntbkpg", ImportMode=True)
         if ImportedPage is not None:
+            ImportedPage = NotebookPage.CreateFromDictionary(ImportedPage)
+            self.Notebook.RegisterImportedPage(ImportedPage)
             OldLinkData = self.GetLinkData(ImportedPage)
             self.Notebook.AddSubPage(PageToAdd=ImportedPage)
             NewLinkData = self.GetLinkData(ImportedPage)
             self.UpdateLinks(OldLinkData, NewLinkData, ImportedPage)
-            self.NotebookDisplayWidgetInst.FillFromRootPage()
+            self.Notebook.ConvertIndexPathLinksToPageIDLinks(ImportedPage)
+            self.NotebookDisplayWidgetInst.UpdateFromRootPage()
             self.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(self.Notebook.RootPage["IndexPath"], ScrollToLastChild=True)
             self.SearchWidgetInst.RefreshSearch()
             self.RefreshAdvancedSearch()
@@ -1946,7 +2125,7 @@ class MainWindow(QMainWindow, SaveAndOpenMixin):
         if ExportFilePath != "":
             if not ExportFilePath.endswith(FileExtension):
                 ExportFilePath += FileExtension
-            Base64Converters.WriteFileFromBase64String(self.Notebook.Files[FileName], ExportFilePath)
+            self.Notebook.Files.ExportAttachment(FileName, ExportFilePath)
 
     # Window Management Methods
     def WindowSetup(self):
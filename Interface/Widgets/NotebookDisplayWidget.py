@@ -1,11 +1,14 @@
 import json
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, pyqtSignal
 from PyQt6.QtGui import QColor
-from PyQt6.QtWidgets import QTreeWidget, QTreeWidgetItem, QTreeWidgetItemIterator, QHeaderView, QMenu
+from PyQt6.QtWidgets import QTreeView, QHeaderView, QMenu
 
 
-class NotebookDisplayWidget(QTreeWidget):
+class NotebookDisplayWidget(QTreeView):
+    # Signals
+    itemSelectionChanged = pyqtSignal()
+
     def __init__(self, Notebook, MainWindow):
         super().__init__()
 
@@ -13,6 +16,11 @@ class NotebookDisplayWidget(QTreeWidget):
         self.Notebook = Notebook
         self.MainWindow = MainWindow
 
+        # Model Setup
+        self.Model = NotebookDisplayModel(self.Notebook)
+        self.setModel(self.Model)
+        self.setUniformRowHeights(True)
+
         # Header Setup
         self.setHeaderHidden(True)
         self.header().setStretchLastSection(False)
@@ -22,44 +30,41 @@ class NotebookDisplayWidget(QTreeWidget):
         self.FillFromRootPage()
 
     def FillFromRootPage(self):
-        self.clear()
-        self.FillNotebookWidgetItem(self.invisibleRootItem(), self.Notebook.RootPage, IsRootPage=True)
+        self.Model.ResetFromNotebook(self.Notebook)
+        self.expand(self.model().index(0, 0))
+        self.setCurrentIndex(self.model().index(0, 0))
         self.setFocus()
 
-    def FillNotebookWidgetItem(self, CurrentTreeItem, CurrentPage, IsRootPage=False):
-        ChildTreeItem = NotebookDisplayWidgetItem(CurrentPage["Title"], CurrentPage["IndexPath"])
-        CurrentTreeItem.addChild(ChildTreeItem)
+    def UpdateFromRootPage(self):
+        # The selection is cleared so that reselecting a page after a structural change updates the display of that page
+        self.clearSelection()
+        self.Model.UpdateFromNotebook()
 
-        for SubPage in CurrentPage["SubPages"]:
-            self.FillNotebookWidgetItem(ChildTreeItem, SubPage)
+    def UpdatePageTitle(self, Page):
+        self.clearSelection()
+        self.Model.UpdatePageTitle(Page)
 
-        if IsRootPage:
-            ChildTreeItem.setExpanded(True)
-            self.setCurrentIndex(self.model().index(0, 0))
+    def selectionChanged(self, Selected, Deselected):
+        super().selectionChanged(Selected, Deselected)
+        self.itemSelectionChanged.emit()
 
     def GetCurrentPageIndexPath(self):
-        SelectedItems = self.selectedItems()
-        if len(SelectedItems) < 1:
+        SelectedIndexes = self.selectedIndexes()
+        if len(SelectedIndexes) < 1:
             return None
-        SelectedItem = SelectedItems[0]
-        return SelectedItem.IndexPath
+        SelectedIndex = SelectedIndexes[0]
+        return SelectedIndex.internalPointer().IndexPath
 
     def HighlightPages(self, HighlightedPageIndexPaths):
-        Iterator = QTreeWidgetItemIterator(self)
-        while Iterator.value():
-            Page = Iterator.value()
-            if Page.IndexPath in HighlightedPageIndexPaths:
-                Page.setForeground(0, QColor("white"))
-                Page.setBackground(0, QColor("darkMagenta"))
-            Iterator += 1
+        for IndexPath in HighlightedPageIndexPaths:
+            Page = self.Notebook.GetPageFromIndexPath(IndexPath)
+            if Page is not None:
+                self.Model.HighlightedPages[id(Page)] = Page
+        self.viewport().update()
 
     def ClearPageHighlighting(self):
-        Iterator = QTreeWidgetItemIterator(self)
-        while Iterator.value():
-            Page = Iterator.value()
-            Page.setData(0, Qt.ItemDataRole.ForegroundRole, None)
-            Page.setData(0, Qt.ItemDataRole.BackgroundRole, None)
-            Iterator += 1
+        self.Model.HighlightedPages.clear()
+        self.viewport().update()
 
     def SelectTreeItemFromIndexPath(self, IndexPath, SelectParent=False, ScrollToLastChild=False, SelectDelta=0):
         if SelectParent:
@@ -69,8 +74,8 @@ class NotebookDisplayWidget(QTreeWidget):
         for Element in IndexPath[1:]:
             DestinationIndex = self.model().index(Element, 0, DestinationIndex)
         self.setCurrentIndex(DestinationIndex)
-        self.currentItem().setExpanded(True)
-        self.scrollToItem(self.currentItem() if not ScrollToLastChild else self.currentItem().child(self.currentItem().childCount() - 1), self.ScrollHint.PositionAtCenter)
+        self.expand(DestinationIndex)
+        self.scrollTo(DestinationIndex if not ScrollToLastChild else self.model().index(self.model().rowCount(DestinationIndex) - 1, 0, DestinationIndex), self.ScrollHint.PositionAtCenter)
 
     def SelectTreeItemFromIndexPathString(self, IndexPathString, SelectParent=False, ScrollToLastChild=False, SelectDelta=0):
         IndexPath = json.loads(IndexPathString)
@@ -121,12 +126,201 @@ class NotebookDisplayWidget(QTreeWidget):
 
     def collapseAll(self):
         super().collapseAll()
-        self.itemAt(0, 0).setExpanded(True)
+        self.expand(self.model().index(0, 0))
         self.setCurrentIndex(self.model().index(0, 0))
 
 
-class NotebookDisplayWidgetItem(QTreeWidgetItem):
-    def __init__(self, Title, IndexPath):
+class NotebookDisplayModel(QAbstractItemModel):
+    def __init__(self, Notebook):
         super().__init__()
-        self.setText(0, Title)
-        self.IndexPath = IndexPath
+
+        # Store Parameters
+        self.Notebook = Notebook
+
+        # Variables
+        self.SubPages = {}
+        self.SuperPages = {}
+        self.HighlightedPages = {}
+
+    # Model Methods
+    def index(self, Row, Column, Parent=QModelIndex()):
+        if Column != 0 or Row < 0:
+            return QModelIndex()
+        if not Parent.isValid():
+            return self.createIndex(Row, Column, self.Notebook.RootPage) if Row == 0 else QModelIndex()
+        SubPages = self.GetSubPages(Parent.internalPointer())
+        if Row >= len(SubPages):
+            return QModelIndex()
+        return self.createIndex(Row, Column, SubPages[Row])
+
+    def parent(self, Index):
+        if not Index.isValid():
+            return QModelIndex()
+        SuperPage = self.SuperPages.get(id(Index.internalPointer()))
+        if SuperPage is None:
+            return QModelIndex()
+        return self.GetIndexFromPage(SuperPage)
+
+    def rowCount(self, Parent=QModelIndex()):
+        if not Parent.isValid():
+            return 1
+        return len(self.GetSubPages(Parent.internalPointer()))
+
+    def columnCount(self, Parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, Parent=QModelIndex()):
+        if not Parent.isValid():
+            return True
+        Page = Parent.internalPointer()
+        SubPages = self.SubPages.get(id(Page))
+        return len(SubPages if SubPages is not None else Page.SubPages) > 0
+
+    def data(self, Index, Role=Qt.ItemDataRole.DisplayRole):
+        if not Index.isValid():
+            return None
+        Page = Index.internalPointer()
+        if Role == Qt.ItemDataRole.DisplayRole:
+            return Page.Title
+        if Role == Qt.ItemDataRole.ForegroundRole and id(Page) in self.HighlightedPages:
+            return QColor("white")
+        if Role == Qt.ItemDataRole.BackgroundRole and id(Page) in self.HighlightedPages:
+            return QColor("darkMagenta")
+        return None
+
+    # Page Methods
+    def GetSubPages(self, Page):
+        # Sub pages are only copied from the notebook once a view asks for them, and are then kept as the view last saw them until the model is updated
+        if id(Page) not in self.SubPages:
+            self.SubPages[id(Page)] = Page.SubPages.copy()
+            for SubPage in Page.SubPages:
+                self.SuperPages[id(SubPage)] = Page
+        return self.SubPages[id(Page)]
+
+    def GetIndexFromPage(self, Page):
+        SuperPage = self.SuperPages.get(id(Page))
+        if SuperPage is None:
+            return self.createIndex(0, 0, Page)
+        SubPages = self.SubPages[id(SuperPage)]
+        Row = Page.SiblingIndex
+        if Row >= len(SubPages) or SubPages[Row] is not Page:
+            Row = next(SubPageIndex for SubPageIndex, SubPage in enumerate(SubPages) if SubPage is Page)
+        return self.createIndex(Row, 0, Page)
+
+    def PageIsInModel(self, Page):
+        return Page is self.Notebook.RootPage or id(Page) in self.SuperPages
+
+    def ForgetPage(self, Page):
+        del self.SuperPages[id(Page)]
+        for SubPage in self.SubPages.pop(id(Page), []):
+            self.ForgetPage(SubPage)
+        self.HighlightedPages.pop(id(Page), None)
+
+    # Update Methods
+    def ResetFromNotebook(self, Notebook):
+        self.beginResetModel()
+        self.Notebook = Notebook
+        self.Notebook.PagesWithChangedSubPages.clear()
+        self.SubPages.clear()
+        self.SuperPages.clear()
+        self.HighlightedPages.clear()
+        self.endResetModel()
+
+    def UpdateFromNotebook(self):
+        # All removals are made before any insertions, so that a page moved to another super page is never in the model twice
+        ChangedPages = list(self.Notebook.PagesWithChangedSubPages.values())
+        self.Notebook.PagesWithChangedSubPages.clear()
+        EmptiedPageFound = False
+        for Page in ChangedPages:
+            # Views may have asked whether these pages have sub pages without asking for them; starting them empty keeps their new sub pages out of the model until they are inserted
+            if self.PageIsInModel(Page) and id(Page) not in self.SubPages:
+                self.SubPages[id(Page)] = []
+                EmptiedPageFound = EmptiedPageFound or len(Page.SubPages) < 1
+        for Page in ChangedPages:
+            self.RemoveSubPages(Page)
+        for Page in ChangedPages:
+            self.InsertSubPages(Page)
+        if EmptiedPageFound:
+            self.layoutAboutToBeChanged.emit()
+            self.layoutChanged.emit()
+
+    def UpdatePageTitle(self, Page):
+        if self.PageIsInModel(Page):
+            PageIndex = self.GetIndexFromPage(Page)
+            self.dataChanged.emit(PageIndex, PageIndex, [Qt.ItemDataRole.DisplayRole])
+
+    def RemoveSubPages(self, Page):
+        SubPages = self.SubPages.get(id(Page))
+        if SubPages is None or not self.PageIsInModel(Page):
+            return
+        CurrentSubPageIDs = {id(SubPage) for SubPage in Page.SubPages}
+        LastRow = len(SubPages) - 1
+        while LastRow >= 0:
+            if id(SubPages[LastRow]) in CurrentSubPageIDs:
+                LastRow -= 1
+                continue
+            FirstRow = LastRow
+            while FirstRow > 0 and id(SubPages[FirstRow - 1]) not in CurrentSubPageIDs:
+                FirstRow -= 1
+            RemovedPages = SubPages[FirstRow:LastRow + 1]
+            self.beginRemoveRows(self.GetIndexFromPage(Page), FirstRow, LastRow)
+            del SubPages[FirstRow:LastRow + 1]
+            self.endRemoveRows()
+            for RemovedPage in RemovedPages:
+                self.ForgetPage(RemovedPage)
+            LastRow = FirstRow - 1
+
+    def InsertSubPages(self, Page):
+        SubPages = self.SubPages.get(id(Page))
+        if SubPages is None or not self.PageIsInModel(Page):
+            return
+        KeptSubPageIDs = {id(SubPage) for SubPage in SubPages}
+        KeptSubPages = [SubPage for SubPage in Page.SubPages if id(SubPage) in KeptSubPageIDs]
+        if any(SubPage is not KeptSubPage for SubPage, KeptSubPage in zip(SubPages, KeptSubPages)):
+            self.ReorderSubPages(Page, SubPages, KeptSubPages)
+        FirstRow = 0
+        while FirstRow < len(Page.SubPages):
+            if id(Page.SubPages[FirstRow]) in KeptSubPageIDs:
+                FirstRow += 1
+                continue
+            LastRow = FirstRow
+            while LastRow + 1 < len(Page.SubPages) and id(Page.SubPages[LastRow + 1]) not in KeptSubPageIDs:
+                LastRow += 1
+            self.beginInsertRows(self.GetIndexFromPage(Page), FirstRow, LastRow)
+            SubPages[FirstRow:FirstRow] = Page.SubPages[FirstRow:LastRow + 1]
+            for InsertedPage in Page.SubPages[FirstRow:LastRow + 1]:
+                self.SuperPages[id(InsertedPage)] = Page
+            self.endInsertRows()
+            FirstRow = LastRow + 1
+
+    def ReorderSubPages(self, Page, SubPages, ReorderedSubPages):
+        FirstRow = 0
+        while SubPages[FirstRow] is ReorderedSubPages[FirstRow]:
+            FirstRow += 1
+        LastRow = len(SubPages) - 1
+        while SubPages[LastRow] is ReorderedSubPages[LastRow]:
+            LastRow -= 1
+        OldRows = SubPages[FirstRow:LastRow + 1]
+        NewRows = ReorderedSubPages[FirstRow:LastRow + 1]
+        PageIndex = self.GetIndexFromPage(Page)
+
+        # A Single Page Moved Down
+        if all(OldRow is NewRow for OldRow, NewRow in zip(OldRows[1:], NewRows[:-1])):
+            self.beginMoveRows(PageIndex, FirstRow, FirstRow, PageIndex, LastRow + 1)
+            SubPages[:] = ReorderedSubPages
+            self.endMoveRows()
+
+        # A Single Page Moved Up
+        elif all(OldRow is NewRow for OldRow, NewRow in zip(OldRows[:-1], NewRows[1:])):
+            self.beginMoveRows(PageIndex, LastRow, LastRow, PageIndex, FirstRow)
+            SubPages[:] = ReorderedSubPages
+            self.endMoveRows()
+
+        # Any Other Order
+        else:
+            self.layoutAboutToBeChanged.emit([], QAbstractItemModel.LayoutChangeHint.VerticalSortHint)
+            PersistentIndexes = self.persistentIndexList()
+            PersistentPages = [PersistentIndex.internalPointer() for PersistentIndex in PersistentIndexes]
+            SubPages[:] = ReorderedSubPages
+            self.changePersistentIndexList(PersistentIndexes, [self.GetIndexFromPage(PersistentPage) for PersistentPage in PersistentPages])
+            self.layoutChanged.emit([], QAbstractItemModel.LayoutChangeHint.VerticalSortHint)
@@ -1,12 +1,9 @@
-import json
 import webbrowser
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QTextFormat, QFont
 from PyQt6.QtWidgets import QTextEdit
 
-from Core import MarkdownRenderers
-
 
 class PopOutTextWidget(QTextEdit):
     def __init__(self, Page, Notebook, PopOutMarkdownParser, MainWindow):
@@ -31,8 +28,7 @@ class PopOutTextWidget(QTextEdit):
         self.setStyleSheet("selection-background-color: rgb(0, 120, 215); selection-color: white")
 
     def RefreshPageDisplay(self):
-        DisplayText = MarkdownRenderers.ConstructMarkdownStringFromPage(self.Page, self.Notebook)
-        HTMLText = self.PopOutMarkdownParser(DisplayText)
+        HTMLText = self.MainWindow.RenderCacheInst.GetPageHTML(self.Page, self.Notebook, self.PopOutMarkdownParser)
         self.setHtml(HTMLText)
 
     def UpdateFontAndSize(self):
@@ -44,9 +40,10 @@ class PopOutTextWidget(QTextEdit):
         ContextMenu = self.createStandardContextMenu()
         Anchor = self.anchorAt(QContextMenuEvent.pos())
         if Anchor != "":
-            if self.Notebook.StringIsValidIndexPath(Anchor):
+            LinkedPage = self.Notebook.GetPageFromLinkString(Anchor)
+            if LinkedPage is not None:
                 ContextMenu.addSeparator()
-                IndexPath = json.loads(Anchor)
+                IndexPath = LinkedPage["IndexPath"]
                 ContextMenu.addAction(self.MainWindow.PopOutPageIcon, "Pop Out Linked Page", lambda: self.MainWindow.PopOutPage(IndexPath))
         ContextMenu.exec(self.mapToGlobal(QContextMenuEvent.pos()))
 
@@ -91,8 +88,9 @@ class PopOutTextWidget(QTextEdit):
 
     # Link Methods
     def NavigateToLink(self, Anchor, QMouseEvent):
-        if self.Notebook.StringIsValidIndexPath(Anchor):
-            self.MainWindow.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPathString(Anchor)
+        LinkedPage = self.Notebook.GetPageFromLinkString(Anchor)
+        if LinkedPage is not None:
+            self.MainWindow.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(LinkedPage["IndexPath"].copy())
             self.MainWindow.activateWindow()
             self.MainWindow.raise_()
             self.MainWindow.setFocus()
@@ -105,7 +103,7 @@ class PopOutTextWidget(QTextEdit):
             if Anchor.startswith("[footnote:") and Anchor.endswith("ReturnToBody]"):
                 self.verticalScrollBar().setValue(self.verticalScrollBar().value() - 50)
         else:
-            if Anchor.startswith("[0,"):
+            if Anchor.startswith("[0,") or Anchor.startswith("[page:"):
                 self.MainWindow.DisplayMessageBox("Linked page not found.  Pop-out page may need to be refreshed.", Parent=self)
                 QMouseEvent.accept()
             elif Anchor.startswith("[file:"):
@@ -116,9 +114,9 @@ class PopOutTextWidget(QTextEdit):
                 QMouseEvent.accept()
 
     def OpenLinkAsPopup(self, Anchor, QMouseEvent):
-        if self.Notebook.StringIsValidIndexPath(Anchor):
-            IndexPath = json.loads(Anchor)
-            self.MainWindow.PopOutPage(IndexPath)
+        LinkedPage = self.Notebook.GetPageFromLinkString(Anchor)
+        if LinkedPage is not None:
+            self.MainWindow.PopOutPage(LinkedPage["IndexPath"].copy())
             QMouseEvent.accept()
         elif Anchor.startswith("[file:") and self.Notebook.HasFile(Anchor[6:-1]):
             self.MainWindow.ExportLinkedFile(Anchor[6:-1])
@@ -128,7 +126,7 @@ class PopOutTextWidget(QTextEdit):
             if Anchor.startswith("[footnote:") and Anchor.endswith("ReturnToBody]"):
                 self.verticalScrollBar().setValue(self.verticalScrollBar().value() - 50)
         else:
-            if Anchor.startswith("[0,"):
+            if Anchor.startswith("[0,") or Anchor.startswith("[page:"):
                 self.MainWindow.DisplayMessageBox("Linked page not found.  Pop-out page may need to be refreshed.", Parent=self)
                 QMouseEvent.accept()
             elif Anchor.startswith("[file:"):
@@ -1,9 +1,12 @@
 import re
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QRegularExpression
 from PyQt6.QtGui import QTextCursor, QTextDocument
 from PyQt6.QtWidgets import QFrame, QLineEdit, QListWidget, QGridLayout, QListWidgetItem, QPushButton, QCheckBox, QSizePolicy, QApplication
 
+from Core.SearchPatterns import ExpandFullMatch, GetSearchPattern, GetSearchPatternString, SubstitutePattern
+from Interface.BackgroundSearch import BackgroundSearcher
+
 
 class SearchWidget(QFrame):
     def __init__(self, Notebook, MainWindow):
@@ -15,6 +18,13 @@ class SearchWidget(QFrame):
 
         # Variables
         self.RefreshingSearchResults = False
+        self.RefreshingBackgroundSearchResults = False
+
+        # Background Searcher
+        self.BackgroundSearcherInst = BackgroundSearcher(self.Notebook, self)
+        self.BackgroundSearcherInst.ResultsFound.connect(self.InsertSearchResults)
+        self.BackgroundSearcherInst.TimedOut.connect(self.BackgroundSearchTimedOut)
+        self.BackgroundSearcherInst.Finished.connect(self.FinishBackgroundSearch)
 
         # Inputs Size Policy
         self.InputsSizePolicy = QSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Minimum)
@@ -24,11 +34,21 @@ class SearchWidget(QFrame):
         self.SearchTextLineEdit.setPlaceholderText("Search (Ctrl+F)")
         self.SearchTextLineEdit.returnPressed.connect(self.Search)
         self.SearchTextLineEdit.textChanged.connect(self.RehighlightTextWidget)
+        self.SearchTextLineEdit.textChanged.connect(self.BackgroundSearcherInst.Cancel)
 
         # Match Case Check Box
         self.MatchCaseCheckBox = QCheckBox("Match Case")
         self.MatchCaseCheckBox.stateChanged.connect(self.RehighlightTextWidget)
 
+        # Whole Word Check Box
+        self.WholeWordCheckBox = QCheckBox("Whole Word")
+        self.WholeWordCheckBox.stateChanged.connect(self.RehighlightTextWidget)
+
+        # Regular Expression Check Box
+        self.RegularExpressionCheckBox = QCheckBox("Regular Expression")
+        self.RegularExpressionCheckBox.stateChanged.connect(self.StartPatternGuard)
+        self.RegularExpressionCheckBox.stateChanged.connect(self.RehighlightTextWidget)
+
         # Highlight Text Check Box
         self.HighlightCheckBox = QCheckBox("Highlight Text")
         self.HighlightCheckBox.setChecked(True)
@@ -69,16 +89,18 @@ class SearchWidget(QFrame):
         # Layout
         self.Layout = QGridLayout()
         self.Layout.addWidget(self.SearchTextLineEdit, 0, 0, 1, 3)
-        self.Layout.addWidget(self.SearchButton, 1, 0, 3, 1)
-        self.Layout.addWidget(self.FindInPageButton, 1, 1, 3, 1)
+        self.Layout.addWidget(self.SearchButton, 1, 0, 5, 1)
+        self.Layout.addWidget(self.FindInPageButton, 1, 1, 5, 1)
         self.Layout.addWidget(self.MatchCaseCheckBox, 1, 2)
-        self.Layout.addWidget(self.HighlightCheckBox, 2, 2)
-        self.Layout.addWidget(self.HighlightPagesCheckBox, 3, 2)
-        self.Layout.addWidget(self.ReplaceTextLineEdit, 4, 0, 1, 3)
-        self.Layout.addWidget(self.ReplaceButton, 5, 0)
-        self.Layout.addWidget(self.ReplaceAllInPageButton, 5, 1)
-        self.Layout.addWidget(self.ReplaceAllInNotebookButton, 5, 2)
-        self.Layout.addWidget(self.ResultsList, 0, 3, 6, 1)
+        self.Layout.addWidget(self.WholeWordCheckBox, 2, 2)
+        self.Layout.addWidget(self.RegularExpressionCheckBox, 3, 2)
+        self.Layout.addWidget(self.HighlightCheckBox, 4, 2)
+        self.Layout.addWidget(self.HighlightPagesCheckBox, 5, 2)
+        self.Layout.addWidget(self.ReplaceTextLineEdit, 6, 0, 1, 3)
+        self.Layout.addWidget(self.ReplaceButton, 7, 0)
+        self.Layout.addWidget(self.ReplaceAllInPageButton, 7, 1)
+        self.Layout.addWidget(self.ReplaceAllInNotebookButton, 7, 2)
+        self.Layout.addWidget(self.ResultsList, 0, 3, 8, 1)
         self.setLayout(self.Layout)
 
         # Start Invisible
@@ -87,13 +109,48 @@ class SearchWidget(QFrame):
     def Search(self):
         SearchText = self.SearchTextLineEdit.text()
         MatchCase = self.MatchCaseCheckBox.isChecked()
+        RegularExpression = self.RegularExpressionCheckBox.isChecked()
+        WholeWord = self.WholeWordCheckBox.isChecked()
+        self.BackgroundSearcherInst.Cancel()
         self.ResultsList.clear()
         self.MainWindow.NotebookDisplayWidgetInst.ClearPageHighlighting()
         if SearchText == "":
             return
-        Results = self.Notebook.GetSearchResults(SearchText, MatchCase=MatchCase)
+        self.MainWindow.SearchResultsStatsLabel.setText("Searching...")
+        self.RefreshingBackgroundSearchResults = self.RefreshingSearchResults
+        try:
+            self.BackgroundSearcherInst.Search(SearchText, MatchCase=MatchCase, RegularExpression=RegularExpression, WholeWord=WholeWord)
+        except re.error:
+            self.MainWindow.SearchResultsStatsLabel.setText("Invalid regular expression.")
+
+    def BackgroundSearchTimedOut(self):
+        self.MainWindow.SearchResultsStatsLabel.setText("Search timed out.")
+        self.ResultsList.clear()
+
+    def InsertSearchResults(self, RankedResults):
+        for Row, Result in RankedResults:
+            self.ResultsList.insertItem(Row, SearchResult(Result[0], Result[1], Result[3], Result[4], self.MainWindow.ShowHitCounts))
+
+    def FinishBackgroundSearch(self, Results):
+        # Results are already listed as they arrive, so only the search's refresh state is restored to finish displaying them
+        self.RefreshingSearchResults = self.RefreshingBackgroundSearchResults
+        self.FinishDisplayingSearchResults(Results)
+        self.RefreshingSearchResults = False
+
+    def SearchForLinkingPages(self, Page):
+        self.SearchTextLineEdit.setText(f"]({self.Notebook.GetPageLinkString(Page)}")
+        self.BackgroundSearcherInst.Cancel()
+        self.ResultsList.clear()
+        self.MainWindow.NotebookDisplayWidgetInst.ClearPageHighlighting()
+        Results = self.Notebook.GetLinkingPagesSearchResults(Page)
+        self.DisplaySearchResults(Results)
+
+    def DisplaySearchResults(self, Results):
         for Result in Results["ResultsList"]:
             self.ResultsList.addItem(SearchResult(Result[0], Result[1], Result[3], Result[4], self.MainWindow.ShowHitCounts))
+        self.FinishDisplayingSearchResults(Results)
+
+    def FinishDisplayingSearchResults(self, Results):
         if len(Results["ResultsList"]) > 0:
             TotalHits = str(Results["TotalHits"])
             PluralizeHits = ("" if Results["TotalHits"] == 1 else "s")
@@ -122,7 +179,17 @@ class SearchWidget(QFrame):
     def FindInPage(self):
         SearchText = self.SearchTextLineEdit.text()
         MatchCase = self.MatchCaseCheckBox.isChecked()
-        if MatchCase:
+        RegularExpression = self.RegularExpressionCheckBox.isChecked()
+        WholeWord = self.WholeWordCheckBox.isChecked()
+        if RegularExpression or WholeWord:
+            # Qt's regular expressions stop themselves when they backtrack too much, so finding in the page does not need the pattern guard
+            SearchPattern = QRegularExpression(GetSearchPatternString(SearchText, RegularExpression=RegularExpression, WholeWord=WholeWord), QRegularExpression.PatternOption.UseUnicodePropertiesOption if MatchCase else QRegularExpression.PatternOption.UseUnicodePropertiesOption | QRegularExpression.PatternOption.CaseInsensitiveOption)
+            if SearchText == "" or not SearchPattern.isValid():
+                return
+            if not self.MainWindow.TextWidgetInst.find(SearchPattern):
+                self.MainWindow.TextWidgetInst.moveCursor(QTextCursor.MoveOperation.Start)
+                self.MainWindow.TextWidgetInst.find(SearchPattern)
+        elif MatchCase:
             if not self.MainWindow.TextWidgetInst.find(SearchText, QTextDocument.FindFlag.FindCaseSensitively):
                 self.MainWindow.TextWidgetInst.moveCursor(QTextCursor.MoveOperation.Start)
                 self.MainWindow.TextWidgetInst.find(SearchText, QTextDocument.FindFlag.FindCaseSensitively)
@@ -131,8 +198,12 @@ class SearchWidget(QFrame):
                 self.MainWindow.TextWidgetInst.moveCursor(QTextCursor.MoveOperation.Start)
                 self.MainWindow.TextWidgetInst.find(SearchText)
 
+    def StartPatternGuard(self):
+        if self.RegularExpressionCheckBox.isChecked():
+            self.MainWindow.PatternGuardInst.Start()
+
     def RehighlightTextWidget(self):
-        self.MainWindow.TextWidgetInst.SyntaxHighlighter.rehighlight()
+        self.MainWindow.TextWidgetInst.SyntaxHighlighter.RehighlightDeferred()
 
     def HighlightPages(self, Clear=False):
         if Clear:
@@ -152,11 +223,28 @@ class SearchWidget(QFrame):
             Cursor = self.MainWindow.TextWidgetInst.textCursor()
             CurrentHitText = Cursor.selectedText()
             MatchCase = self.MatchCaseCheckBox.isChecked()
-            if not MatchCase:
-                SearchText = SearchText.casefold()
-                CurrentHitText = CurrentHitText.casefold()
-            if SearchText == CurrentHitText:
-                self.MainWindow.TextWidgetInst.insertPlainText(ReplaceText)
+            RegularExpression = self.RegularExpressionCheckBox.isChecked()
+            WholeWord = self.WholeWordCheckBox.isChecked()
+            if RegularExpression or WholeWord:
+                # Selections separate lines with paragraph separators, which patterns expect as newlines
+                CurrentHitText = CurrentHitText.replace("\u2029", "\n")
+                try:
+                    SearchPattern = GetSearchPattern(SearchText, MatchCase=MatchCase, RegularExpression=RegularExpression, WholeWord=WholeWord)
+                    if RegularExpression:
+                        ReplaceText = self.Notebook.RunPatternFunction(ExpandFullMatch, SearchPattern, ReplaceText, CurrentHitText)
+                    elif SearchPattern.fullmatch(CurrentHitText) is None:
+                        ReplaceText = None
+                except (re.error, TimeoutError) as Error:
+                    self.DisplayPatternError(Error)
+                    return
+                if ReplaceText is not None:
+                    self.MainWindow.TextWidgetInst.insertPlainText(ReplaceText)
+            else:
+                if not MatchCase:
+                    SearchText = SearchText.casefold()
+                    CurrentHitText = CurrentHitText.casefold()
+                if SearchText == CurrentHitText:
+                    self.MainWindow.TextWidgetInst.insertPlainText(ReplaceText)
             self.FindInPage()
             self.RefreshSearch()
             self.MainWindow.RefreshAdvancedSearch()
@@ -168,16 +256,18 @@ class SearchWidget(QFrame):
                 return
             ReplaceText = self.ReplaceTextLineEdit.text()
             MatchCase = self.MatchCaseCheckBox.isChecked()
-            PageText = self.MainWindow.TextWidgetInst.toPlainText()
-            if MatchCase:
-                PageText = PageText.replace(SearchText, ReplaceText)
-            else:
-                PageText = re.sub(re.escape(SearchText), lambda x: ReplaceText, PageText, flags=re.IGNORECASE)
+            RegularExpression = self.RegularExpressionCheckBox.isChecked()
+            WholeWord = self.WholeWordCheckBox.isChecked()
+            try:
+                PageText = self.ReplaceInTexts([self.MainWindow.TextWidgetInst.toPlainText()], SearchText, ReplaceText, MatchCase, RegularExpression, WholeWord)[0]
+            except (re.error, TimeoutError) as Error:
+                self.DisplayPatternError(Error)
+                return
             self.MainWindow.TextWidgetInst.setPlainText(PageText)
             self.RefreshSearch()
             self.MainWindow.RefreshAdvancedSearch()
 
-    def ReplaceAllInNotebook(self, SearchText=None, ReplaceText=None, MatchCase=None, DelayTextUpdate=False):
+    def ReplaceAllInNotebook(self, SearchText=None, ReplaceText=None, MatchCase=None, RegularExpression=None, WholeWord=None, DelayTextUpdate=False):
         if not self.MainWindow.TextWidgetInst.ReadMode:
             if SearchText is None:
                 SearchText = self.SearchTextLineEdit.text()
@@ -187,20 +277,49 @@ class SearchWidget(QFrame):
                 ReplaceText = self.ReplaceTextLineEdit.text()
             if MatchCase is None:
                 MatchCase = self.MatchCaseCheckBox.isChecked()
-            self.ReplaceAllInPageAndSubPages(self.Notebook.RootPage, SearchText, ReplaceText, MatchCase)
+            if RegularExpression is None:
+                RegularExpression = self.RegularExpressionCheckBox.isChecked()
+            if WholeWord is None:
+                WholeWord = self.WholeWordCheckBox.isChecked()
+
+            # Every page is replaced in one call, so a regular expression only goes to the pattern guard once
+            Pages = self.GetPageAndSubPages(self.Notebook.RootPage)
+            try:
+                Contents = self.ReplaceInTexts([Page["Content"] for Page in Pages], SearchText, ReplaceText, MatchCase, RegularExpression, WholeWord)
+            except (re.error, TimeoutError) as Error:
+                self.DisplayPatternError(Error)
+                return
+            for Page, Content in zip(Pages, Contents):
+                if Content != Page["Content"]:
+                    Page["Content"] = Content
+                    self.Notebook.FlagPageForSearchIndexUpdate(Page)
             if not DelayTextUpdate:
                 self.MainWindow.TextWidgetInst.UpdateText()
                 self.MainWindow.UpdateUnsavedChangesFlag(True)
             self.RefreshSearch()
             self.MainWindow.RefreshAdvancedSearch()
 
-    def ReplaceAllInPageAndSubPages(self, CurrentPage, SearchText, ReplaceText, MatchCase):
-        if MatchCase:
-            CurrentPage["Content"] = CurrentPage["Content"].replace(SearchText, ReplaceText)
-        else:
-            CurrentPage["Content"] = re.sub(re.escape(SearchText), lambda x: ReplaceText, CurrentPage["Content"], flags=re.IGNORECASE)
+    def GetPageAndSubPages(self, CurrentPage):
+        Pages = [CurrentPage]
         for SubPage in CurrentPage["SubPages"]:
-            self.ReplaceAllInPageAndSubPages(SubPage, SearchText, ReplaceText, MatchCase)
+            Pages.extend(self.GetPageAndSubPages(SubPage))
+        return Pages
+
+    def ReplaceInTexts(self, Texts, SearchText, ReplaceText, MatchCase, RegularExpression, WholeWord):
+        # Regular expression replacements expand group references like \1 and \g<Name>; otherwise the replacement text is inserted as it is
+        if RegularExpression:
+            SearchPattern = GetSearchPattern(SearchText, MatchCase=MatchCase, RegularExpression=True, WholeWord=WholeWord)
+            return self.Notebook.RunPatternFunction(SubstitutePattern, SearchPattern, ReplaceText, Texts)
+        if MatchCase and not WholeWord:
+            return [Text.replace(SearchText, ReplaceText) for Text in Texts]
+        SearchPattern = GetSearchPattern(SearchText, MatchCase=MatchCase, WholeWord=WholeWord)
+        return [SearchPattern.sub(lambda Match: ReplaceText, Text) for Text in Texts]
+
+    def DisplayPatternError(self, Error):
+        if isinstance(Error, TimeoutError):
+            self.MainWindow.DisplayMessageBox(f"{Error}  It was stopped, and nothing was replaced.")
+        else:
+            self.MainWindow.DisplayMessageBox(f"Invalid regular expression or replacement:  {Error}.")
 
     def CopySearchResults(self):
         ResultsCount = self.ResultsList.count()
@@ -213,9 +332,12 @@ class SearchWidget(QFrame):
             QApplication.clipboard().setText(ResultsString)
 
     def ClearSearch(self):
+        self.BackgroundSearcherInst.Cancel()
         self.SearchTextLineEdit.clear()
         self.ReplaceTextLineEdit.clear()
         self.MatchCaseCheckBox.setChecked(False)
+        self.WholeWordCheckBox.setChecked(False)
+        self.RegularExpressionCheckBox.setChecked(False)
         self.MainWindow.SearchResultsStatsLabel.setText("No search results.")
         self.ResultsList.clear()
         self.RehighlightTextWidget()
@@ -227,7 +349,6 @@ class SearchWidget(QFrame):
 
     def RefreshSearch(self):
         self.RefreshingSearchResults = True
-        self.Notebook.SearchIndexUpToDate = False
         self.Search()
         self.RefreshingSearchResults = False
 
@@ -1,14 +1,15 @@
-import json
 import re
+import time
 import webbrowser
 
 import mistune
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import QPoint, QRegularExpression, Qt
 from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QColor, QSyntaxHighlighter, QTextCursor, QTextCharFormat, QTextFormat, QFont
 from PyQt6.QtWidgets import QTextEdit, QInputDialog, QMessageBox
 
 from Core import MarkdownRenderers
+from Core.SearchPatterns import CompilePattern, GetSearchPatternString
 from Interface.Dialogs.InsertLinksDialog import InsertLinksDialog
 from Interface.Dialogs.InsertTableDialog import InsertTableDialog, TableDimensionsDialog
 from Interface.Dialogs.InsertImageDialog import InsertImageDialog
@@ -56,9 +57,9 @@ class TextWidget(QTextEdit):
 
     def UpdateText(self):
         self.DisplayChanging = True
+        self.SyntaxHighlighter.UpdateHighlightPatterns()
         if self.ReadMode:
-            DisplayText = MarkdownRenderers.ConstructMarkdownStringFromPage(self.CurrentPage, self.Notebook)
-            HTMLText = self.MarkdownParser(DisplayText)
+            HTMLText = self.MainWindow.RenderCacheInst.GetPageHTML(self.CurrentPage, self.Notebook, self.MarkdownParser)
             self.setHtml(HTMLText)
         else:
             self.setCurrentCharFormat(self.DefaultCharacterFormat)
@@ -277,8 +278,9 @@ class TextWidget(QTextEdit):
         ContextMenu.addAction(self.MainWindow.PopOutPageAction)
         Anchor = self.anchorAt(QContextMenuEvent.pos())
         if Anchor != "":
-            if self.Notebook.StringIsValidIndexPath(Anchor):
-                IndexPath = json.loads(Anchor)
+            LinkedPage = self.Notebook.GetPageFromLinkString(Anchor)
+            if LinkedPage is not None:
+                IndexPath = LinkedPage["IndexPath"]
                 ContextMenu.addAction(self.MainWindow.PopOutPageIcon, "Pop Out Linked Page", lambda: self.MainWindow.PopOutPage(IndexPath))
         ContextMenu.exec(self.mapToGlobal(QContextMenuEvent.pos()))
 
@@ -336,8 +338,9 @@ class TextWidget(QTextEdit):
 
     # Link Methods
     def NavigateToLink(self, Anchor, QMouseEvent):
-        if self.Notebook.StringIsValidIndexPath(Anchor):
-            self.MainWindow.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPathString(Anchor)
+        LinkedPage = self.Notebook.GetPageFromLinkString(Anchor)
+        if LinkedPage is not None:
+            self.MainWindow.NotebookDisplayWidgetInst.SelectTreeItemFromIndexPath(LinkedPage["IndexPath"].copy())
             QMouseEvent.accept()
         elif Anchor.startswith("[file:") and self.Notebook.HasFile(Anchor[6:-1]):
             self.MainWindow.ExportLinkedFile(Anchor[6:-1])
@@ -347,7 +350,7 @@ class TextWidget(QTextEdit):
             if Anchor.startswith("[footnote:") and Anchor.endswith("ReturnToBody]"):
                 self.verticalScrollBar().setValue(self.verticalScrollBar().value() - 50)
         else:
-            if Anchor.startswith("[0,"):
+            if Anchor.startswith("[0,") or Anchor.startswith("[page:"):
                 self.MainWindow.DisplayMessageBox("Linked page not found.")
                 QMouseEvent.accept()
             elif Anchor.startswith("[file:"):
@@ -358,9 +361,9 @@ class TextWidget(QTextEdit):
                 QMouseEvent.accept()
 
     def OpenLinkAsPopup(self, Anchor, QMouseEvent):
-        if self.Notebook.StringIsValidIndexPath(Anchor):
-            IndexPath = json.loads(Anchor)
-            self.MainWindow.PopOutPage(IndexPath)
+        LinkedPage = self.Notebook.GetPageFromLinkString(Anchor)
+        if LinkedPage is not None:
+            self.MainWindow.PopOutPage(LinkedPage["IndexPath"].copy())
             QMouseEvent.accept()
         elif Anchor.startswith("[file:") and self.Notebook.HasFile(Anchor[6:-1]):
             self.MainWindow.ExportLinkedFile(Anchor[6:-1])
@@ -370,7 +373,7 @@ class TextWidget(QTextEdit):
             if Anchor.startswith("[footnote:") and Anchor.endswith("ReturnToBody]"):
                 self.verticalScrollBar().setValue(self.verticalScrollBar().value() - 50)
         else:
-            if Anchor.startswith("[0,"):
+            if Anchor.startswith("[0,") or Anchor.startswith("[page:"):
                 self.MainWindow.DisplayMessageBox("Linked page not found.")
                 QMouseEvent.accept()
             elif Anchor.startswith("[file:"):
@@ -499,16 +502,16 @@ class TextWidget(QTextEdit):
                 Cursor = self.textCursor()
                 Cursor.beginEditBlock()
                 if InsertLinksDialogInst.InsertIndexPath is not None:
-                    IndexPath = json.dumps(InsertLinksDialogInst.InsertIndexPath)
+                    PageLink = self.Notebook.GetPageLinkString(self.Notebook.GetPageFromIndexPath(InsertLinksDialogInst.InsertIndexPath))
                     ToolTipText = f" \"{InsertLinksDialogInst.ToolTipText}\"" if InsertLinksDialogInst.AddToolTip else ""
-                    self.SelectionSpanWrap("[", f"]({IndexPath}{ToolTipText})", MoveCursorToEndOfWrappedText=self.MainWindow.MoveCursorToEndOfLinkText)
+                    self.SelectionSpanWrap("[", f"]({PageLink}{ToolTipText})", MoveCursorToEndOfWrappedText=self.MainWindow.MoveCursorToEndOfLinkText)
                 elif InsertLinksDialogInst.InsertIndexPaths is not None and InsertLinksDialogInst.SubPageLinksSeparator is not None:
                     InsertString = ""
                     for SubPagePath in InsertLinksDialogInst.InsertIndexPaths:
                         SubPageTitle = SubPagePath[0]
-                        SubPageIndexPath = json.dumps(SubPagePath[1])
+                        SubPageLink = self.Notebook.GetPageLinkString(self.Notebook.GetPageFromIndexPath(SubPagePath[1]))
                         SubPageToolTipText = f" \"{SubPageTitle}\"" if InsertLinksDialogInst.AddToolTip else ""
-                        InsertString += f"[{SubPageTitle}]({SubPageIndexPath}{SubPageToolTipText}){InsertLinksDialogInst.SubPageLinksSeparator}"
+                        InsertString += f"[{SubPageTitle}]({SubPageLink}{SubPageToolTipText}){InsertLinksDialogInst.SubPageLinksSeparator}"
                     InsertString = InsertString.rstrip()
                     self.InsertOnBlankLine(InsertString)
                     self.MakeCursorVisible()
@@ -551,9 +554,9 @@ class TextWidget(QTextEdit):
                     if SearchResultsLength > 1:
                         self.MainWindow.DisplayMessageBox("Multiple pages found.  Use the full link dialog to insert a link.", Icon=QMessageBox.Icon.Warning)
                     else:
-                        TopResultIndexPath = SearchResults["ResultsList"][0][1]
+                        TopResultPageLink = self.Notebook.GetPageLinkString(self.Notebook.GetPageFromIndexPath(SearchResults["ResultsList"][0][1]))
                         TopResultTitle = SearchResults["ResultsList"][0][0]
-                        self.SelectionSpanWrap("[", f"]({json.dumps(TopResultIndexPath)} \"{TopResultTitle}\")", MoveCursorToEndOfWrappedText=self.MainWindow.MoveCursorToEndOfLinkText)
+                        self.SelectionSpanWrap("[", f"]({TopResultPageLink} \"{TopResultTitle}\")", MoveCursorToEndOfWrappedText=self.MainWindow.MoveCursorToEndOfLinkText)
                 else:
                     self.MainWindow.DisplayMessageBox("No pages with this title found.")
 
@@ -675,6 +678,25 @@ class SyntaxHighlighter(QSyntaxHighlighter):
         # Create Highlight Targets
         self.CreateHighlightTargets()
 
+        # Variables
+        self.HighlightSyntax = False
+        self.TextHighlightPatterns = []
+        self.SearchHighlightPatterns = []
+        self.DeferredRehighlightDelay = 250
+        self.RehighlightChunkDuration = 0.02
+        self.PendingBlockRanges = []
+        self.PendingBlockCount = 0
+
+        # Deferred Rehighlight Timer
+        self.DeferredRehighlightTimer = QTimer(self)
+        self.DeferredRehighlightTimer.setSingleShot(True)
+        self.DeferredRehighlightTimer.setInterval(self.DeferredRehighlightDelay)
+        self.DeferredRehighlightTimer.timeout.connect(self.RehighlightVisibleBlocksFirst)
+
+        # Rehighlight Chunk Timer
+        self.RehighlightChunkTimer = QTimer(self)
+        self.RehighlightChunkTimer.timeout.connect(self.RehighlightNextChunk)
+
     def CreateFormats(self):
         # Heading
         self.HeadingFormat = QTextCharFormat()
@@ -731,16 +753,16 @@ class SyntaxHighlighter(QSyntaxHighlighter):
         self.HighlightTargets = []
 
         # Heading
-        self.HighlightTargets.append({"RegEx": r"(?m)^#{1,6}(?!#) (.+)", "FormatCallable": self.GetHeadingFormat})
+        self.HighlightTargets.append({"RegEx": re.compile(r"(?m)^#{1,6}(?!#) (.+)"), "FormatCallable": self.GetHeadingFormat})
 
         # Link-Type
-        self.HighlightTargets.append({"RegEx": r"(!?)\[([^\[\]\n]*?)\]\((.+?)( \".+?\")?\)", "FormatCallable": self.GetLinksFormat})
+        self.HighlightTargets.append({"RegEx": re.compile(r"(!?)\[([^\[\]\n]*?)\]\((.+?)( \".+?\")?\)"), "FormatCallable": self.GetLinksFormat})
 
         # Footnotes
-        self.HighlightTargets.append({"RegEx": r"\[\^[^\]]+?\]", "FormatCallable": self.GetFootnotesFormat})
+        self.HighlightTargets.append({"RegEx": re.compile(r"\[\^[^\]]+?\]"), "FormatCallable": self.GetFootnotesFormat})
 
         # Text Generation Tokens
-        self.HighlightTargets.append({"RegEx": r"\{(PAGETITLE|SUBPAGELINKS|SUBPAGEOFLINK|LINKINGPAGES|TOC)\}", "FormatCallable": self.GetTokensFormat})
+        self.HighlightTargets.append({"RegEx": re.compile(r"\{(PAGETITLE|SUBPAGELINKS|SUBPAGEOFLINK|LINKINGPAGES|TOC)\}"), "FormatCallable": self.GetTokensFormat})
 
     def GetHeadingFormat(self, Match):
         return self.HeadingFormat
@@ -765,47 +787,143 @@ class SyntaxHighlighter(QSyntaxHighlighter):
     def GetTokensFormat(self, Match):
         return self.TokensFormat
 
+    def UpdateHighlightPatterns(self):
+        # Highlight settings are read once here instead of in every block, so they only need updating when a setting changes
+        MainWindow = self.TextWidget.MainWindow
+        self.HighlightSyntax = MainWindow.HighlightSyntax
+
+        # Any rehighlight still pending was for the old settings
+        self.StopDeferredRehighlight()
+
+        # Text Highlight
+        self.TextHighlightPatterns = self.CreateTermsPatterns([(HighlightText, MainWindow.TextToHighlightMatchCase, False, False) for HighlightText in MainWindow.TextToHighlight])
+
+        # Search Highlight
+        SearchTerms = []
+        # The search widget can rehighlight while it is still being created, before the main window holds it
+        SearchWidgetInst = getattr(MainWindow, "SearchWidgetInst", None)
+        for SearchInterface in (SearchWidgetInst, MainWindow.AdvancedSearchDialogInst):
+            if SearchInterface is not None and SearchInterface.HighlightCheckBox.isChecked():
+                SearchTerms.append((SearchInterface.SearchTextLineEdit.text(), SearchInterface.MatchCaseCheckBox.isChecked(), SearchInterface.RegularExpressionCheckBox.isChecked(), SearchInterface.WholeWordCheckBox.isChecked()))
+        self.SearchHighlightPatterns = self.CreateTermsPatterns(SearchTerms)
+
+    def CreateTermsPatterns(self, Terms):
+        # Returns (Pattern, Group) pairs; terms that are not regular expressions are matched in one pass by a lookahead alternation, longest terms first, so every occurrence of every term is found even where occurrences overlap
+        # Regular expressions are highlighted with Qt's regular expressions, which stop themselves when they backtrack too much, since highlighting runs on the main thread for every block as it is edited
+        Alternatives = {}
+        TermsPatterns = []
+        for Term, MatchCase, RegularExpression, WholeWord in Terms:
+            if Term == "":
+                continue
+            if RegularExpression:
+                SearchPattern = QRegularExpression(GetSearchPatternString(Term, RegularExpression=True, WholeWord=WholeWord), QRegularExpression.PatternOption.UseUnicodePropertiesOption if MatchCase else QRegularExpression.PatternOption.UseUnicodePropertiesOption | QRegularExpression.PatternOption.CaseInsensitiveOption)
+                if SearchPattern.isValid():
+                    TermsPatterns.append((SearchPattern, 0))
+                continue
+            Alternative = GetSearchPatternString(Term, WholeWord=WholeWord)
+            Alternatives[Alternative if MatchCase else f"(?i:{Alternative})"] = len(Term)
+        if len(Alternatives) > 0:
+            TermsPatterns.insert(0, (CompilePattern(f"(?=({'|'.join(sorted(Alternatives, key=lambda Alternative: Alternatives[Alternative], reverse=True))}))"), 1))
+        return TermsPatterns
+
+    def HighlightTerms(self, Patterns, Text, Format):
+        # Overlapping and adjacent occurrences are merged so each highlighted run is formatted once; empty matches have nothing to highlight
+        if len(Patterns) == 1:
+            Targets = self.GetTargetSpans(*Patterns[0], Text)
+        else:
+            Targets = sorted(TargetSpan for Pattern, Group in Patterns for TargetSpan in self.GetTargetSpans(Pattern, Group, Text))
+        RunStart = RunEnd = None
+        for TargetStart, TargetEnd in Targets:
+            if TargetStart == TargetEnd:
+                continue
+            if RunEnd is not None and TargetStart <= RunEnd:
+                RunEnd = max(RunEnd, TargetEnd)
+                continue
+            if RunEnd is not None:
+                self.setFormat(RunStart, RunEnd - RunStart, Format)
+            RunStart, RunEnd = TargetStart, TargetEnd
+        if RunEnd is not None:
+            self.setFormat(RunStart, RunEnd - RunStart, Format)
+
+    def GetTargetSpans(self, Pattern, Group, Text):
+        if isinstance(Pattern, QRegularExpression):
+            Targets = Pattern.globalMatch(Text)
+            while Targets.hasNext():
+                Target = Targets.next()
+                yield Target.capturedStart(Group), Target.capturedEnd(Group)
+        else:
+            for Target in Pattern.finditer(Text):
+                yield Target.span(Group)
+
+    def rehighlight(self):
+        self.UpdateHighlightPatterns()
+        super().rehighlight()
+
+    def RehighlightDeferred(self):
+        # Restarting the timer on every call means a burst of changes, like typing in a search field, is only rehighlighted once it pauses
+        self.DeferredRehighlightTimer.start()
+
+    def RehighlightVisibleBlocksFirst(self):
+        self.UpdateHighlightPatterns()
+        Document = self.document()
+        if Document is None:
+            return
+
+        # Visible Blocks
+        Viewport = self.TextWidget.viewport()
+        FirstVisibleBlockNumber = self.TextWidget.cursorForPosition(QPoint(0, 0)).blockNumber()
+        LastVisibleBlockNumber = self.TextWidget.cursorForPosition(QPoint(Viewport.width(), Viewport.height())).blockNumber()
+        for BlockNumber in range(FirstVisibleBlockNumber, LastVisibleBlockNumber + 1):
+            self.rehighlightBlock(Document.findBlockByNumber(BlockNumber))
+
+        # Remaining Blocks
+        self.PendingBlockRanges = [(LastVisibleBlockNumber + 1, Document.blockCount()), (0, FirstVisibleBlockNumber)]
+        self.PendingBlockCount = Document.blockCount()
+        self.RehighlightChunkTimer.start()
+
+    def RehighlightNextChunk(self):
+        Document = self.document()
+        if Document is None:
+            self.StopDeferredRehighlight()
+            return
+        if Document.blockCount() != self.PendingBlockCount:
+            # Block numbers have shifted since the pending ranges were found, so the whole document is covered again
+            self.PendingBlockRanges = [(0, Document.blockCount())]
+            self.PendingBlockCount = Document.blockCount()
+        ChunkEndTime = time.perf_counter() + self.RehighlightChunkDuration
+
+        # Rehighlighting a chunk in one edit block means the document only reports a change once per chunk
+        Cursor = QTextCursor(Document)
+        Cursor.beginEditBlock()
+        while len(self.PendingBlockRanges) > 0 and time.perf_counter() < ChunkEndTime:
+            RangeStart, RangeEnd = self.PendingBlockRanges[0]
+            if RangeStart >= RangeEnd:
+                del self.PendingBlockRanges[0]
+                continue
+            self.rehighlightBlock(Document.findBlockByNumber(RangeStart))
+            self.PendingBlockRanges[0] = (RangeStart + 1, RangeEnd)
+        Cursor.endEditBlock()
+        if len(self.PendingBlockRanges) == 0:
+            self.RehighlightChunkTimer.stop()
+
+    def StopDeferredRehighlight(self):
+        self.DeferredRehighlightTimer.stop()
+        self.RehighlightChunkTimer.stop()
+        self.PendingBlockRanges = []
+
     def highlightBlock(self, Text):
         # Highlight Syntax
-        if self.TextWidget.MainWindow.HighlightSyntax and not self.TextWidget.ReadMode:
+        if self.HighlightSyntax and not self.TextWidget.ReadMode:
             for HighlightTarget in self.HighlightTargets:
-                TargetIterator = re.finditer(HighlightTarget["RegEx"], Text)
-                for Target in TargetIterator:
+                for Target in HighlightTarget["RegEx"].finditer(Text):
                     Format = HighlightTarget["FormatCallable"](Target)
                     if Format is not None:
                         self.setFormat(Target.start(), Target.end() - Target.start(), Format)
 
         # Highlight Text
-        for HighlightText in self.TextWidget.MainWindow.TextToHighlight:
-            if self.TextWidget.MainWindow.TextToHighlightMatchCase:
-                TargetIterator = re.finditer(re.escape(HighlightText), Text)
-            else:
-                TargetIterator = re.finditer(re.escape(HighlightText), Text, re.IGNORECASE)
-            for Target in TargetIterator:
-                self.setFormat(Target.start(), Target.end() - Target.start(), self.TextHighlightFormat)
+        if len(self.TextHighlightPatterns) > 0:
+            self.HighlightTerms(self.TextHighlightPatterns, Text, self.TextHighlightFormat)
 
         # Highlight Search Text
-        if self.TextWidget.MainWindow.SearchWidgetInst.HighlightCheckBox.isChecked():
-            SearchText = self.TextWidget.MainWindow.SearchWidgetInst.SearchTextLineEdit.text()
-            if SearchText != "":
-                MatchCase = self.TextWidget.MainWindow.SearchWidgetInst.MatchCaseCheckBox.isChecked()
-                if MatchCase:
-                    TargetIterator = re.finditer(re.escape(SearchText), Text)
-                else:
-                    TargetIterator = re.finditer(re.escape(SearchText), Text, re.IGNORECASE)
-                for Target in TargetIterator:
-                    self.setFormat(Target.start(), Target.end() - Target.start(), self.SearchHighlightFormat)
-
-        # Highlight Advanced Search Text
-        AdvancedSearchDialogInst = self.TextWidget.MainWindow.AdvancedSearchDialogInst
-        if AdvancedSearchDialogInst is not None:
-            if AdvancedSearchDialogInst.HighlightCheckBox.isChecked():
-                SearchText = AdvancedSearchDialogInst.SearchTextLineEdit.text()
-                if SearchText != "":
-                    MatchCase = AdvancedSearchDialogInst.MatchCaseCheckBox.isChecked()
-                    if MatchCase:
-                        TargetIterator = re.finditer(re.escape(SearchText), Text)
-                    else:
-                        TargetIterator = re.finditer(re.escape(SearchText), Text, re.IGNORECASE)
-                    for Target in TargetIterator:
-                        self.setFormat(Target.start(), Target.end() - Target.start(), self.SearchHighlightFormat)
+        if len(self.SearchHighlightPatterns) > 0:
+            self.HighlightTerms(self.SearchHighlightPatterns, Text, self.SearchHighlightFormat)
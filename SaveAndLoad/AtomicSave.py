@@ -0,0 +1,43 @@
+import os
+import shutil
+import tempfile
+
+
+def SaveFileAtomically(FilePath, WriteFile):
+    # Write and Sync a Temporary File in the Same Directory, then Rename It over the Target
+    # A uniquely named hidden file never overwrites the user's own files or another save's temporary file
+    TemporaryFileDescriptor, TemporaryFilePath = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(FilePath)), prefix=f".{os.path.basename(FilePath)}.", suffix=".tmp")
+    os.close(TemporaryFileDescriptor)
+    try:
+        WriteFile(TemporaryFilePath)
+        with open(TemporaryFilePath, "r+b") as TemporaryFile:
+            os.fsync(TemporaryFile.fileno())
+        if os.path.isfile(FilePath):
+            shutil.copymode(FilePath, TemporaryFilePath)
+        else:
+            # Temporary files are only readable by their owner, so new files get the permissions they would have been created with
+            os.chmod(TemporaryFilePath, 0o666 & ~GetUmask())
+        os.replace(TemporaryFilePath, FilePath)
+    except BaseException:
+        if os.path.isfile(TemporaryFilePath):
+            os.remove(TemporaryFilePath)
+        raise
+    SyncDirectory(os.path.dirname(os.path.abspath(FilePath)))
+    return os.stat(FilePath).st_mtime
+
+
+def SyncDirectory(DirectoryPath):
+    # Directories Cannot Be Opened for Syncing on Windows, Where the Rename Is Flushed with the File System Anyway
+    if os.name == "nt":
+        return
+    DirectoryDescriptor = os.open(DirectoryPath, os.O_RDONLY)
+    try:
+        os.fsync(DirectoryDescriptor)
+    finally:
+        os.close(DirectoryDescriptor)
+
+
+def GetUmask():
+    Umask = os.umask(0)
+    os.umask(Umask)
+    return Umask
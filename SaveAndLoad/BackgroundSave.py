@@ -0,0 +1,30 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class BackgroundSaveSignals(QObject):
+    Finished = pyqtSignal()
+
+
+class BackgroundSave(QRunnable):
+    def __init__(self, SaveFileName, WriteSaveFile, BinaryMembers=None, FinishedCallback=None, DeleteJournal=False):
+        super().__init__()
+
+        # Store Parameters
+        self.SaveFileName = SaveFileName
+        self.WriteSaveFile = WriteSaveFile
+        self.BinaryMembers = BinaryMembers
+        self.FinishedCallback = FinishedCallback
+        self.DeleteJournal = DeleteJournal
+
+        # Variables
+        self.SaveFileTimestamp = None
+        self.Error = None
+        self.Signals = BackgroundSaveSignals()
+        self.setAutoDelete(False)
+
+    def run(self):
+        try:
+            self.SaveFileTimestamp = self.WriteSaveFile()
+        except Exception as Error:
+            self.Error = Error
+        self.Signals.Finished.emit()
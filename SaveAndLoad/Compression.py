@@ -0,0 +1,131 @@
+import collections
+import gzip
+import io
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+
+# Codecs Are Used to Write Compressed Files; Compressed Files Are Read According to Their Format, Which Both Gzip Codecs Share
+CompressionCodecs = {}
+CompressionCodecs["Gzip"] = {"FileFormat": "Gzip", "MinimumLevel": 1, "MaximumLevel": 9, "DefaultLevel": 9, "Package": None}
+CompressionCodecs["Parallel Gzip"] = {"FileFormat": "Gzip", "MinimumLevel": 1, "MaximumLevel": 9, "DefaultLevel": 6, "Package": None}
+CompressionCodecs["Zstandard"] = {"FileFormat": "Zstandard", "MinimumLevel": 1, "MaximumLevel": 22, "DefaultLevel": 3, "Package": "zstandard"}
+CompressionCodecs["LZ4"] = {"FileFormat": "LZ4", "MinimumLevel": 0, "MaximumLevel": 16, "DefaultLevel": 0, "Package": "lz4"}
+
+CompressedFileFormatMagicBytes = {"Gzip": b"\x1f\x8b", "Zstandard": b"\x28\xb5\x2f\xfd", "LZ4": b"\x04\x22\x4d\x18"}
+
+
+def CompressionCodecIsAvailable(CompressionCodec):
+    if CompressionCodec not in CompressionCodecs:
+        return False
+    FileFormat = CompressionCodecs[CompressionCodec]["FileFormat"]
+    if FileFormat == "Zstandard":
+        return zstandard is not None
+    if FileFormat == "LZ4":
+        return lz4 is not None
+    return True
+
+
+def GetAvailableCompressionCodecs():
+    return [CompressionCodec for CompressionCodec in CompressionCodecs if CompressionCodecIsAvailable(CompressionCodec)]
+
+
+def GetCompressedFileFormat(MagicBytes):
+    for FileFormat, FileFormatMagicBytes in CompressedFileFormatMagicBytes.items():
+        if MagicBytes.startswith(FileFormatMagicBytes):
+            return FileFormat
+    return None
+
+
+def OpenCompressedFileForWriting(FilePath, CompressionCodec, CompressionLevel):
+    # Text Is Encoded as It Would Be by gzip.open, So Every Codec Reads Back the Same
+    if CompressionCodec == "Parallel Gzip":
+        return io.TextIOWrapper(ParallelGzipWriter(FilePath, CompressionLevel))
+    if CompressionCodec == "Zstandard":
+        return zstandard.open(FilePath, "wt", cctx=zstandard.ZstdCompressor(level=CompressionLevel, threads=-1))
+    if CompressionCodec == "LZ4":
+        return lz4.frame.open(FilePath, "wt", compression_level=CompressionLevel)
+    return gzip.open(FilePath, "wt", compresslevel=CompressionLevel)
+
+
+def OpenCompressedFileForReading(FilePath, FileFormat):
+    if FileFormat == "Zstandard":
+        return zstandard.open(FilePath, "rt")
+    if FileFormat == "LZ4":
+        return lz4.frame.open(FilePath, "rt")
+    return gzip.open(FilePath, "rt")
+
+
+def CompressGzipBlock(Block, CompressionLevel, Dictionary, LastBlock):
+    # Raw Deflate Streams Ending in a Sync Flush Can Be Concatenated, and Priming with the Previous Block Keeps the Ratio Close to Single-Threaded Compression
+    if len(Dictionary) > 0:
+        Compressor = zlib.compressobj(CompressionLevel, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=Dictionary)
+    else:
+        Compressor = zlib.compressobj(CompressionLevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return Compressor.compress(Block) + Compressor.flush(zlib.Z_FINISH if LastBlock else zlib.Z_SYNC_FLUSH)
+
+
+class ParallelGzipWriter(io.BufferedIOBase):
+    def __init__(self, FilePath, CompressionLevel=6, BlockSize=1048576, Threads=None):
+        super().__init__()
+
+        # Store Parameters
+        self.CompressionLevel = CompressionLevel
+        self.BlockSize = BlockSize
+        self.Threads = Threads if Threads is not None else (os.cpu_count() or 1)
+
+        # Variables
+        self.File = open(FilePath, "wb")
+        self.Executor = ThreadPoolExecutor(self.Threads)
+        self.PendingBlocks = collections.deque()
+        self.Buffer = bytearray()
+        self.Dictionary = b""
+        self.CRC = 0
+        self.Size = 0
+
+        # Write Header
+        self.File.write(b"\x1f\x8b\x08\x00" + struct.pack("<I", int(time.time())) + b"\x00\xff")
+
+    def writable(self):
+        return True
+
+    def write(self, Data):
+        self.Buffer += Data
+        while len(self.Buffer) >= self.BlockSize:
+            self.SubmitBlock(bytes(self.Buffer[:self.BlockSize]), False)
+            del self.Buffer[:self.BlockSize]
+        return len(Data)
+
+    def SubmitBlock(self, Block, LastBlock):
+        self.CRC = zlib.crc32(Block, self.CRC)
+        self.Size += len(Block)
+        self.PendingBlocks.append(self.Executor.submit(CompressGzipBlock, Block, self.CompressionLevel, self.Dictionary, LastBlock))
+        self.Dictionary = Block[-32768:]
+        while len(self.PendingBlocks) > self.Threads * 2:
+            self.File.write(self.PendingBlocks.popleft().result())
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self.SubmitBlock(bytes(self.Buffer), True)
+            while len(self.PendingBlocks) > 0:
+                self.File.write(self.PendingBlocks.popleft().result())
+            self.File.write(struct.pack("<II", self.CRC, self.Size & 0xFFFFFFFF))
+        finally:
+            self.Executor.shutdown()
+            self.File.close()
+            super().close()
@@ -1,18 +1,31 @@
 import abc
 import json
+from collections.abc import Mapping
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
 
 
 class JSONSerializer:
     """
     This class is designed to serialize and deserialize arbitrary object data in JSON format.
 
-    The serialized data must either adhere to the normal JSON structures or be an object inheriting from SerializableMixin (and implementing its methods properly).
+    The serialized data must either adhere to the normal JSON structures or be an object inheriting from SerializableMixin (and implementing its methods properly).  Other mappings are serialized as plain dictionaries, and are deserialized as such.
 
     Likewise, data returned by the GetState method of SerializableMixin inheritors must adhere to these restrictions.
 
-    To serialize data, just call the SerializeDataToJSONString method, which returns the JSON string.
+    To serialize data, just call the SerializeDataToJSONString method, which returns the JSON string.  To write the serialized data to an open text file in chunks instead of building the whole string in memory, call the SerializeDataToJSONFile method.  Passing None as the Indent to either method writes compact JSON with no whitespace.
+
+    To deserialize data from a JSON string, call the DeserializeDataFromJSONString method, which returns the reconstituted data structure.  By default, every dictionary in the data is checked for a serialized object; if objects can only appear at the top level of the data or in the top-level values of other objects' states, pass an ObjectDepth to only check those locations, which also allows the JSON to be parsed by orjson or ujson if either is installed.
 
-    To deserialize data from a JSON string, call the DeserializeDataFromJSONString method, which returns the reconstituted data structure.
+    Binary data held by objects inheriting from BinaryStoreMixin is written into the JSON string as base64 by default.  Pass a BinaryMembers dictionary to either method to keep that data out of the JSON string instead; it is collected into or read from the dictionary, keyed by digest, so that it can be stored separately as raw bytes.
     """
 
     def __init__(self, ObjectClasses=()):
@@ -21,14 +34,56 @@ class JSONSerializer:
         """
         self.ObjectClasses = ObjectClasses
         self.ObjectTypeCalls = {}
+        self.BinaryStoreTypeCalls = {}
         for ObjectClass in ObjectClasses:
-            self.ObjectTypeCalls[ObjectClass.__name__] = lambda State, ObjectClass=ObjectClass: ObjectClass.CreateFromState(State)
+            if issubclass(ObjectClass, BinaryStoreMixin):
+                self.BinaryStoreTypeCalls[ObjectClass.__name__] = lambda MemberDigests, BinaryMembers, ObjectClass=ObjectClass: ObjectClass.CreateFromBinaryMembers(MemberDigests, BinaryMembers)
+            else:
+                self.ObjectTypeCalls[ObjectClass.__name__] = lambda State, ObjectClass=ObjectClass: ObjectClass.CreateFromState(State)
+
+    def SerializeDataToJSONString(self, Data, Indent=2, BinaryMembers=None):
+        return json.dumps(Data, cls=Encoder, indent=Indent, separators=self.GetSeparators(Indent), BinaryMembers=BinaryMembers)
+
+    def SerializeDataToJSONFile(self, Data, File, Indent=2, BinaryMembers=None, ChunkSize=1048576):
+        Chunks = []
+        ChunksLength = 0
+        for Chunk in Encoder(indent=Indent, separators=self.GetSeparators(Indent), BinaryMembers=BinaryMembers).iterencode(Data):
+            Chunks.append(Chunk)
+            ChunksLength += len(Chunk)
+            if ChunksLength >= ChunkSize:
+                File.write("".join(Chunks))
+                Chunks.clear()
+                ChunksLength = 0
+        File.write("".join(Chunks))
+
+    def GetSeparators(self, Indent):
+        return (",", ":") if Indent is None else None
+
+    def DeserializeDataFromJSONString(self, JSONString, BinaryMembers=None, ObjectDepth=None):
+        """
+        ObjectDepth should be None to check every dictionary for a serialized object as it is decoded, or the number of levels of nested object states to check below the top level of the data once it has been decoded.
+        """
+        if ObjectDepth is None:
+            return json.loads(JSONString, cls=lambda: Decoder(self.ObjectTypeCalls, self.BinaryStoreTypeCalls, BinaryMembers))
+        return self.ReconstituteObjects(LoadJSON(JSONString), Decoder(self.ObjectTypeCalls, self.BinaryStoreTypeCalls, BinaryMembers).ObjectHook, ObjectDepth)
 
-    def SerializeDataToJSONString(self, Data, Indent=2):
-        return json.dumps(Data, cls=Encoder, indent=Indent)
+    def ReconstituteObjects(self, Data, ObjectHook, ObjectDepth):
+        if not isinstance(Data, dict):
+            return Data
+        if ObjectDepth > 0 and "ObjectType" in Data and isinstance(Data.get("ObjectData"), dict):
+            Data["ObjectData"] = {Key: self.ReconstituteObjects(Value, ObjectHook, ObjectDepth - 1) for Key, Value in Data["ObjectData"].items()}
+        return ObjectHook(Data)
 
-    def DeserializeDataFromJSONString(self, JSONString):
-        return json.loads(JSONString, cls=lambda: Decoder(self.ObjectTypeCalls))
+
+def LoadJSON(JSONString):
+    """
+    Parses a JSON string with no object hook, using orjson or ujson if either is installed and the standard library's C decoder otherwise.
+    """
+    if orjson is not None:
+        return orjson.loads(JSONString)
+    if ujson is not None:
+        return ujson.loads(JSONString)
+    return json.loads(JSONString)
 
 
 class SerializableMixin(metaclass=abc.ABCMeta):
@@ -65,22 +120,89 @@ class SerializableMixin(metaclass=abc.ABCMeta):
         pass
 
 
+class BinaryStoreMixin(metaclass=abc.ABCMeta):
+    """
+    Inherit from this class and implement its abstract methods to allow an object holding named binary data to be serialized and deserialized.
+
+    Without a BinaryMembers dictionary, the object is serialized as a plain dictionary of names to base64 strings, which it should also accept when deserialized as part of another object's state.
+
+    Binary data is passed through untouched, so a store may hold placeholders for data it has not loaded yet, as long as whatever writes the BinaryMembers dictionary knows how to read them.
+    """
+
+    @abc.abstractmethod
+    def GetBinaryMembers(self):
+        """
+        This method should return a tuple of two dictionaries:  one mapping each name to the digest of its binary data, and one mapping each digest to the binary data itself.
+        """
+        pass
+
+    @abc.abstractmethod
+    def GetBase64String(self, Name):
+        """
+        This method should return the binary data for the given name encoded as a base64 string.
+        """
+        pass
+
+    @classmethod
+    @abc.abstractmethod
+    def CreateFromBinaryMembers(cls, MemberDigests, BinaryMembers):
+        """
+        This method should create a new instance of the class from a dictionary of names to digests and a dictionary of digests to binary data, and return the instance.
+        """
+        pass
+
+
+class Base64StringDictionary(dict):
+    """
+    A dictionary of the names in a binary store that encodes each name's binary data as base64 only when its item is reached, so that the whole store is never held in memory as base64 at once while being serialized.
+    """
+
+    def __init__(self, BinaryStore, MemberDigests):
+        super().__init__(MemberDigests)
+        self.BinaryStore = BinaryStore
+
+    def items(self):
+        for Name in self.keys():
+            yield Name, self.BinaryStore.GetBase64String(Name)
+
+
 class Encoder(json.JSONEncoder):
+    def __init__(self, BinaryMembers=None, **kwargs):
+        self.BinaryMembers = BinaryMembers
+        super().__init__(**kwargs)
+
     def default(self, EncodedObject):
+        if isinstance(EncodedObject, BinaryStoreMixin):
+            MemberDigests, BinaryMembers = EncodedObject.GetBinaryMembers()
+            if self.BinaryMembers is None:
+                return Base64StringDictionary(EncodedObject, MemberDigests)
+            for Digest in MemberDigests.values():
+                self.BinaryMembers[Digest] = BinaryMembers[Digest]
+            Data = {}
+            Data["MemberDigests"] = MemberDigests
+            Data["BinaryStoreType"] = EncodedObject.__class__.__name__
+            return Data
         if isinstance(EncodedObject, SerializableMixin):
             Data = {}
             Data["ObjectData"] = EncodedObject.GetState()
             Data["ObjectType"] = EncodedObject.__class__.__name__
             return Data
+        if isinstance(EncodedObject, Mapping):
+            return dict(EncodedObject)
         return super().default(EncodedObject)
 
 
 class Decoder(json.JSONDecoder):
-    def __init__(self, ObjectTypeCalls):
+    def __init__(self, ObjectTypeCalls, BinaryStoreTypeCalls=None, BinaryMembers=None):
         self.ObjectTypeCalls = ObjectTypeCalls
+        self.BinaryStoreTypeCalls = BinaryStoreTypeCalls if BinaryStoreTypeCalls is not None else {}
+        self.BinaryMembers = BinaryMembers
         super().__init__(object_hook=self.ObjectHook)
 
     def ObjectHook(self, DecodedObject):
+        if "BinaryStoreType" in DecodedObject and "MemberDigests" in DecodedObject and self.BinaryMembers is not None:
+            BinaryStoreType = DecodedObject["BinaryStoreType"]
+            return self.BinaryStoreTypeCalls[BinaryStoreType](DecodedObject["MemberDigests"], self.BinaryMembers)
         if "ObjectType" not in DecodedObject or "ObjectData" not in DecodedObject:
             return DecodedObject
         ObjectType = DecodedObject["ObjectType"]
@@ -0,0 +1,103 @@
+import abc
+import json
+import os
+
+
+class JournalMixin(metaclass=abc.ABCMeta):
+    """
+    Inherit from this class and implement its abstract methods to allow changes to an object to be saved as entries appended to a journal file alongside its main save file, instead of rewriting the main file every time.
+
+    Entries must be JSON-serializable dictionaries.  On opening, the entries in a journal that matches the main file are passed back to the object, in order, after it has been deserialized from the main file.
+    """
+
+    @abc.abstractmethod
+    def GetJournalEntry(self):
+        """
+        This method should return a journal entry describing the changes to the object since the last call to ClearJournalChanges, or None if nothing has changed.
+        """
+        pass
+
+    @abc.abstractmethod
+    def ApplyJournalEntries(self, JournalEntries):
+        """
+        This method should apply a list of journal entries, in order, to the object, and then clear its journal changes.
+        """
+        pass
+
+    @abc.abstractmethod
+    def ClearJournalChanges(self):
+        """
+        This method should forget all changes tracked for the journal, as when they have been saved.
+        """
+        pass
+
+    @abc.abstractmethod
+    def JournalRequiresCompaction(self):
+        """
+        This method should return whether the object has changes that cannot be saved to a journal, so that it must be saved to the main file instead.
+        """
+        pass
+
+
+def GetJournalFileName(FilePath):
+    return f"{FilePath}.journal"
+
+
+def GetJournalBase(FilePath):
+    return os.stat(FilePath).st_mtime_ns
+
+
+def ReadJournalBase(JournalFileName):
+    if not os.path.isfile(JournalFileName):
+        return None
+    with open(JournalFileName, "r", encoding="utf-8") as JournalFile:
+        try:
+            return json.loads(JournalFile.readline())["JournalBase"]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+
+def AppendJournalEntry(FilePath, JournalEntry):
+    # Start a New Journal if There Is None for the Main File as It Is Now
+    JournalFileName = GetJournalFileName(FilePath)
+    JournalBase = GetJournalBase(FilePath)
+    NewJournal = ReadJournalBase(JournalFileName) != JournalBase
+    with open(JournalFileName, "w" if NewJournal else "a+", encoding="utf-8") as JournalFile:
+        if NewJournal:
+            JournalFile.write(f"{json.dumps({"JournalBase": JournalBase})}\n")
+        elif JournalFile.tell() > 0:
+            # An Entry Cut Off by a Crash Is Left on a Line of Its Own
+            JournalFile.seek(JournalFile.tell() - 1)
+            if JournalFile.read(1) != "\n":
+                JournalFile.write("\n")
+        JournalFile.write(f"{json.dumps(JournalEntry, separators=(",", ":"))}\n")
+        JournalFile.flush()
+        os.fsync(JournalFile.fileno())
+
+
+def ReadJournalEntries(FilePath):
+    JournalFileName = GetJournalFileName(FilePath)
+    if ReadJournalBase(JournalFileName) != GetJournalBase(FilePath):
+        return []
+    JournalEntries = []
+    with open(JournalFileName, "r", encoding="utf-8") as JournalFile:
+        JournalFile.readline()
+        for Line in JournalFile:
+            try:
+                JournalEntries.append(json.loads(Line))
+            except ValueError:
+                continue
+    return JournalEntries
+
+
+def DeleteJournal(FilePath):
+    JournalFileName = GetJournalFileName(FilePath)
+    if os.path.isfile(JournalFileName):
+        os.remove(JournalFileName)
+
+
+def JournalRequiresCompaction(FilePath, MinimumJournalSize=1048576):
+    JournalFileName = GetJournalFileName(FilePath)
+    if not os.path.isfile(JournalFileName):
+        return False
+    return os.path.getsize(JournalFileName) > max(MinimumJournalSize, os.path.getsize(FilePath) // 2)
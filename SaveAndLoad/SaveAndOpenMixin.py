@@ -1,11 +1,17 @@
 import os
-import gzip
 import json
+import zipfile
 from datetime import datetime
 
+from PyQt6.QtCore import QThreadPool
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 
+from SaveAndLoad.AtomicSave import SaveFileAtomically
+from SaveAndLoad.BackgroundSave import BackgroundSave
+from SaveAndLoad.Compression import CompressionCodecs, CompressionCodecIsAvailable, GetCompressedFileFormat, OpenCompressedFileForWriting, OpenCompressedFileForReading
 from SaveAndLoad.JSONSerializer import JSONSerializer
+from SaveAndLoad.Journal import JournalMixin, AppendJournalEntry, ReadJournalEntries, DeleteJournal, JournalRequiresCompaction
+from SaveAndLoad.ZipContainer import WriteZipContainer, ReadZipContainer, PointZipContainerMembersAtFile
 
 
 class SaveAndOpenMixin:
@@ -16,16 +22,30 @@ class SaveAndOpenMixin:
         self.LastOpenedDirectory = None
         self.FileLastModified = None
         self.GzipMode = False
+        self.CompressionCodec = "Gzip"
+        self.CompressionLevels = {}
+        self.ZipContainerMode = False
+        self.CompactJSONMode = False
+        self.JournalMode = False
+        self.BackgroundSaveInst = None
+        self.BackgroundSaveThreadPool = QThreadPool()
+        self.BackgroundSaveThreadPool.setMaxThreadCount(1)
         from Interface.MainWindow import MainWindow
         self.MainWindowClass = MainWindow
 
         # Load from Config
         self.LoadLastOpenedDirectory()
         self.LoadGzipMode()
+        self.LoadCompressionSettings()
+        self.LoadZipContainerMode()
+        self.LoadCompactJSONMode()
+        self.LoadJournalMode()
 
     def Save(self, ObjectToSave, SaveAs=False, AlternateFileDescription=None, AlternateFileExtension=None, SkipSerialization=False, ExportMode=False):
         assert isinstance(self, self.MainWindowClass)
+        self.WaitForBackgroundSave()
         GzipMode = self.GzipMode if not ExportMode else False
+        ZipContainerMode = self.ZipContainerMode and not GzipMode and not ExportMode and not SkipSerialization
         ActionString = "Save " if not ExportMode else "Export "
         ActionDoneString = "saved" if not ExportMode else "exported"
         Caption = f"{ActionString}{self.FileDescription if AlternateFileDescription is None else AlternateFileDescription} File"
@@ -46,30 +66,30 @@ class SaveAndOpenMixin:
                     SaveFileName += GzipExtension
                 else:
                     SaveFileName += Extension
-            SaveString = self.JSONSerializer.SerializeDataToJSONString(ObjectToSave) if not SkipSerialization else ObjectToSave
-            if GzipMode:
-                try:
-                    with gzip.open(SaveFileName, "wt") as SaveFile:
-                        SaveFile.write(SaveString)
-                except FileNotFoundError as Error:
-                    self.DisplayMessageBox(f"Failed to {ActionString.lower()} with the following error:\n\n{str(Error)}\n\nThis is most likely due to the excessive length of the file paths needed.  Try to {ActionString.lower()} to a different location.")
-                    self.FlashStatusBar(f"No file {ActionDoneString}.")
-                    return False
-            else:
-                try:
-                    with open(SaveFileName, "w") as SaveFile:
-                        SaveFile.write(SaveString)
-                except FileNotFoundError as Error:
-                    self.DisplayMessageBox(f"Failed to {ActionString.lower()} with the following error:\n\n{str(Error)}\n\nThis is most likely due to the excessive length of the file paths needed.  Try to {ActionString.lower()} to a different location.")
-                    self.FlashStatusBar(f"No file {ActionDoneString}.")
-                    return False
+            if SaveFileName == self.CurrentOpenFileName and not ExportMode and not SkipSerialization and self.SaveToJournal(ObjectToSave, SaveFileName):
+                self.FlashStatusBar(f"File saved to journal:  \"{os.path.basename(SaveFileName)}\"")
+                self.UnsavedChanges = False
+                return True
+            BinaryMembers = {} if ZipContainerMode else None
+            try:
+                Compression = self.GetCompression() if GzipMode else None
+                SaveFileTimestamp = SaveFileAtomically(SaveFileName, lambda TemporaryFilePath: self.WriteSaveFile(TemporaryFilePath, ObjectToSave, SkipSerialization, Compression, BinaryMembers))
+            except FileNotFoundError as Error:
+                self.DisplayMessageBox(f"Failed to {ActionString.lower()} with the following error:\n\n{str(Error)}\n\nThis is most likely due to the excessive length of the file paths needed.  Try to {ActionString.lower()} to a different location.")
+                self.FlashStatusBar(f"No file {ActionDoneString}.")
+                return False
+            if ZipContainerMode:
+                PointZipContainerMembersAtFile(SaveFileName, BinaryMembers)
+            if not ExportMode and isinstance(ObjectToSave, JournalMixin):
+                DeleteJournal(SaveFileName)
+                ObjectToSave.ClearJournalChanges()
             SaveFileNameShort = os.path.basename(SaveFileName)
             self.LastOpenedDirectory = os.path.dirname(SaveFileName)
             self.FlashStatusBar(f"File {ActionDoneString} as:  \"{SaveFileNameShort}\"")
             if not ExportMode:
                 self.CurrentOpenFileName = SaveFileName
                 self.UnsavedChanges = False
-                self.FileLastModified = datetime.fromtimestamp(os.path.getmtime(SaveFileName))
+                self.FileLastModified = datetime.fromtimestamp(SaveFileTimestamp)
             return True
         else:
             self.FlashStatusBar(f"No file {ActionDoneString}.")
@@ -77,6 +97,7 @@ class SaveAndOpenMixin:
 
     def Open(self, ObjectToSave, FilePath=None, RespectUnsavedChanges=True, AlternateFileDescription=None, AlternateFileExtension=None, ImportMode=False):
         assert isinstance(self, self.MainWindowClass)
+        self.WaitForBackgroundSave()
         GzipMode = self.GzipMode if not ImportMode else False
         ActionString = "Open " if not ImportMode else "Import "
         ActionInProgressString = "opening" if not ImportMode else "importing"
@@ -95,18 +116,33 @@ class SaveAndOpenMixin:
         Filter = f"{self.FileDescription if AlternateFileDescription is None else AlternateFileDescription} files (*{self.FileExtension if AlternateFileExtension is None else AlternateFileExtension}{"" if not GzipMode else ".gz"})"
         OpenFileName = FilePath if FilePath is not None else QFileDialog.getOpenFileName(caption=Caption, filter=Filter, directory=self.LastOpenedDirectory)[0]
         if OpenFileName != "":
-            if GzipMode:
-                with gzip.open(OpenFileName, "rt") as LoadFile:
+            OpenFileNameShort = os.path.basename(OpenFileName)
+            FileFormat = self.GetFileFormat(OpenFileName)
+            BinaryMembers = None
+            if FileFormat in ("Gzip", "Zstandard", "LZ4"):
+                if not CompressionCodecIsAvailable(FileFormat):
+                    self.DisplayMessageBox(f"\"{OpenFileNameShort}\" is compressed with {FileFormat}, which requires the {CompressionCodecs[FileFormat]["Package"]} package to be installed.")
+                    return None
+                with OpenCompressedFileForReading(OpenFileName, FileFormat) as LoadFile:
                     JSONString = LoadFile.read()
+            elif FileFormat == "Zip":
+                try:
+                    JSONString, BinaryMembers = ReadZipContainer(OpenFileName)
+                except (KeyError, zipfile.BadZipFile):
+                    self.DisplayMessageBox(f"There was an error {ActionInProgressString} \"{OpenFileNameShort}\".")
+                    return None
             else:
                 with open(OpenFileName, "r") as LoadFile:
                     JSONString = LoadFile.read()
-            OpenFileNameShort = os.path.basename(OpenFileName)
             try:
-                Data = self.JSONSerializer.DeserializeDataFromJSONString(JSONString)
+                Data = self.JSONSerializer.DeserializeDataFromJSONString(JSONString, BinaryMembers=BinaryMembers, ObjectDepth=self.ObjectDepth)
             except KeyError:
                 self.DisplayMessageBox(f"There was an error {ActionInProgressString} \"{OpenFileNameShort}\".")
                 return None
+            if not ImportMode and isinstance(Data, JournalMixin):
+                JournalEntries = ReadJournalEntries(OpenFileName)
+                if len(JournalEntries) > 0:
+                    Data.ApplyJournalEntries(JournalEntries)
             self.LastOpenedDirectory = os.path.dirname(OpenFileName)
             self.FlashStatusBar(f"{ActionDoneStringCapitalized} file:  \"{OpenFileNameShort}\"")
             if not ImportMode:
@@ -120,6 +156,7 @@ class SaveAndOpenMixin:
 
     def New(self, ObjectToSave, RespectUnsavedChanges=True):
         assert isinstance(self, self.MainWindowClass)
+        self.WaitForBackgroundSave()
         if self.UnsavedChanges and RespectUnsavedChanges:
             SavePrompt = self.DisplayMessageBox("Save unsaved work before starting a new file?", Icon=QMessageBox.Icon.Warning, Buttons=(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel))
             if SavePrompt == QMessageBox.StandardButton.Yes:
@@ -135,26 +172,131 @@ class SaveAndOpenMixin:
         self.FileLastModified = None
         return True
 
+    def SaveToJournal(self, ObjectToSave, SaveFileName):
+        assert isinstance(self, self.MainWindowClass)
+        if not self.JournalMode or not isinstance(ObjectToSave, JournalMixin) or not os.path.isfile(SaveFileName):
+            return False
+        if self.FileLastModified is None or datetime.fromtimestamp(os.path.getmtime(SaveFileName)) != self.FileLastModified:
+            return False
+        if ObjectToSave.JournalRequiresCompaction() or JournalRequiresCompaction(SaveFileName):
+            return False
+        JournalEntry = ObjectToSave.GetJournalEntry()
+        if JournalEntry is not None:
+            AppendJournalEntry(SaveFileName, JournalEntry)
+            ObjectToSave.ClearJournalChanges()
+        return True
+
+    def CanSaveInBackground(self):
+        # These checks are cheap, so callers can make them before building anything to save
+        assert isinstance(self, self.MainWindowClass)
+        if self.BackgroundSaveInst is not None or self.CurrentOpenFileName == "" or not os.path.isfile(self.CurrentOpenFileName):
+            return False
+        if self.CurrentOpenFileName.endswith(".gz") != self.GzipMode:
+            return False
+        if self.FileLastModified is not None and datetime.fromtimestamp(os.path.getmtime(self.CurrentOpenFileName)) != self.FileLastModified:
+            self.FlashStatusBar(f"File not autosaved; it has been modified since it was last saved or opened by this instance of {self.ScriptName}.")
+            return False
+        return True
+
+    def SaveInBackground(self, ObjectToSave, FinishedCallback=None):
+        assert isinstance(self, self.MainWindowClass)
+        if not self.CanSaveInBackground():
+            return False
+        GzipMode = self.GzipMode
+        ZipContainerMode = self.ZipContainerMode and not GzipMode
+        SaveFileName = self.CurrentOpenFileName
+        BinaryMembers = {} if ZipContainerMode else None
+        Compression = self.GetCompression() if GzipMode else None
+        self.BackgroundSaveInst = BackgroundSave(SaveFileName, lambda: SaveFileAtomically(SaveFileName, lambda TemporaryFilePath: self.WriteSaveFile(TemporaryFilePath, ObjectToSave, False, Compression, BinaryMembers)), BinaryMembers, FinishedCallback, isinstance(ObjectToSave, JournalMixin))
+        self.BackgroundSaveInst.Signals.Finished.connect(self.FinishBackgroundSave)
+        self.BackgroundSaveThreadPool.start(self.BackgroundSaveInst)
+        return True
+
+    def FinishBackgroundSave(self):
+        assert isinstance(self, self.MainWindowClass)
+        BackgroundSaveInst = self.BackgroundSaveInst
+        if BackgroundSaveInst is None:
+            return
+        self.BackgroundSaveInst = None
+        Saved = BackgroundSaveInst.Error is None
+        if Saved:
+            if BackgroundSaveInst.BinaryMembers is not None:
+                PointZipContainerMembersAtFile(BackgroundSaveInst.SaveFileName, BackgroundSaveInst.BinaryMembers)
+            if BackgroundSaveInst.DeleteJournal:
+                DeleteJournal(BackgroundSaveInst.SaveFileName)
+            if BackgroundSaveInst.SaveFileName == self.CurrentOpenFileName:
+                self.FileLastModified = datetime.fromtimestamp(BackgroundSaveInst.SaveFileTimestamp)
+            self.FlashStatusBar(f"File autosaved as:  \"{os.path.basename(BackgroundSaveInst.SaveFileName)}\"")
+        else:
+            self.FlashStatusBar(f"Autosave failed with the following error:  {str(BackgroundSaveInst.Error)}")
+        if BackgroundSaveInst.FinishedCallback is not None:
+            BackgroundSaveInst.FinishedCallback(Saved)
+
+    def WaitForBackgroundSave(self):
+        assert isinstance(self, self.MainWindowClass)
+        if self.BackgroundSaveInst is not None:
+            self.BackgroundSaveThreadPool.waitForDone()
+            self.FinishBackgroundSave()
+
     def closeEvent(self, event):
         assert isinstance(self, self.MainWindowClass)
+        self.WaitForBackgroundSave()
         if self.UnsavedChanges:
             SavePrompt = self.DisplayMessageBox("There are unsaved changes.  Close anyway?", Icon=QMessageBox.Icon.Warning, Buttons=(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No))
             if SavePrompt == QMessageBox.StandardButton.Yes:
                 self.SaveLastOpenedDirectory()
                 self.SaveGzipMode()
+                self.SaveCompressionSettings()
+                self.SaveZipContainerMode()
+                self.SaveCompactJSONMode()
+                self.SaveJournalMode()
                 event.accept()
             elif SavePrompt == QMessageBox.StandardButton.No:
                 event.ignore()
         else:
             self.SaveLastOpenedDirectory()
             self.SaveGzipMode()
+            self.SaveCompressionSettings()
+            self.SaveZipContainerMode()
+            self.SaveCompactJSONMode()
+            self.SaveJournalMode()
             event.accept()
 
-    def SetUpSaveAndOpen(self, FileExtension, FileDescription, ObjectClasses):
+    def SetUpSaveAndOpen(self, FileExtension, FileDescription, ObjectClasses, ObjectDepth=None):
         self.FileExtension = FileExtension
         self.FileDescription = FileDescription
+        self.ObjectDepth = ObjectDepth
         self.JSONSerializer = JSONSerializer(ObjectClasses)
 
+    def WriteSaveFile(self, SaveFileName, ObjectToSave, SkipSerialization, Compression=None, BinaryMembers=None):
+        if Compression is not None:
+            with OpenCompressedFileForWriting(SaveFileName, *Compression) as SaveFile:
+                self.WriteSaveData(ObjectToSave, SaveFile, SkipSerialization)
+        elif BinaryMembers is not None:
+            WriteZipContainer(SaveFileName, lambda DataFile: self.WriteSaveData(ObjectToSave, DataFile, SkipSerialization, BinaryMembers), BinaryMembers)
+        else:
+            with open(SaveFileName, "w") as SaveFile:
+                self.WriteSaveData(ObjectToSave, SaveFile, SkipSerialization)
+
+    def WriteSaveData(self, ObjectToSave, SaveFile, SkipSerialization, BinaryMembers=None):
+        if SkipSerialization:
+            SaveFile.write(ObjectToSave)
+        else:
+            self.JSONSerializer.SerializeDataToJSONFile(ObjectToSave, SaveFile, Indent=None if self.CompactJSONMode else 2, BinaryMembers=BinaryMembers)
+
+    def GetFileFormat(self, FilePath):
+        with open(FilePath, "rb") as File:
+            MagicBytes = File.read(4)
+        CompressedFileFormat = GetCompressedFileFormat(MagicBytes)
+        if CompressedFileFormat is not None:
+            return CompressedFileFormat
+        if MagicBytes == b"PK\x03\x04":
+            return "Zip"
+        return "JSON"
+
+    def GetCompression(self):
+        return self.CompressionCodec, self.CompressionLevels.get(self.CompressionCodec, CompressionCodecs[self.CompressionCodec]["DefaultLevel"])
+
     def LoadLastOpenedDirectory(self):
         assert isinstance(self, self.MainWindowClass)
         FileSavingConfig = self.GetResourcePath("Configs/LastOpenedDirectory.cfg")
@@ -171,6 +313,40 @@ class SaveAndOpenMixin:
             with open(GzipModeConfig, "r") as OpenedConfig:
                 self.GzipMode = json.loads(OpenedConfig.read())
 
+    def LoadCompressionSettings(self):
+        assert isinstance(self, self.MainWindowClass)
+        CompressionCodecConfig = self.GetResourcePath("Configs/CompressionCodec.cfg")
+        if os.path.isfile(CompressionCodecConfig):
+            with open(CompressionCodecConfig, "r") as OpenedConfig:
+                CompressionCodec = json.loads(OpenedConfig.read())
+                if CompressionCodecIsAvailable(CompressionCodec):
+                    self.CompressionCodec = CompressionCodec
+        CompressionLevelsConfig = self.GetResourcePath("Configs/CompressionLevels.cfg")
+        if os.path.isfile(CompressionLevelsConfig):
+            with open(CompressionLevelsConfig, "r") as OpenedConfig:
+                self.CompressionLevels = json.loads(OpenedConfig.read())
+
+    def LoadZipContainerMode(self):
+        assert isinstance(self, self.MainWindowClass)
+        ZipContainerModeConfig = self.GetResourcePath("Configs/ZipContainerMode.cfg")
+        if os.path.isfile(ZipContainerModeConfig):
+            with open(ZipContainerModeConfig, "r") as OpenedConfig:
+                self.ZipContainerMode = json.loads(OpenedConfig.read())
+
+    def LoadCompactJSONMode(self):
+        assert isinstance(self, self.MainWindowClass)
+        CompactJSONModeConfig = self.GetResourcePath("Configs/CompactJSONMode.cfg")
+        if os.path.isfile(CompactJSONModeConfig):
+            with open(CompactJSONModeConfig, "r") as OpenedConfig:
+                self.CompactJSONMode = json.loads(OpenedConfig.read())
+
+    def LoadJournalMode(self):
+        assert isinstance(self, self.MainWindowClass)
+        JournalModeConfig = self.GetResourcePath("Configs/JournalMode.cfg")
+        if os.path.isfile(JournalModeConfig):
+            with open(JournalModeConfig, "r") as OpenedConfig:
+                self.JournalMode = json.loads(OpenedConfig.read())
+
     def SaveLastOpenedDirectory(self):
         assert isinstance(self, self.MainWindowClass)
         if not os.path.isdir(self.GetResourcePath("Configs")):
@@ -188,3 +364,38 @@ class SaveAndOpenMixin:
         GzipModeConfig = self.GetResourcePath("Configs/GzipMode.cfg")
         with open(GzipModeConfig, "w") as OpenedConfig:
             OpenedConfig.write(json.dumps(self.GzipMode))
+
+    def SaveCompressionSettings(self):
+        assert isinstance(self, self.MainWindowClass)
+        if not os.path.isdir(self.GetResourcePath("Configs")):
+            os.mkdir(self.GetResourcePath("Configs"))
+        CompressionCodecConfig = self.GetResourcePath("Configs/CompressionCodec.cfg")
+        with open(CompressionCodecConfig, "w") as OpenedConfig:
+            OpenedConfig.write(json.dumps(self.CompressionCodec))
+        CompressionLevelsConfig = self.GetResourcePath("Configs/CompressionLevels.cfg")
+        with open(CompressionLevelsConfig, "w") as OpenedConfig:
+            OpenedConfig.write(json.dumps(self.CompressionLevels))
+
+    def SaveZipContainerMode(self):
+        assert isinstance(self, self.MainWindowClass)
+        if not os.path.isdir(self.GetResourcePath("Configs")):
+            os.mkdir(self.GetResourcePath("Configs"))
+        ZipContainerModeConfig = self.GetResourcePath("Configs/ZipContainerMode.cfg")
+        with open(ZipContainerModeConfig, "w") as OpenedConfig:
+            OpenedConfig.write(json.dumps(self.ZipContainerMode))
+
+    def SaveCompactJSONMode(self):
+        assert isinstance(self, self.MainWindowClass)
+        if not os.path.isdir(self.GetResourcePath("Configs")):
+            os.mkdir(self.GetResourcePath("Configs"))
+        CompactJSONModeConfig = self.GetResourcePath("Configs/CompactJSONMode.cfg")
+        with open(CompactJSONModeConfig, "w") as OpenedConfig:
+            OpenedConfig.write(json.dumps(self.CompactJSONMode))
+
+    def SaveJournalMode(self):
+        assert isinstance(self, self.MainWindowClass)
+        if not os.path.isdir(self.GetResourcePath("Configs")):
+            os.mkdir(self.GetResourcePath("Configs"))
+        JournalModeConfig = self.GetResourcePath("Configs/JournalMode.cfg")
+        with open(JournalModeConfig, "w") as OpenedConfig:
+            OpenedConfig.write(json.dumps(self.JournalMode))
@@ -0,0 +1,64 @@
+import io
+import zipfile
+
+
+class ZipContainerMember:
+    def __init__(self, FilePath, MemberName):
+        # Store Parameters
+        self.FilePath = FilePath
+        self.MemberName = MemberName
+
+    def GetBinary(self, OpenZipContainer=None):
+        if OpenZipContainer is not None:
+            return OpenZipContainer.read(self.MemberName)
+        with zipfile.ZipFile(self.FilePath, "r") as SourceZipContainer:
+            return SourceZipContainer.read(self.MemberName)
+
+
+def WriteZipContainer(FilePath, WriteJSON, BinaryMembers):
+    # Unloaded Members May Be Read from the File Being Replaced, So This Should Write to a Temporary File
+    SourceZipContainers = {}
+    try:
+        with zipfile.ZipFile(FilePath, "w", compression=zipfile.ZIP_DEFLATED) as ZipContainer:
+            with io.TextIOWrapper(ZipContainer.open("Data.json", "w", force_zip64=True), encoding="utf-8") as DataFile:
+                WriteJSON(DataFile)
+            for Digest, Binary in BinaryMembers.items():
+                if isinstance(Binary, ZipContainerMember):
+                    if Binary.FilePath not in SourceZipContainers:
+                        SourceZipContainers[Binary.FilePath] = zipfile.ZipFile(Binary.FilePath, "r")
+                    Binary = Binary.GetBinary(SourceZipContainers[Binary.FilePath])
+                ZipContainer.writestr(f"BinaryMembers/{Digest}", Binary, compress_type=zipfile.ZIP_STORED)
+    finally:
+        for SourceZipContainer in SourceZipContainers.values():
+            SourceZipContainer.close()
+
+
+def PointZipContainerMembersAtFile(FilePath, BinaryMembers):
+    for Digest, Binary in BinaryMembers.items():
+        if isinstance(Binary, ZipContainerMember):
+            Binary.FilePath = FilePath
+            Binary.MemberName = f"BinaryMembers/{Digest}"
+
+
+def LoadZipContainerMembers(FilePath, BinaryMembers):
+    # Members Read from a File About to Be Replaced by One Without Them Must Be Loaded First
+    SourceZipContainer = None
+    try:
+        for Digest, Binary in BinaryMembers.items():
+            if isinstance(Binary, ZipContainerMember) and Binary.FilePath == FilePath:
+                if SourceZipContainer is None:
+                    SourceZipContainer = zipfile.ZipFile(FilePath, "r")
+                BinaryMembers[Digest] = Binary.GetBinary(SourceZipContainer)
+    finally:
+        if SourceZipContainer is not None:
+            SourceZipContainer.close()
+
+
+def ReadZipContainer(FilePath):
+    with zipfile.ZipFile(FilePath, "r") as ZipContainer:
+        JSONString = ZipContainer.read("Data.json").decode("utf-8")
+        BinaryMembers = {}
+        for MemberName in ZipContainer.namelist():
+            if MemberName.startswith("BinaryMembers/"):
+                BinaryMembers[MemberName.removeprefix("BinaryMembers/")] = ZipContainerMember(FilePath, MemberName)
+    return JSONString, BinaryMembers